@@ -1,11 +1,78 @@
+from array import array
+
+import numpy as np
 import pygame
 
-from constantes import COSTOS_MOVIMIENTO, TERRENOS, COLORES_AGENTES
+from constantes import COSTOS_MOVIMIENTO, TERRENOS, COLORES_AGENTES, INTRANSITABLE
+from Mapa import compilar_costos
+
+# Banderas del conocimiento por celda (un byte por celda en Agente.banderas)
+VISIBLE = 1
+VISITADO = 2
+INICIO = 4
+DECISION = 8
+
+# Marcas de "recorrido" que no son terrenos y su bandera equivalente
+MARCAS_RECORRIDO = {"Visitado": VISITADO, "Inicio": INICIO, "Decision": DECISION}
+CODIGOS_TERRENO = {nombre: codigo for codigo, nombre in TERRENOS.items()}
+
+
+class _FilaConocimiento:
+    """
+    Fila de la vista de conocimiento: conocimiento[y][x] construye el diccionario
+    {"visibilidad", "recorrido"} de la celda a partir de las banderas.
+    """
+    def __init__(self, agente, y):
+        self._agente = agente
+        self._y = y
+
+    def __len__(self):
+        return self._agente.ancho
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self._agente.ancho
+        return self._agente.info_celda(x, self._y)
+
+    def __setitem__(self, x, info):
+        self._agente.actualizar_conocimiento(x, self._y, info)
+
+    def __iter__(self):
+        return (self[x] for x in range(len(self)))
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class VistaConocimiento:
+    """
+    Vista compatible con la antigua matriz de diccionarios del conocimiento.
+    Los diccionarios se crean al leerlos, así que modificarlos no cambia el
+    conocimiento: para eso se asigna la celda completa o se usa Agente.marcar.
+    """
+    def __init__(self, agente):
+        self._agente = agente
+
+    def __len__(self):
+        return self._agente.alto
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self._agente.alto
+        if not 0 <= y < self._agente.alto:
+            raise IndexError(y)
+        return _FilaConocimiento(self._agente, y)
+
+    def __iter__(self):
+        return (self[y] for y in range(len(self)))
+
 
 class Agente:
-    def __init__(self, pos_x, pos_y, cell_size, mapa_original, tipo_agente):
+    def __init__(self, pos_x, pos_y, cell_size, mapa_original, tipo_agente, costos=None):
         """
         Inicializa el agente.
+        costos: malla de costos compilada del agente (Mapa.costos_agente); si no se
+        indica se compila a partir de mapa_original.
         """
         self.pos_x = pos_x
         self.pos_y = pos_y
@@ -13,13 +80,18 @@ class Agente:
         self.tipo_agente = tipo_agente
         self.mapa_original = mapa_original
         self.costo_acumulado = 0
+        self.costos = costos if costos is not None else compilar_costos(mapa_original, tipo_agente)
 
         # Asignar color según el tipo de agente
         self.color = COLORES_AGENTES.get(tipo_agente, (255, 255, 255))  # Color blanco por defecto si el tipo no está en el diccionario
         
-        # Inicializar conocimiento del mapa
-        self.conocimiento = [[{"visibilidad": 0, "recorrido": set()} for _ in fila] for fila in mapa_original]
-        self.conocimiento[pos_y][pos_x]["recorrido"].add("Inicio")
+        # Inicializar conocimiento del mapa: banderas y terrenos recorridos (bit por código) por celda
+        self.alto = len(mapa_original)
+        self.ancho = len(mapa_original[0])
+        self.banderas = bytearray(self.alto * self.ancho)
+        self.terrenos_recorridos = array('H', bytes(2 * self.alto * self.ancho))
+        self.conocimiento = VistaConocimiento(self)
+        self.marcar(pos_x, pos_y, INICIO)
 
         # Inicializar sensores
         self.sensores = {
@@ -48,16 +120,19 @@ class Agente:
         """
         # Verificar que la nueva posición esté dentro del mapa y sea transitable
         if 0 <= nueva_x < len(self.mapa_original[0]) and 0 <= nueva_y < len(self.mapa_original):
-            tipo_terreno = TERRENOS[self.mapa_original[nueva_y][nueva_x]]
-            costo = self.costo_movimiento(tipo_terreno)
-            if costo is not None:  # Si el terreno es transitable para este agente
+            # Los costos siguen el ancho del mapa actual; el conocimiento, el ancho
+            # acumulado (puede ser mayor si el mapa se achicó)
+            indice = nueva_y * self.ancho + nueva_x
+            costo = self.costos[nueva_y * len(self.mapa_original[0]) + nueva_x]
+            if costo != INTRANSITABLE:  # Si el terreno es transitable para este agente
                 self.pos_x = nueva_x
                 self.pos_y = nueva_y
                 self.costo_acumulado += costo  # Actualiza el costo acumulado
-                self.conocimiento[self.pos_y][self.pos_x]["recorrido"].add(tipo_terreno)  # Agrega el tipo de terreno al recorrido
+                codigo = int(self.mapa_original[nueva_y][nueva_x])
+                if codigo in TERRENOS:
+                    self.terrenos_recorridos[indice] |= 1 << codigo  # Agrega el tipo de terreno al recorrido
                 self.sensar()
-                self.conocimiento[self.pos_y][self.pos_x]["visibilidad"] = 1
-                self.conocimiento[self.pos_y][self.pos_x]["recorrido"].add("Visitado")
+                self.banderas[indice] |= VISIBLE | VISITADO
 
         # Depuración: Muestra la información del conocimiento y sensores en la posición actual
         print(f"Conocimiento actualizado en posición actual: {self.conocimiento[self.pos_y][self.pos_x]}")
@@ -76,8 +151,7 @@ class Agente:
         self.pos_y = y
         # Actualizar sensores y conocimiento al teletransportarse
         self.sensar()
-        self.conocimiento[self.pos_y][self.pos_x]["visibilidad"] = 1
-        self.conocimiento[self.pos_y][self.pos_x]["recorrido"].add("Visitado")
+        self.marcar(x, y, VISIBLE | VISITADO)
 
     def dibujar(self, screen):
         """
@@ -102,7 +176,7 @@ class Agente:
         # Actualiza los sensores con la información de las celdas adyacentes
         for direccion, (x, y) in posiciones.items():
             if 0 <= x < len(self.mapa_original[0]) and 0 <= y < len(self.mapa_original):
-                self.sensores[direccion] = self.mapa_original[y][x]
+                self.sensores[direccion] = int(self.mapa_original[y][x])
             else:
                 # Si está fuera de los límites del mapa, el sensor no detecta nada
                 self.sensores[direccion] = None
@@ -111,22 +185,22 @@ class Agente:
         """
         Actualiza el mapa original y ajusta el conocimiento del agente en caso de que el mapa sea modificado.
         """
-        # Actualiza el mapa original
+        # Actualiza el mapa original y su malla de costos
         self.mapa_original = nuevo_mapa
+        self.costos = compilar_costos(nuevo_mapa, self.tipo_agente)
         
-        # Revisa si el nuevo mapa es más grande que el conocimiento actual
-        filas_conocidas = len(self.conocimiento)
-        columnas_conocidas = len(self.conocimiento[0])
-        filas_nuevas = len(nuevo_mapa)
-        columnas_nuevas = len(nuevo_mapa[0])
-
-        # Si el nuevo mapa es más grande, expande la matriz de conocimiento
-        if filas_nuevas > filas_conocidas:
-            for _ in range(filas_nuevas - filas_conocidas):
-                self.conocimiento.append([{"visibilidad": 0, "recorrido": set()} for _ in range(columnas_nuevas)])
-        if columnas_nuevas > columnas_conocidas:
-            for fila in self.conocimiento:
-                fila.extend([{"visibilidad": 0, "recorrido": set()} for _ in range(columnas_nuevas - columnas_conocidas)])
+        # Si el nuevo mapa es más grande, expande los arreglos de conocimiento
+        # conservando lo que ya se conocía en cada (x, y)
+        filas_nuevas = max(self.alto, len(nuevo_mapa))
+        columnas_nuevas = max(self.ancho, len(nuevo_mapa[0]))
+        if (filas_nuevas, columnas_nuevas) != (self.alto, self.ancho):
+            banderas = np.zeros((filas_nuevas, columnas_nuevas), dtype=np.uint8)
+            banderas[:self.alto, :self.ancho] = np.frombuffer(self.banderas, dtype=np.uint8).reshape(self.alto, self.ancho)
+            terrenos = np.zeros((filas_nuevas, columnas_nuevas), dtype=np.uint16)
+            terrenos[:self.alto, :self.ancho] = np.frombuffer(self.terrenos_recorridos, dtype=np.uint16).reshape(self.alto, self.ancho)
+            self.banderas = bytearray(banderas.tobytes())
+            self.terrenos_recorridos = array('H', terrenos.tobytes())
+            self.alto, self.ancho = filas_nuevas, columnas_nuevas
 
         # Vuelve a sensar para obtener la información actualizada
         self.sensar()
@@ -146,9 +220,42 @@ class Agente:
     def actualizar_conocimiento(self, pos_x, pos_y, info):
         """
         Actualiza el conocimiento del agente sobre una celda específica.
+        info: diccionario {"visibilidad": 0/1, "recorrido": conjunto de marcas y nombres de terreno}.
+        """
+        if 0 <= pos_x < self.ancho and 0 <= pos_y < self.alto:
+            indice = pos_y * self.ancho + pos_x
+            banderas = VISIBLE if info.get("visibilidad") else 0
+            terrenos = 0
+            for marca in info.get("recorrido", ()):
+                if marca in MARCAS_RECORRIDO:
+                    banderas |= MARCAS_RECORRIDO[marca]
+                elif marca in CODIGOS_TERRENO:
+                    terrenos |= 1 << CODIGOS_TERRENO[marca]
+            self.banderas[indice] = banderas
+            self.terrenos_recorridos[indice] = terrenos
+
+    def info_celda(self, x, y):
+        """
+        Devuelve el conocimiento de la celda (x, y) como {"visibilidad", "recorrido"}.
+        """
+        indice = y * self.ancho + x
+        banderas = self.banderas[indice]
+        terrenos = self.terrenos_recorridos[indice]
+        recorrido = {marca for marca, bandera in MARCAS_RECORRIDO.items() if banderas & bandera}
+        recorrido.update(nombre for codigo, nombre in TERRENOS.items() if terrenos >> codigo & 1)
+        return {"visibilidad": 1 if banderas & VISIBLE else 0, "recorrido": recorrido}
+
+    def marcar(self, x, y, banderas):
+        """
+        Activa las banderas indicadas (VISIBLE, VISITADO, INICIO, DECISION) en la celda (x, y).
+        """
+        self.banderas[y * self.ancho + x] |= banderas
+
+    def tiene(self, x, y, bandera):
+        """
+        Indica si la celda (x, y) tiene la bandera indicada.
         """
-        if 0 <= pos_x < len(self.conocimiento[0]) and 0 <= pos_y < len(self.conocimiento):
-            self.conocimiento[pos_y][pos_x] = info
+        return bool(self.banderas[y * self.ancho + x] & bandera)
 
     def mostrar_conocimiento(self):
         """
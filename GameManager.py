@@ -1,19 +1,47 @@
+import numpy as np
 import pygame
 
 from constantes import COLORES_TERRENO, TERRENOS, COSTOS_MOVIMIENTO
-from Mapa import Mapa
-from Agente import Agente
-from BFS import bfs_decision_por_decision_con_arbol
-from BFS import bfs_paso_a_paso_con_arbol
-from DFS import dfs_decision_por_decision_con_arbol
-from DFS import dfs_paso_a_paso_con_arbol
-from AStar import astar_paso_a_paso_con_arbol
-from AStar import astar_decision_por_decision_con_arbol
-from anytree import RenderTree
-from time import sleep
+from Mapa import Mapa, EXTENSION_BINARIA
+from camara import Camara
+from Agente import Agente, VISIBLE, VISITADO, DECISION
+from replanificacion import PlanificadorIncremental
+from jerarquico import PlanificadorJerarquico
+from hitos import hitos_para_mapa
+from cache_rutas import CacheRutas, BYTES_MAXIMOS_RUTAS, tamano_ruta
+from campos import CampoDistancias
+from componentes import SIN_COMPONENTE
+from registro import GrabadorEventos, grabar_eventos, abrir_registro
+from pasillos import ALGORITMOS_PASILLOS, eventos_pasillos
+from busqueda import (EVENTO_DECISION, EVENTO_AGREGAR, INFINITO, ALGORITMOS, EstadisticasBusqueda,
+                      heuristica_escalada, eventos_busqueda)
+from time import perf_counter
+
+# Tamaño máximo en pixeles del área del mapa; los mapas más grandes se recorren con la cámara
+ANCHO_VISTA_MAXIMO = 1200
+ALTO_VISTA_MAXIMO = 900
+
+# Tamaño mínimo de celda (pixeles) para dibujar las marcas I/V/S
+TAMANO_MINIMO_ETIQUETAS = 12
+# Alto mínimo de la ventana para que quepan las instrucciones del sidebar
+ALTO_MINIMO_VENTANA = 720
+# Heurísticas de A* que se alternan con 'K'
+HEURISTICAS = ['manhattan', 'escalada', 'alt']
+# Pasos de búsqueda por cuadro que se alternan con '[' y ']'; con fracciones se
+# avanza un paso cada varios cuadros
+VELOCIDADES_BUSQUEDA = [0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 64, 256, 1024]
+VELOCIDAD_INICIAL = 1
+# Fracción de cada cuadro que se dedica como máximo a avanzar la búsqueda
+FRACCION_AVANCE_RAPIDO = 0.8
+# Archivo donde se graban las búsquedas con 'L' y que se reproduce con 'Y'
+ARCHIVO_REGISTRO = "busqueda.eventos"
+# Archivo donde se exportan las estadísticas de la última búsqueda medida ('M')
+ARCHIVO_ESTADISTICAS = "estadisticas_busqueda.json"
+# Eventos entre consultas al reloj al avanzar la búsqueda
+EVENTOS_POR_CONSULTA_RELOJ = 256
 
 class GameManager:
-    def __init__(self, archivo_mapa, delimitador, cell_size=30, sidebar_width=600, tipo_agente="human"):
+    def __init__(self, archivo_mapa, delimitador=None, cell_size=30, sidebar_width=600, tipo_agente="human"):
         """
         Inicializa el GameManager con el archivo de mapa proporcionado.
         """
@@ -26,17 +54,28 @@ class GameManager:
         # Inicializar el mapa
         self.mapa = Mapa(cell_size)
         self.mapa.cargar_mapa(archivo_mapa, delimitador)
+        self.archivo_mapa = archivo_mapa
+        # Los mapas binarios se guardan en binario; los de texto, en CSV
+        self.archivo_guardado = "mapa_guardado.mapb" if archivo_mapa.endswith(EXTENSION_BINARIA) else "mapa_guardado.csv"
 
         # Inicializar el agente en la posición (0, 0)
         self.punto_inicio = (0, 0)
         self.punto_fin = None
-        self.agente = Agente(self.punto_inicio[0], self.punto_inicio[1], cell_size, self.mapa.matriz, tipo_agente)
+        self.agente = Agente(self.punto_inicio[0], self.punto_inicio[1], cell_size, self.mapa.matriz, tipo_agente,
+                             self.mapa.costos_agente(tipo_agente))
 
         self.algoritmo_seleccionado = 'bfs'
+        self.heuristica_seleccionada = 'manhattan'  # Heurística de A*
+        self.tablas_hitos = {}  # Tablas ALT por tipo de agente, válidas hasta la siguiente edición
 
-        # Configuración de Pygame
-        self.window_width = len(self.mapa.matriz[0]) * cell_size + sidebar_width
-        self.window_height = len(self.mapa.matriz) * cell_size
+        # Configuración de Pygame: el área del mapa se limita y se recorre con la cámara
+        alto_mapa, ancho_mapa = self.mapa.matriz.shape
+        ancho_vista = min(ancho_mapa * cell_size, ANCHO_VISTA_MAXIMO)
+        alto_vista = min(alto_mapa * cell_size, ALTO_VISTA_MAXIMO)
+        self.camara = Camara(ancho_mapa, alto_mapa, ancho_vista, alto_vista, cell_size)
+        self.area_vista = pygame.Rect(0, 0, ancho_vista, alto_vista)
+        self.window_width = ancho_vista + sidebar_width
+        self.window_height = max(alto_vista, ALTO_MINIMO_VENTANA)
         self.screen = pygame.display.set_mode((self.window_width, self.window_height))
         pygame.display.set_caption("Gestor de Juego de Agentes")
         self.font = pygame.font.SysFont(None, 24)
@@ -48,112 +87,313 @@ class GameManager:
         self.modo_seleccion_puntos = False  # Modo para seleccionar puntos de inicio y fin
         self.terreno_seleccionado = 1  # Inicialmente tierra
         self.prioridad_direccion = ""  # Cadena para almacenar la prioridad de dirección
+        self.imprimir_arbol = False  # Volcar el árbol en consola después de cada búsqueda
+        self.planificador = None  # Planificador incremental (D* Lite) de la tecla 'I'
+        self.planificadores_jerarquicos = {}  # Planificadores HPA* de la tecla 'J', por tipo de agente
+        # Resultados de 'R'/'D' por versión del mapa, agente y algoritmo
+        self.cache_rutas = CacheRutas(bytes_maximos=BYTES_MAXIMOS_RUTAS, tamano=tamano_ruta)
+        self.cache_campos = CacheRutas(capacidad=4)  # Campos de distancia por versión del mapa, agente y fin
+        self.mostrar_mapa_calor = False  # Superponer el campo de distancias al punto final
+        self.capa_pendiente = False  # La capa de terreno debe reconstruirse antes del siguiente cuadro
+
+        # Búsqueda en curso de 'R'/'D': generador de eventos que avanza unos pasos por cuadro
+        self.busqueda = None
+        self.modo_busqueda = None
+        self.clave_busqueda = None  # Clave de la caché de rutas donde se guarda el resultado
+        self.indice_velocidad = VELOCIDAD_INICIAL
+        self.credito_busqueda = 0.0  # Pasos acumulados con velocidades fraccionarias
+        self.pasos_pendientes = 0  # Pasos pedidos con 'N'
+        self.busqueda_pausada = False
+        self.avance_rapido = False
+        self.grabar_busquedas = False  # Grabar los eventos de las búsquedas en ARCHIVO_REGISTRO
+        self.grabador = None  # Grabador de la búsqueda en curso
+        self.medir_busquedas = False  # Contar nodos, frontera y tiempos de las búsquedas de 'R'/'D'
+        self.estadisticas = None  # EstadisticasBusqueda de la última búsqueda medida
+        self.estadisticas_en_curso = None
+        self.mostrar_expansiones = False  # Superponer las expansiones por celda de la última búsqueda medida
+        self.mostrar_componentes = False  # Colorear las componentes conexas del agente
+        self.resumen_guardado = None  # (componentes, revisión, texto) del último resumen de componentes
+        self.usar_pasillos = True  # Buscar decisión por decisión sobre el grafo de pasillos
+        self.grafo_informado = None  # Último grafo de pasillos cuyo resumen se mostró
+
+        # Estado del redibujado incremental
+        self.casillas_detectadas = set()  # Casillas detectadas por los sensores
+        self.celdas_sucias = set()  # Celdas a redibujar en el siguiente cuadro
+        self.rects_sucios = []  # Rectángulos de pantalla a actualizar
+        self.cache_glifos = {}  # Etiquetas renderizadas por (texto, color, tamaño de celda)
+        self.capa_sidebar = pygame.Surface((self.sidebar_width, self.window_height))
+        self.estado_sidebar_dibujado = None
+        self.fps = 60
+        self.pos_agente_dibujada = None
+        self.puntos_dibujados = (None, None)
+        self.colores_terreno = np.zeros((256, 3), dtype=np.uint8)
+        for codigo, nombre in TERRENOS.items():
+            self.colores_terreno[codigo] = COLORES_TERRENO[nombre]
+        self.construir_capa_terreno()
+        self.mapa.suscribir(self.al_modificar_celda)
+
+
+    def construir_capa_terreno(self):
+        """
+        Pre-renderiza en una superficie fuera de pantalla el terreno de las celdas
+        visibles por la cámara. Se reconstruye solo al desplazar o hacer zoom.
+        """
+        x0, y0, x1, y1 = self.camara.rango_visible()
+        # Un pixel por celda visible, escalado luego al tamaño de celda
+        pixeles = self.colores_terreno[self.mapa.matriz[y0:y1, x0:x1]]
+        campo = self.campo_distancias() if self.mostrar_mapa_calor else None
+        if campo is not None:
+            pixeles = self.mezclar_mapa_calor(pixeles, campo, (x0, y0, x1, y1))
+        if self.mostrar_expansiones and self.estadisticas is not None:
+            pixeles = self.mezclar_expansiones(pixeles, self.estadisticas, (x0, y0, x1, y1))
+        if self.mostrar_componentes:
+            pixeles = self.mezclar_componentes(pixeles, self.mapa.componentes_agente(self.tipo_agente),
+                                               (x0, y0, x1, y1))
+        pixeles = pixeles.swapaxes(0, 1)
+        tamano = self.camara.tamano_celda
+        self.capa_terreno = pygame.transform.scale(pygame.surfarray.make_surface(pixeles),
+                                                   ((x1 - x0) * tamano, (y1 - y0) * tamano))
+        self.redibujar_todo = True
+        self.capa_pendiente = False
+
+    def campo_distancias(self):
+        """
+        Campo de distancias hacia el punto final para el agente actual, calculado una
+        sola vez por versión del mapa. None si no hay punto final.
+        """
+        if self.punto_fin is None:
+            return None
+        return self.cache_campos.buscar(
+            self.mapa, self.tipo_agente, 'campo', self.punto_fin, self.punto_fin,
+            lambda: CampoDistancias(self.mapa.costos_agente(self.tipo_agente), self.mapa.matriz.shape[1], self.punto_fin))
+
+    def mezclar_mapa_calor(self, pixeles, campo, rango):
+        """
+        Tiñe los colores del terreno según la distancia al fin: azul cerca, rojo lejos.
+        Las celdas sin camino al fin conservan su color oscurecido.
+        """
+        x0, y0, x1, y1 = rango
+        distancias = campo.como_matriz()[y0:y1, x0:x1]
+        alcanzadas = distancias != INFINITO
+        t = np.where(alcanzadas, distancias, 0) / max(1, campo.distancia_maxima)
+        calor = np.stack([255 * t, np.full_like(t, 40), 255 * (1 - t)], axis=-1)
+        mezcla = np.where(alcanzadas[..., None], (pixeles + calor) / 2, pixeles / 3)
+        return mezcla.astype(np.uint8)
+
+    def mezclar_expansiones(self, pixeles, estadisticas, rango):
+        """
+        Tiñe las celdas expandidas según cuántas veces se expandieron (escala
+        logarítmica): amarillo pocas, rojo muchas. Las demás se oscurecen.
+        """
+        x0, y0, x1, y1 = rango
+        expansiones = estadisticas.expansiones_matriz()[y0:y1, x0:x1]
+        expandidas = expansiones > 0
+        t = np.log1p(expansiones) / np.log1p(max(1, int(expansiones.max(initial=0))))
+        calor = np.stack([np.full_like(t, 255), 255 * (1 - t), np.zeros_like(t)], axis=-1)
+        mezcla = np.where(expandidas[..., None], (pixeles + 2 * calor) / 3, pixeles / 3)
+        return mezcla.astype(np.uint8)
+
+    def mezclar_componentes(self, pixeles, componentes, rango):
+        """
+        Tiñe cada componente conexa del agente con un color propio; las celdas
+        intransitables se oscurecen.
+        """
+        x0, y0, x1, y1 = rango
+        etiquetas = componentes.como_matriz()[y0:y1, x0:x1].astype(np.int64)
+        transitables = etiquetas != SIN_COMPONENTE
+        color = np.stack([(etiquetas * 97 + 40) % 256, (etiquetas * 57 + 160) % 256,
+                          (etiquetas * 151 + 90) % 256], axis=-1)
+        mezcla = np.where(transitables[..., None], (pixeles + color) / 2, pixeles / 3)
+        return mezcla.astype(np.uint8)
+
+    def al_modificar_celda(self, x, y, valor):
+        """
+        Actualiza la celda editada en la capa de terreno y la marca para redibujar.
+        """
+        if self.mostrar_mapa_calor:
+            # Las distancias cambian fuera de la celda editada: se recalcula el campo
+            self.capa_pendiente = True
+        elif self.camara.es_visible(x, y):
+            color = COLORES_TERRENO.get(TERRENOS.get(int(valor)), (0, 0, 0))
+            self.capa_terreno.fill(color, self.rect_celda(x, y))
+        self.celdas_sucias.add((x, y))
+        if self.planificador is not None:
+            self.planificador.actualizar_celda(x, y)
+        for planificador in self.planificadores_jerarquicos.values():
+            planificador.actualizar_celda(x, y)
+        self.tablas_hitos.clear()  # Las distancias a los hitos ya no son exactas
+        self.cancelar_busqueda("Búsqueda cancelada: el mapa cambió.")
+        if self.mostrar_expansiones or self.mostrar_componentes:
+            self.capa_pendiente = True
+
+    def rect_celda(self, x, y):
+        """
+        Rectángulo en pantalla (y en la capa de terreno) de la celda (x, y) según la cámara.
+        """
+        tamano = self.camara.tamano_celda
+        return pygame.Rect(*self.camara.a_pantalla(x, y), tamano, tamano)
+
+    def mover_camara(self, cambio):
+        """
+        Reconstruye la vista si la cámara cambió (cambio es el resultado de desplazar/acercar).
+        """
+        if cambio:
+            self.construir_capa_terreno()
+
+    def marcar_sucia(self, pos):
+        """
+        Marca una celda (o None) para redibujarla en el siguiente cuadro.
+        """
+        if pos is not None:
+            self.celdas_sucias.add(pos)
+
+    def celda_visible(self, x, y, visitado):
+        """
+        Indica si la celda se muestra en la vista actual.
+        """
+        return not self.modo_vista_sensores or visitado or (x, y) in self.casillas_detectadas
+
+    def glifo(self, texto, color=(0, 0, 0)):
+        """
+        Devuelve la etiqueta renderizada y su desplazamiento para centrarla en una celda,
+        renderizándola solo la primera vez para cada (texto, color, tamaño de celda).
+        """
+        clave = (texto, color, self.camara.tamano_celda)
+        glifo = self.cache_glifos.get(clave)
+        if glifo is None:
+            superficie = self.font.render(texto, True, color)
+            centro = self.camara.tamano_celda // 2
+            desplazamiento = superficie.get_rect(center=(centro, centro)).topleft
+            glifo = (superficie, desplazamiento)
+            self.cache_glifos[clave] = glifo
+        return glifo
 
+    def dibujar_celdas(self, celdas):
+        """
+        Redibuja un conjunto de celdas: terreno, marcas (I/V/S), agente y bordes de inicio y fin.
+        El terreno y las marcas se dibujan en lote con Surface.blits.
+        """
+        fondos = []
+        etiquetas = []
+        pos_agente = (self.agente.pos_x, self.agente.pos_y)
+        con_etiquetas = self.camara.tamano_celda >= TAMANO_MINIMO_ETIQUETAS
+        x0, y0, x1, y1 = self.camara.rango_visible()
+        self.screen.set_clip(self.area_vista)
+        for x, y in celdas:
+            # Solo se dibujan las celdas que la cámara muestra
+            if not (x0 <= x < x1 and y0 <= y < y1):
+                continue
+            rect = self.rect_celda(x, y)
+            visitado = self.agente.tiene(x, y, VISITADO)
+            if self.celda_visible(x, y, visitado):
+                fondos.append((self.capa_terreno, rect, rect))
+            else:
+                self.screen.fill((0, 0, 0), rect)
+
+            if (x, y) == self.punto_inicio:
+                etiqueta = 'I'
+            elif visitado:
+                etiqueta = 'V'
+            elif self.modo_vista_sensores and (x, y) in self.casillas_detectadas:
+                etiqueta = 'S'
+            else:
+                etiqueta = None
+            if etiqueta and con_etiquetas:
+                superficie, (dx, dy) = self.glifo(etiqueta)
+                etiquetas.append((superficie, (rect.x + dx, rect.y + dy)))
+            self.rects_sucios.append(rect)
+
+        self.screen.blits(fondos, doreturn=False)
+        self.screen.blits(etiquetas, doreturn=False)
+
+        # Agente y bordes de inicio y fin encima de las marcas
+        if pos_agente in celdas and self.camara.es_visible(*pos_agente):
+            self.screen.fill(self.agente.color, self.rect_celda(*pos_agente))
+        if self.punto_inicio in celdas and self.camara.es_visible(*self.punto_inicio):
+            pygame.draw.rect(self.screen, (0, 255, 0), self.rect_celda(*self.punto_inicio), 2)  # Borde verde para el punto de inicio
+        if self.punto_fin in celdas and self.camara.es_visible(*self.punto_fin):
+            pygame.draw.rect(self.screen, (255, 0, 0), self.rect_celda(*self.punto_fin), 2)  # Borde rojo para el punto de fin
+        self.screen.set_clip(None)
+
+    def registrar_posicion_agente(self):
+        """
+        Si el agente se movió desde el último registro, marca para redibujar sus
+        posiciones anterior y nueva y registra las casillas que detectan sus sensores.
+        """
+        pos_agente = (self.agente.pos_x, self.agente.pos_y)
+        if pos_agente == self.pos_agente_dibujada:
+            return
+        self.marcar_sucia(self.pos_agente_dibujada)
+        self.marcar_sucia(pos_agente)
+        alto, ancho = self.mapa.matriz.shape
+        for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+            x_sensor, y_sensor = pos_agente[0] + dx, pos_agente[1] + dy
+            if 0 <= x_sensor < ancho and 0 <= y_sensor < alto:
+                self.casillas_detectadas.add((x_sensor, y_sensor))
+                self.celdas_sucias.add((x_sensor, y_sensor))
+        self.pos_agente_dibujada = pos_agente
 
     def dibujar_mapa(self):
         """
         Dibuja el mapa dependiendo del modo de visualización.
+
+        Solo se redibujan las celdas que cambiaron desde el último cuadro (posición
+        del agente, sensores, puntos de inicio y fin, celdas editadas); sus
+        rectángulos se acumulan en self.rects_sucios para presentar_pantalla().
         """
-        # Crear una lista para almacenar las casillas detectadas por los sensores
-        if not hasattr(self, 'casillas_detectadas'):
-            self.casillas_detectadas = set()  # Usar un conjunto para evitar duplicados
+        # Detectar cambios de posición del agente y de los puntos marcados
+        self.registrar_posicion_agente()
+        if (self.punto_inicio, self.punto_fin) != self.puntos_dibujados:
+            for pos in self.puntos_dibujados + (self.punto_inicio, self.punto_fin):
+                self.marcar_sucia(pos)
+            if self.mostrar_mapa_calor and self.punto_fin != self.puntos_dibujados[1]:
+                self.capa_pendiente = True
+            self.puntos_dibujados = (self.punto_inicio, self.punto_fin)
+        if self.capa_pendiente:
+            self.construir_capa_terreno()
+
+        if self.redibujar_todo:
+            self.dibujar_mapa_completo()
+        else:
+            self.dibujar_celdas(self.celdas_sucias)
+        self.celdas_sucias.clear()
 
+    def dibujar_mapa_completo(self):
+        """
+        Redibuja toda el área visible del mapa (al iniciar, mover la cámara o
+        cambiar de vista o de agente).
+        """
+        area_mapa = self.area_vista
+        self.screen.fill((0, 0, 0), area_mapa)
+        if not self.modo_vista_sensores:
+            self.screen.blit(self.capa_terreno, (0, 0))
+
+        # Solo las celdas visibles con alguna marca necesitan dibujarse encima de la capa
+        x0, y0, x1, y1 = self.camara.rango_visible()
+        celdas = set()
         if self.modo_vista_sensores:
-            # Mostrar solo las celdas visitadas y las detectadas por los sensores
-            for y, fila in enumerate(self.agente.conocimiento):
-                for x, celda_info in enumerate(fila):
-                    if "Visitado" in celda_info["recorrido"]:
-                        tipo_terreno = TERRENOS[self.mapa.matriz[y][x]]
-                        color = COLORES_TERRENO[tipo_terreno]
-                        pygame.draw.rect(self.screen, color, pygame.Rect(
-                            x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size
-                        ))
-
-                        # Dibujar 'V' en las casillas visitadas
-                        text = self.font.render('V', True, (0, 0, 0))  # Color negro
-                        text_rect = text.get_rect(center=(x * self.cell_size + self.cell_size // 2,
-                                                        y * self.cell_size + self.cell_size // 2))
-                        self.screen.blit(text, text_rect)
-
-                    # Verificar si es la posición de inicio
-                    if (x, y) == self.punto_inicio:
-                        # Dibujar 'I' en la posición de inicio
-                        text = self.font.render('I', True, (0, 0, 0))  # Color negro
-                        text_rect = text.get_rect(center=(x * self.cell_size + self.cell_size // 2,
-                                                        y * self.cell_size + self.cell_size // 2))
-                        self.screen.blit(text, text_rect)
-
-            # Mostrar las casillas detectadas por los sensores
-            direcciones = {
-                'arriba': (0, -1),
-                'abajo': (0, 1),
-                'izquierda': (-1, 0),
-                'derecha': (1, 0)
-            }
-            
-            for direccion, (dx, dy) in direcciones.items():
-                x_sensor = self.agente.pos_x + dx
-                y_sensor = self.agente.pos_y + dy
-                
-                if 0 <= x_sensor < len(self.mapa.matriz[0]) and 0 <= y_sensor < len(self.mapa.matriz):
-                    # Almacenar la casilla detectada
-                    self.casillas_detectadas.add((x_sensor, y_sensor))
-                    
-                    # Solo dibujar la celda si no ha sido visitada
-                    if not "Visitado" in self.agente.conocimiento[y_sensor][x_sensor]["recorrido"]:
-                        tipo_terreno = TERRENOS[self.mapa.matriz[y_sensor][x_sensor]]
-                        color = COLORES_TERRENO[tipo_terreno]
-                        pygame.draw.rect(self.screen, color, pygame.Rect(
-                            x_sensor * self.cell_size, y_sensor * self.cell_size, self.cell_size, self.cell_size
-                        ))
-
-                        # Dibujar 'S' en las casillas detectadas por sensores
-                        text = self.font.render('S', True, (0, 0, 0))  # Color negro
-                        text_rect = text.get_rect(center=(x_sensor * self.cell_size + self.cell_size // 2,
-                                                        y_sensor * self.cell_size + self.cell_size // 2))
-                        self.screen.blit(text, text_rect)
-
-            # Dibujar las casillas detectadas anteriormente
-            for (x, y) in self.casillas_detectadas:
-                # Verificar si la celda ha sido visitada
-                if not "Visitado" in self.agente.conocimiento[y][x]["recorrido"]:
-                    tipo_terreno = TERRENOS[self.mapa.matriz[y][x]]
-                    color = COLORES_TERRENO[tipo_terreno]
-                    pygame.draw.rect(self.screen, color, pygame.Rect(
-                        x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size
-                    ))
-
-                    # Dibujar 'S' en las casillas detectadas anteriormente
-                    text = self.font.render('S', True, (0, 0, 0))  # Color negro
-                    text_rect = text.get_rect(center=(x * self.cell_size + self.cell_size // 2,
-                                                    y * self.cell_size + self.cell_size // 2))
-                    self.screen.blit(text, text_rect)
+            celdas.update((x, y) for x, y in self.casillas_detectadas if x0 <= x < x1 and y0 <= y < y1)
+        banderas = np.frombuffer(self.agente.banderas, dtype=np.uint8).reshape(self.agente.alto, self.agente.ancho)
+        ys, xs = np.nonzero(banderas[y0:y1, x0:x1] & VISITADO)
+        celdas.update(zip((xs + x0).tolist(), (ys + y0).tolist()))
+        for pos in (self.punto_inicio, self.punto_fin, (self.agente.pos_x, self.agente.pos_y)):
+            self.marcar_sucia(pos)
+        celdas.update(self.celdas_sucias)
 
-        else:
-            # Mostrar el mapa completo (Vista Total)
-            for y, fila in enumerate(self.mapa.matriz):
-                for x, tipo in enumerate(fila):
-                    tipo_terreno = TERRENOS[tipo]
-                    color = COLORES_TERRENO[tipo_terreno]
-                    pygame.draw.rect(self.screen, color, pygame.Rect(
-                        x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size
-                    ))
-
-                    # Verificar si es la posición de inicio
-                    if (x, y) == self.punto_inicio:
-                        # Dibujar 'I' en la posición de inicio
-                        text = self.font.render('I', True, (0, 0, 0))  # Color negro
-                        text_rect = text.get_rect(center=(x * self.cell_size + self.cell_size // 2,
-                                                        y * self.cell_size + self.cell_size // 2))
-                        self.screen.blit(text, text_rect)
-                    # Verificar si la celda ha sido visitada
-                    elif "Visitado" in self.agente.conocimiento[y][x]["recorrido"]:
-                        # Dibujar 'V' en las casillas visitadas
-                        text = self.font.render('V', True, (0, 0, 0))  # Color negro
-                        text_rect = text.get_rect(center=(x * self.cell_size + self.cell_size // 2,
-                                                        y * self.cell_size + self.cell_size // 2))
-                        self.screen.blit(text, text_rect)
+        pendientes = len(self.rects_sucios)
+        self.dibujar_celdas(celdas)
+        # Toda el área del mapa se presenta como un solo rectángulo
+        del self.rects_sucios[pendientes:]
+        self.rects_sucios.append(area_mapa)
+        self.redibujar_todo = False
 
+    def presentar_pantalla(self):
+        """
+        Envía a la pantalla solo los rectángulos que cambiaron.
+        """
+        if self.rects_sucios:
+            pygame.display.update(self.rects_sucios)
+            self.rects_sucios = []
 
     def ejecutar_juego(self):
         """
@@ -171,15 +411,13 @@ class GameManager:
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.manejar_eventos_mouse(event)
 
-            # Dibujar todo
-            self.screen.fill((0, 0, 0))  # Fondo negro
+            # Avanzar la búsqueda en curso y dibujar solo lo que cambió
+            self.avanzar_busqueda()
             self.dibujar_mapa()
-            self.agente.dibujar(self.screen)
-            self.mostrar_puntos_inicio_fin()
             self.mostrar_sidebar()
 
-            pygame.display.flip()
-            clock.tick(10)  # Controlar la velocidad del bucle
+            self.presentar_pantalla()
+            clock.tick(self.fps)  # Controlar la velocidad del bucle
 
         pygame.quit()
 
@@ -187,14 +425,32 @@ class GameManager:
         """
         Maneja los eventos del teclado.
         """
+        # Desplazar la cámara con las flechas
+        if event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+            paso = max(1, self.camara.columnas_visibles() // 8)
+            dx = {pygame.K_LEFT: -paso, pygame.K_RIGHT: paso}.get(event.key, 0)
+            dy = {pygame.K_UP: -paso, pygame.K_DOWN: paso}.get(event.key, 0)
+            self.mover_camara(self.camara.desplazar(dx, dy))
+
+        # Zoom con '+' y '-'
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.mover_camara(self.camara.acercar(1))
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.mover_camara(self.camara.acercar(-1))
+
+        # Centrar la cámara en el agente con 'Inicio'
+        elif event.key == pygame.K_HOME:
+            self.mover_camara(self.camara.centrar_en(self.agente.pos_x, self.agente.pos_y))
+
         # Alternar modo edición con 'E'
-        if event.key == pygame.K_e:
+        elif event.key == pygame.K_e:
             self.modo_edicion = not self.modo_edicion
             print(f"Modo Edición {'activado' if self.modo_edicion else 'desactivado'}.")
 
         # Alternar modo vista de sensores con 'V'
         elif event.key == pygame.K_v:
             self.modo_vista_sensores = not self.modo_vista_sensores
+            self.redibujar_todo = True
             print(f"Modo Vista Sensores {'activado' if self.modo_vista_sensores else 'desactivado'}.")
 
         # Alternar modo selección de puntos de inicio y fin con 'P'
@@ -222,8 +478,11 @@ class GameManager:
             print(f"Terreno seleccionado: {self.terreno_seleccionado}.")
 
         # Cambiar algoritmo de búsqueda solo si NO está en modo edición
-        elif not self.modo_edicion and event.key in [pygame.K_7, pygame.K_8, pygame.K_9]:
+        elif not self.modo_edicion and event.key in [pygame.K_4, pygame.K_5, pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9]:
             algoritmo_map = {
+                pygame.K_4: 'jps',
+                pygame.K_5: 'bfs-bi',
+                pygame.K_6: 'a*-bi',
                 pygame.K_7: 'bfs',
                 pygame.K_8: 'dfs',
                 pygame.K_9: 'a*'
@@ -231,6 +490,12 @@ class GameManager:
             self.algoritmo_seleccionado = algoritmo_map.get(event.key, self.algoritmo_seleccionado)
             print(f"Algoritmo de búsqueda seleccionado: {self.algoritmo_seleccionado.upper()}.")
 
+        # Alternar la heurística de A* con 'K'
+        elif event.key == pygame.K_k:
+            siguiente = (HEURISTICAS.index(self.heuristica_seleccionada) + 1) % len(HEURISTICAS)
+            self.heuristica_seleccionada = HEURISTICAS[siguiente]
+            print(f"Heurística de A* seleccionada: {self.heuristica_seleccionada}.")
+
         # Agregar teclas a la prioridad de dirección
         elif event.key in [pygame.K_u, pygame.K_d, pygame.K_r, pygame.K_l] and self.modo_edicion:
             if event.key == pygame.K_u:
@@ -265,7 +530,7 @@ class GameManager:
 
         # Resolver laberinto en modo paso a paso con 'R' solo si el algoritmo seleccionado es BFS o DFS
         elif event.key == pygame.K_r:
-            if self.algoritmo_seleccionado in ['bfs', 'dfs', 'a*']:
+            if self.algoritmo_seleccionado in ALGORITMOS:
                 print(f"Tecla 'R' presionada: Resolviendo en modo paso a paso con {self.algoritmo_seleccionado.upper()}...")
                 self.resolver_laberinto(modo='paso_a_paso')
             else:
@@ -273,18 +538,93 @@ class GameManager:
 
         # Resolver laberinto en modo decisión por decisión con 'D' solo si el algoritmo seleccionado es BFS o DFS
         elif event.key == pygame.K_d:
-            if self.algoritmo_seleccionado in ['bfs', 'dfs', 'a*']:
+            if self.algoritmo_seleccionado in ALGORITMOS:
                 print(f"Tecla 'D' presionada: Resolviendo en modo decisión por decisión con {self.algoritmo_seleccionado.upper()}...")
                 self.resolver_laberinto(modo='decision_por_decision')
             else:
                 print("El algoritmo seleccionado no soporta modo decisión por decisión.")
 
+        # Calcular la ruta con el planificador incremental con 'I'
+        elif event.key == pygame.K_i:
+            print("Tecla 'I' presionada: Replanificando con D* Lite...")
+            self.replanificar()
+
+        # Calcular la ruta con el planificador jerárquico con 'J'
+        elif event.key == pygame.K_j:
+            print("Tecla 'J' presionada: Buscando con HPA*...")
+            self.planificar_jerarquico()
+
+        # Mostrar u ocultar el mapa de calor de distancias al punto final con 'F'
+        elif event.key == pygame.K_f:
+            self.alternar_mapa_calor()
+
+        # Controlar la búsqueda en curso: pausa, paso, velocidad, avance rápido y cancelar
+        elif event.key == pygame.K_SPACE:
+            if self.busqueda is not None:
+                self.busqueda_pausada = not self.busqueda_pausada
+                self.avance_rapido = False
+                print(f"Búsqueda {'en pausa' if self.busqueda_pausada else 'reanudada'}.")
+            else:
+                print("No hay ninguna búsqueda en curso.")
+        elif event.key == pygame.K_n:
+            if self.busqueda is not None:
+                self.busqueda_pausada = True
+                self.avance_rapido = False
+                self.pasos_pendientes += 1
+            else:
+                print("No hay ninguna búsqueda en curso.")
+        elif event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+            cambio = 1 if event.key == pygame.K_RIGHTBRACKET else -1
+            self.indice_velocidad = min(max(self.indice_velocidad + cambio, 0), len(VELOCIDADES_BUSQUEDA) - 1)
+            print(f"Velocidad de búsqueda: {VELOCIDADES_BUSQUEDA[self.indice_velocidad]} pasos por cuadro.")
+        elif event.key == pygame.K_g:
+            if self.busqueda is not None:
+                self.avance_rapido = not self.avance_rapido
+                self.busqueda_pausada = False
+                print(f"Avance rápido {'activado' if self.avance_rapido else 'desactivado'}.")
+            else:
+                print("No hay ninguna búsqueda en curso.")
+        elif event.key == pygame.K_ESCAPE:
+            if self.busqueda is not None:
+                self.cancelar_busqueda("Búsqueda cancelada.")
+            else:
+                print("No hay ninguna búsqueda en curso.")
+
+        # Grabar los eventos de las búsquedas con 'L' y reproducir la última grabada con 'Y'
+        elif event.key == pygame.K_l:
+            self.grabar_busquedas = not self.grabar_busquedas
+            print(f"Grabación de búsquedas {'activada' if self.grabar_busquedas else 'desactivada'}.")
+        elif event.key == pygame.K_y:
+            self.reproducir_registro()
+
+        # Medir las búsquedas con 'M' y mostrar sus expansiones por celda con 'H'
+        elif event.key == pygame.K_m:
+            self.medir_busquedas = not self.medir_busquedas
+            print(f"Medición de búsquedas {'activada' if self.medir_busquedas else 'desactivada'}.")
+        elif event.key == pygame.K_h:
+            if not self.mostrar_expansiones and self.estadisticas is None:
+                print("No hay estadísticas todavía: active la medición con 'M' y busque con 'R' o 'D'.")
+            else:
+                self.mostrar_expansiones = not self.mostrar_expansiones
+                print(f"Mapa de expansiones {'activado' if self.mostrar_expansiones else 'desactivado'}.")
+                self.construir_capa_terreno()
+
+        # Mostrar u ocultar las componentes conexas del agente con 'C'
+        elif event.key == pygame.K_c:
+            self.mostrar_componentes = not self.mostrar_componentes
+            print(f"Componentes conexas {'visibles' if self.mostrar_componentes else 'ocultas'}.")
+            self.construir_capa_terreno()
+
+        # Buscar decisión por decisión sobre el grafo de pasillos o sobre la malla con 'B'
+        elif event.key == pygame.K_b:
+            self.usar_pasillos = not self.usar_pasillos
+            print(f"Decisión por decisión sobre {'el grafo de pasillos' if self.usar_pasillos else 'la malla'}.")
+
         # Mostrar el árbol generado con 'T'
         elif event.key == pygame.K_t:
             if hasattr(self, 'arbol'):  # Verificar si ya existe un árbol generado
                 print("Tecla 'T' presionada: Mostrando el árbol...")
-                for pre, fill, node in RenderTree(self.arbol):
-                    print(f"{pre}{node.name}")
+                self.arbol.imprimir()
             else:
                 print("No se ha generado ningún árbol todavía.")
 
@@ -300,13 +640,27 @@ class GameManager:
                     elif direccion == "L":
                         self.agente.mover(-1, 0)
 
+        # Exportar el árbol generado a DOT y JSON con 'X'
+        elif event.key == pygame.K_x:
+            if hasattr(self, 'arbol'):
+                nodos = self.arbol.exportar_dot("arbol_decisiones.dot")
+                self.arbol.exportar_json("arbol_decisiones.json")
+                print(f"Árbol exportado ({nodos} de {len(self.arbol)} nodos) a arbol_decisiones.dot y arbol_decisiones.json")
+            else:
+                print("No se ha generado ningún árbol todavía.")
 
     def manejar_eventos_mouse(self, event):
         """
         Maneja los eventos del ratón.
         """
         mouse_pos = pygame.mouse.get_pos()
-        celda_x, celda_y = self.mapa.detectar_celda(mouse_pos)
+
+        # La rueda del ratón hace zoom manteniendo fija la celda bajo el cursor
+        if event.button in (4, 5):
+            self.mover_camara(self.camara.acercar(1 if event.button == 4 else -1, mouse_pos))
+            return
+
+        celda_x, celda_y = self.mapa.detectar_celda(mouse_pos, self.camara)
         
         # Editar el mapa solo si estamos en modo edición y se selecciona una celda válida
         if self.modo_edicion and celda_x is not None and celda_y is not None:
@@ -326,7 +680,10 @@ class GameManager:
                 self.punto_fin = (celda_x, celda_y)
         #Guardar mapa
         elif event.button == 1 and self.boton_guardar.collidepoint(mouse_pos):
-            self.mapa.guardar_mapa("mapa_guardado.csv")
+            # El agente también tiene la matriz: se suelta el mapeo del archivo antes de reemplazarlo
+            if self.mapa.soltar_mapeo(self.archivo_guardado):
+                self.agente.mapa_original = self.mapa.matriz
+            self.mapa.guardar_mapa(self.archivo_guardado)
             print("Mapa guardado correctamente.")
         
 
@@ -335,32 +692,51 @@ class GameManager:
         Actualiza el agente con el nuevo tipo seleccionado.
         """
         x, y = self.agente.pos_x, self.agente.pos_y  # Mantener la posición actual
-        self.agente = Agente(x, y, self.cell_size, self.mapa.matriz, self.tipo_agente)
+        self.agente = Agente(x, y, self.cell_size, self.mapa.matriz, self.tipo_agente,
+                             self.mapa.costos_agente(self.tipo_agente))
+        self.redibujar_todo = True  # El nuevo agente no conserva el conocimiento anterior
+        self.planificador = None  # Los costos del planificador eran los del agente anterior
+        self.capa_pendiente = self.mostrar_mapa_calor or self.mostrar_componentes  # Dependen del agente
+        self.cancelar_busqueda("Búsqueda cancelada: cambió el agente.")
 
 
-    def mostrar_puntos_inicio_fin(self):
+    def estado_sidebar(self):
         """
-        Dibuja los puntos de inicio y fin en el mapa.
+        Valores que muestra el sidebar; si no cambian no hace falta volver a componerlo.
+        Las componentes entran por su revisión, sin recalcular su resumen en cada cuadro.
         """
-        if self.punto_inicio is not None:
-            x_inicio, y_inicio = self.punto_inicio
-            pygame.draw.rect(self.screen, (0, 255, 0), pygame.Rect(
-                x_inicio * self.cell_size, y_inicio * self.cell_size, self.cell_size, self.cell_size
-            ), 2)  # Borde verde para el punto de inicio
-
-        if self.punto_fin is not None:
-            x_fin, y_fin = self.punto_fin
-            pygame.draw.rect(self.screen, (255, 0, 0), pygame.Rect(
-                x_fin * self.cell_size, y_fin * self.cell_size, self.cell_size, self.cell_size
-            ), 2)  # Borde rojo para el punto de fin
+        componentes = self.mapa.componentes_agente(self.tipo_agente) if self.mostrar_componentes else None
+        return (self.modo_edicion, self.modo_vista_sensores, self.modo_seleccion_puntos,
+                self.terreno_seleccionado, self.tipo_agente, self.algoritmo_seleccionado,
+                self.prioridad_direccion, tuple(self.TERRENOS.items()),
+                self.cache_rutas.aciertos, self.cache_rutas.fallos, self.mostrar_mapa_calor,
+                self.heuristica_seleccionada, self.busqueda is not None, self.busqueda_pausada,
+                self.avance_rapido, self.indice_velocidad, self.grabar_busquedas, self.medir_busquedas,
+                self.mostrar_expansiones, self.estadisticas, self.mostrar_componentes,
+                componentes, componentes.revision if componentes else None, self.usar_pasillos)
 
     def mostrar_sidebar(self):
         """
         Muestra el sidebar con las instrucciones y opciones de edición.
+        El sidebar se compone en una superficie aparte y solo se regenera cuando
+        cambia alguno de los valores que muestra.
         """
-        # Dibujar el sidebar como un rectángulo gris
+        estado = self.estado_sidebar()
+        if estado == self.estado_sidebar_dibujado:
+            return
+        self.componer_sidebar()
         sidebar_rect = pygame.Rect(self.screen.get_width() - self.sidebar_width, 0, self.sidebar_width, self.window_height)
-        pygame.draw.rect(self.screen, (50, 50, 50), sidebar_rect)
+        self.screen.blit(self.capa_sidebar, sidebar_rect)
+        self.rects_sucios.append(sidebar_rect)
+        self.estado_sidebar_dibujado = estado
+
+    def componer_sidebar(self):
+        """
+        Renderiza el sidebar completo sobre self.capa_sidebar.
+        """
+        # Dibujar el sidebar como un rectángulo gris
+        self.capa_sidebar.fill((50, 50, 50))
+        x_sidebar = self.screen.get_width() - self.sidebar_width
 
         # Instrucciones para el usuario
         instrucciones = [
@@ -369,27 +745,41 @@ class GameManager:
             f"Modo Vista Sensores: {'ON' if self.modo_vista_sensores else 'OFF'} - Presiona 'V'",
             f"Modo Selección de Puntos: {'ON' if self.modo_seleccion_puntos else 'OFF'} - Presiona 'P'",
             f"Terreno seleccionado: {self.terreno_seleccionado}",
-            "Teclas: 1 (Tierra), 2 (Agua), 3 (Arena),",
+            "En modo edición: 1 (Tierra), 2 (Agua), 3 (Arena),",
             "4 (Bosque), 0 (Montaña)",
             "Seleccione inicio con clic izquierdo, ",
             "fin con clic derecho",
             "Guardar mapa: Haga clic en el botón",
             f"Agente seleccionado: {self.tipo_agente} ",
-            "(Presiona 'H' - Human, 'M' - Monkey,", 
+            "(En modo edición: 'H' - Human, 'M' - Monkey,"
             "'O' - Octopus, 'S' - Sasquatch)",
             "Terrenos disponibles:",
             f"Algoritmo seleccionado: {self.algoritmo_seleccionado.upper()}",
             "Algoritmos disponibles:",
-            "(Presiona '7' - BFS, '8' - DFS, '9' - A*)",
+            f"(Fuera de edición: '7' - BFS, '8' - DFS, '9' - A*; 'K' - heurística: {self.heuristica_seleccionada})",
+            "(Bidireccionales: '5' - BFS-BI, '6' - A*-BI; '4' - JPS)",
             f"Prioridad {self.prioridad_direccion} ",
-            "(Presiona 'U' - arriba, 'D' - abajo,'R' - derecha, 'L' - izquierda)"
+            "(En modo edición: 'U'/'D'/'R'/'L' - arriba/abajo/derecha/izquierda, 'C' - borrar)",
+            "Fuera de edición: 'R'/'D' - resolver paso a paso/decisión por decisión",
+            "Árbol: 'T' - mostrar en consola, 'X' - exportar a DOT/JSON",
+            f"Rutas: 'I' - D* Lite, 'J' - HPA*; Mapa de calor: {'ON' if self.mostrar_mapa_calor else 'OFF'} - 'F'",
+            f"Caché de rutas: {self.cache_rutas.aciertos} aciertos, {self.cache_rutas.fallos} fallos",
+            f"Búsqueda: {self.estado_busqueda()}, {VELOCIDADES_BUSQUEDA[self.indice_velocidad]} pasos/cuadro",
+            "(Espacio - pausa, 'N' - paso, '['/']' - velocidad, 'G' - rápido, Esc - cancelar)",
+            f"Grabar búsquedas: {'ON' if self.grabar_busquedas else 'OFF'} - 'L'; reproducir - 'Y'",
+            f"Medir búsquedas: {'ON' if self.medir_busquedas else 'OFF'} - 'M'; "
+            f"expansiones: {'ON' if self.mostrar_expansiones else 'OFF'} - 'H'",
+        ] + self.lineas_estadisticas() + [
+            f"Componentes: {self.resumen_componentes() if self.mostrar_componentes else 'ocultas'} - 'C'",
+            f"Decisión por decisión sobre pasillos: {'ON' if self.usar_pasillos else 'OFF'} - 'B'",
+            "Cámara: flechas - desplazar, '+'/'-' o rueda - zoom, Inicio - centrar"
         ]
 
         # Renderizar las instrucciones
         y_offset = 10  # Desplazamiento inicial
         for texto in instrucciones:
             label = self.font.render(texto, True, (255, 255, 255))
-            self.screen.blit(label, (self.screen.get_width() - self.sidebar_width + 10, y_offset))
+            self.capa_sidebar.blit(label, (10, y_offset))
             y_offset += 20  # Incrementar para cada línea de instrucciones
 
         # Añadir un espacio extra antes de mostrar los terrenos
@@ -403,49 +793,378 @@ class GameManager:
 
                 # Verificar si el terreno está en el área visible del sidebar
                 if 0 <= terreno_y < self.window_height - 30:
-                    self.screen.blit(label_terreno, (self.screen.get_width() - self.sidebar_width + 10, terreno_y))
+                    self.capa_sidebar.blit(label_terreno, (10, terreno_y))
 
         # Definir la posición vertical para los botones
         y_offset = self.screen.get_height() - 60  # Ajusta esta posición según necesites
         
-        # Botón para guardar el mapa
-        self.boton_guardar = pygame.Rect(self.screen.get_width() - self.sidebar_width + 50, y_offset, 150, 30)
-        pygame.draw.rect(self.screen, (100, 100, 255), self.boton_guardar)
+        # Botón para guardar el mapa (en coordenadas de pantalla para detectar el clic)
+        self.boton_guardar = pygame.Rect(x_sidebar + 50, y_offset, 150, 30)
+        boton_local = self.boton_guardar.move(-x_sidebar, 0)
+        pygame.draw.rect(self.capa_sidebar, (100, 100, 255), boton_local)
         label_guardar = self.font.render("Guardar Mapa", True, (255, 255, 255))
-        self.screen.blit(label_guardar, (self.boton_guardar.x + 15, self.boton_guardar.y + 5))
+        self.capa_sidebar.blit(label_guardar, (boton_local.x + 15, boton_local.y + 5))
+
+    def aplicar_evento(self, evento, pos, costo, animar=True):
+        """
+        Refleja en el agente un evento de la búsqueda: marca las bifurcaciones y lleva
+        al agente a cada nodo agregado a la frontera. Sin animar (avance rápido) el
+        nodo solo se marca como visitado, sin mover al agente ni leer sus sensores.
+        """
+        if evento == EVENTO_DECISION:
+            self.agente.marcar(*pos, DECISION)
+        elif evento == EVENTO_AGREGAR:
+            if animar:
+                self.agente.teletransportar(*pos)
+                self.registrar_posicion_agente()
+            else:
+                self.agente.marcar(*pos, VISIBLE | VISITADO)
+                self.celdas_sucias.add(pos)
+
+    def es_paso(self, evento, modo):
+        """
+        Indica si el evento cuenta como un paso de la visualización: en modo paso a
+        paso todos los eventos, en decisión por decisión solo las bifurcaciones.
+        """
+        return modo == 'paso_a_paso' or evento == EVENTO_DECISION
+
+    def observador_busqueda(self, modo):
+        """
+        Crea el observador para recorrer una búsqueda de una sola vez (funciones de
+        BFS.py, DFS.py, AStar.py y JPS.py): aplica cada evento y presenta el mapa en
+        cada paso del modo. El bucle del juego usa avanzar_busqueda en su lugar.
+        """
+        def observador(evento, pos, costo):
+            self.aplicar_evento(evento, pos, costo)
+            if self.es_paso(evento, modo):
+                self.dibujar_mapa()
+                self.presentar_pantalla()
+
+        return observador
 
     def resolver_laberinto(self, modo='paso_a_paso'):
+        """
+        Inicia la búsqueda del algoritmo seleccionado entre los puntos marcados. La
+        búsqueda no bloquea el juego: ejecutar_juego la avanza unos pasos por cuadro
+        con avanzar_busqueda. Las consultas repetidas salen de la caché de rutas.
+        """
         if self.punto_inicio and self.punto_fin:
-            if self.algoritmo_seleccionado == 'bfs':
-                if modo == 'paso_a_paso':
-                    camino, arbol = bfs_paso_a_paso_con_arbol(self.agente, self.punto_inicio, self.punto_fin, self)
-                elif modo == 'decision_por_decision':
-                    camino, arbol = bfs_decision_por_decision_con_arbol(self.agente, self.punto_inicio, self.punto_fin, self)
-            elif self.algoritmo_seleccionado == 'dfs':
-                if modo == 'paso_a_paso':
-                    camino, arbol = dfs_paso_a_paso_con_arbol(self.agente, self.punto_inicio, self.punto_fin, self)
-                elif modo == 'decision_por_decision':
-                    camino, arbol = dfs_decision_por_decision_con_arbol(self.agente, self.punto_inicio, self.punto_fin, self)
-            elif self.algoritmo_seleccionado == 'a*':
-                if modo == 'paso_a_paso':
-                    camino, arbol = astar_paso_a_paso_con_arbol(self.agente, self.punto_inicio, self.punto_fin, self)
-                elif modo == 'decision_por_decision':
-                    camino, arbol = astar_decision_por_decision_con_arbol(self.agente, self.punto_inicio, self.punto_fin, self)
-            # Puedes agregar más algoritmos aquí en el futuro
-
-            if camino:
-                print("Camino encontrado:", camino)
-                self.arbol = arbol
-                print("Árbol de decisiones generado:")
-                for pre, _, node in RenderTree(arbol):
-                    print(f"{pre}{node.name}")
-                # Mover al agente paso a paso
-                for paso in camino:
-                    x, y = paso
-                    self.agente.teletransportar(x, y)
-                    self.dibujar_mapa()
-                    self.agente.dibujar(self.screen)
-                    pygame.display.flip()
-                    # sleep(0.5)
+            self.cancelar_busqueda("Búsqueda anterior cancelada.")
+            if not self.hay_camino_posible():
+                return
+            # Las consultas repetidas sobre la misma versión del mapa salen de la caché
+            algoritmo = self.algoritmo_seleccionado
+            if algoritmo == 'a*':
+                algoritmo += f" ({self.heuristica_seleccionada})"
+            # En decisión por decisión solo importan las bifurcaciones: se busca sobre el grafo de pasillos
+            pasillos = self.usar_pasillos and modo == 'decision_por_decision' and \
+                self.algoritmo_seleccionado in ALGORITMOS_PASILLOS
+            if pasillos:
+                algoritmo += " (pasillos)"
+            clave = self.cache_rutas.clave(self.mapa, self.tipo_agente, algoritmo,
+                                           self.punto_inicio, self.punto_fin)
+            # Al grabar o medir se busca siempre, para que quede el registro o las estadísticas
+            buscar = self.grabar_busquedas or self.medir_busquedas
+            guardado = None if buscar else self.cache_rutas.obtener(clave)
+            if guardado is not None:
+                print(f"Ruta obtenida de la caché ({self.cache_rutas.aciertos} aciertos, {self.cache_rutas.fallos} fallos)")
+                self.mostrar_resultado(*guardado)
+                return
+
+            ancho = self.mapa.matriz.shape[1]
+            opciones = {'estimador': self.estimador_astar()} if self.algoritmo_seleccionado == 'a*' else {}
+            estadisticas = EstadisticasBusqueda() if self.medir_busquedas else None
+            if estadisticas is not None:
+                opciones['estadisticas'] = estadisticas
+            if pasillos:
+                grafo = self.mapa.grafo_pasillos(self.tipo_agente)
+                if grafo is not self.grafo_informado:
+                    # El mapa lo acaba de construir (primera vez o tras una edición)
+                    self.grafo_informado = grafo
+                    print(f"Grafo de pasillos de {self.tipo_agente}: {len(grafo)} nodos, "
+                          f"{grafo.cantidad_celdas_pasillo()} celdas en {len(grafo.pasillos)} pasillos")
+                eventos = eventos_pasillos(grafo, self.algoritmo_seleccionado, self.punto_inicio,
+                                           self.punto_fin, **opciones)
+            else:
+                eventos = eventos_busqueda(self.algoritmo_seleccionado, self.agente.costos, ancho,
+                                           self.punto_inicio, self.punto_fin, **opciones)
+            if self.grabar_busquedas:
+                self.grabador = GrabadorEventos(ARCHIVO_REGISTRO, self.agente.costos, ancho, self.punto_inicio,
+                                                self.punto_fin, self.mapa.version, self.algoritmo_seleccionado,
+                                                self.tipo_agente)
+                eventos = grabar_eventos(eventos, self.grabador)
+            self.iniciar_busqueda(eventos, modo, clave, estadisticas)
+
+    def reproducir_registro(self):
+        """
+        Reproduce la última búsqueda grabada como si fuera una búsqueda en curso, con
+        los mismos controles de velocidad, pausa y avance rápido.
+        """
+        try:
+            registro = abrir_registro(ARCHIVO_REGISTRO)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo abrir el registro de eventos: {e}")
+            return
+        if registro.tipo_agente not in COSTOS_MOVIMIENTO or \
+                not registro.corresponde(self.mapa.costos_agente(registro.tipo_agente), self.mapa.matriz.shape[1]):
+            print(f"El registro se grabó sobre otro mapa (versión {registro.version_mapa}); no se puede reproducir.")
+            return
+        self.cancelar_busqueda("Búsqueda anterior cancelada.")
+        print(f"Reproduciendo {len(registro)} eventos de {registro.algoritmo.upper()} ({registro.tipo_agente}) "
+              f"de {registro.punto_inicio} a {registro.punto_fin}...")
+        self.iniciar_busqueda(registro.eventos(), 'paso_a_paso', None)
+
+    def iniciar_busqueda(self, eventos, modo, clave, estadisticas=None):
+        """
+        Deja `eventos` (búsqueda generadora o reproducción de un registro) como la
+        búsqueda en curso; su resultado se guarda en la caché de rutas bajo `clave`
+        y, si se mide, sus estadísticas quedan en self.estadisticas al terminar.
+        """
+        self.busqueda = eventos
+        self.estadisticas_en_curso = estadisticas
+        self.modo_busqueda = modo
+        self.clave_busqueda = clave
+        self.credito_busqueda = 0.0
+        self.pasos_pendientes = 0
+        self.busqueda_pausada = False
+        self.avance_rapido = False
+
+    def avanzar_busqueda(self):
+        """
+        Consume los eventos de la búsqueda en curso que tocan en este cuadro: los
+        pasos de la velocidad seleccionada (más los pedidos con 'N'), o en avance
+        rápido todos los que quepan en una fracción del cuadro, sin animar al agente.
+        """
+        if self.busqueda is None:
+            return
+        try:
+            if self.avance_rapido:
+                limite = perf_counter() + FRACCION_AVANCE_RAPIDO / self.fps
+                while perf_counter() < limite:
+                    for _ in range(EVENTOS_POR_CONSULTA_RELOJ):
+                        self.aplicar_evento(*next(self.busqueda), animar=False)
+                return
+            if not self.busqueda_pausada:
+                self.credito_busqueda += VELOCIDADES_BUSQUEDA[self.indice_velocidad]
+            pasos = int(self.credito_busqueda)
+            self.credito_busqueda -= pasos
+            pasos += self.pasos_pendientes
+            self.pasos_pendientes = 0
+            # Entre dos bifurcaciones puede haber muchos eventos: los pasos que no
+            # entran en el cuadro quedan pendientes para el siguiente
+            limite = perf_counter() + FRACCION_AVANCE_RAPIDO / self.fps
+            eventos = 0
+            while pasos > 0:
+                evento = next(self.busqueda)
+                self.aplicar_evento(*evento)
+                if self.es_paso(evento[0], self.modo_busqueda):
+                    pasos -= 1
+                eventos += 1
+                if eventos % EVENTOS_POR_CONSULTA_RELOJ == 0 and perf_counter() > limite:
+                    self.pasos_pendientes = pasos
+                    break
+        except StopIteration as fin:
+            self.busqueda = None
+            resultado = fin.value
+            if self.grabador is not None:
+                print(f"{self.grabador.cantidad} eventos grabados en {self.grabador.nombre_archivo}")
+                self.grabador = None
+            if resultado is None:
+                print("Reproducción terminada.")
+                return
+            if self.estadisticas_en_curso is not None:
+                self.publicar_estadisticas(self.estadisticas_en_curso)
+            self.cache_rutas.guardar(self.clave_busqueda, (resultado.camino, resultado.arbol))
+            self.mostrar_resultado(resultado.camino, resultado.arbol)
+
+    def publicar_estadisticas(self, estadisticas):
+        """
+        Deja las estadísticas de la búsqueda terminada a la vista: en el sidebar, en
+        consola, en ARCHIVO_ESTADISTICAS y en el mapa de expansiones.
+        """
+        self.estadisticas = estadisticas
+        self.estadisticas_en_curso = None
+        print(f"Estadísticas: {estadisticas.expandidos} expandidos, {estadisticas.agregados} agregados, "
+              f"{estadisticas.descartados} descartados, frontera máxima {estadisticas.frontera_maxima}, "
+              f"{estadisticas.tiempo_total() * 1000:.1f} ms")
+        try:
+            estadisticas.exportar_json(ARCHIVO_ESTADISTICAS)
+        except OSError as e:
+            print(f"No se pudieron guardar las estadísticas: {e}")
+        if self.mostrar_expansiones:
+            self.capa_pendiente = True
+
+    def resumen_componentes(self):
+        """
+        Cantidad de componentes conexas del agente y tamaños de las mayores. Se
+        recalcula solo cuando cambian las componentes (ver ComponentesConexas.revision).
+        """
+        componentes = self.mapa.componentes_agente(self.tipo_agente)
+        guardado = self.resumen_guardado
+        if guardado is None or guardado[0] is not componentes or guardado[1] != componentes.revision:
+            mayores = ", ".join(str(tamano) for tamano in componentes.mayores())
+            guardado = (componentes, componentes.revision, f"{len(componentes)} (mayores: {mayores} celdas)")
+            self.resumen_guardado = guardado
+        return guardado[2]
+
+    def hay_camino_posible(self):
+        """
+        Indica si el fin está en la componente conexa del inicio para el agente
+        actual; si no, lo informa sin buscar.
+        """
+        if self.mapa.componentes_agente(self.tipo_agente).conectados(self.punto_inicio, self.punto_fin):
+            return True
+        print(f"No se encontró ningún camino: el fin no es alcanzable desde el inicio para {self.tipo_agente}.")
+        return False
+
+    def lineas_estadisticas(self):
+        """
+        Líneas del sidebar con las estadísticas de la última búsqueda medida.
+        """
+        e = self.estadisticas
+        if e is None:
+            return ["Sin estadísticas (active 'M' y busque con 'R' o 'D')"]
+        tiempos = ", ".join(f"{fase} {tiempo * 1000:.1f}" for fase, tiempo in e.tiempos.items())
+        return [f"Expandidos {e.expandidos}, agregados {e.agregados}, descartados {e.descartados}",
+                f"Frontera máx. {e.frontera_maxima}, cerrados máx. {e.cerrados_maximo}",
+                f"Tiempos (ms): {tiempos}"]
+
+    def cancelar_busqueda(self, mensaje):
+        """
+        Descarta la búsqueda en curso, si la hay, informando el motivo.
+        """
+        if self.busqueda is not None:
+            self.busqueda.close()
+            self.busqueda = None
+            self.grabador = None
+            self.estadisticas_en_curso = None
+            print(mensaje)
+
+    def estado_busqueda(self):
+        """
+        Descripción corta del estado de la búsqueda en curso para el sidebar.
+        """
+        if self.busqueda is None:
+            return "inactiva"
+        if self.avance_rapido:
+            return "avance rápido"
+        return "en pausa" if self.busqueda_pausada else "en curso"
+
+    def mostrar_resultado(self, camino, arbol):
+        """
+        Informa el resultado de una búsqueda y recorre el camino encontrado.
+        """
+        if camino:
+            print("Camino encontrado:", camino)
+            self.arbol = arbol
+            print(f"Árbol de decisiones generado: {len(arbol)} nodos")
+            if self.imprimir_arbol:
+                arbol.imprimir()
+            self.recorrer_camino(camino)
+        else:
+            print("No se encontró ningún camino")
+
+    def estimador_astar(self):
+        """
+        Estimador de A* según la heurística seleccionada (None para Manhattan). La
+        tabla ALT del agente se abre del archivo junto al mapa o se calcula y guarda.
+        """
+        costos = self.mapa.costos_agente(self.tipo_agente)
+        ancho = self.mapa.matriz.shape[1]
+        if self.heuristica_seleccionada == 'escalada':
+            return heuristica_escalada(costos, ancho, self.punto_fin)
+        if self.heuristica_seleccionada == 'alt':
+            tabla = self.tablas_hitos.get(self.tipo_agente)
+            if tabla is None:
+                print("Preparando la tabla de hitos del agente...")
+                tabla = hitos_para_mapa(self.archivo_mapa, self.tipo_agente, costos, ancho)
+                self.tablas_hitos[self.tipo_agente] = tabla
+            return tabla.estimador(self.punto_fin)
+        return None
+
+    def alternar_mapa_calor(self):
+        """
+        Activa o desactiva el mapa de calor del campo de distancias y, si hay punto de
+        inicio, muestra el camino leído del campo.
+        """
+        if not self.mostrar_mapa_calor and self.punto_fin is None:
+            print("Seleccione primero el punto final.")
+            return
+        self.mostrar_mapa_calor = not self.mostrar_mapa_calor
+        print(f"Mapa de calor {'activado' if self.mostrar_mapa_calor else 'desactivado'}.")
+        if self.mostrar_mapa_calor and self.punto_inicio:
+            resultado = self.campo_distancias().resultado(self.punto_inicio)
+            if resultado.camino:
+                print(f"Costo desde el inicio según el campo: {resultado.costo} ({len(resultado.camino)} pasos)")
             else:
-                print("No se encontró ningún camino")
+                print("No hay camino desde el inicio hasta el fin.")
+        self.construir_capa_terreno()
+
+    def recorrer_camino(self, camino):
+        """
+        Mueve al agente por el camino mostrando cada paso.
+        """
+        for paso in camino:
+            x, y = paso
+            self.agente.teletransportar(x, y)
+            self.dibujar_mapa()
+            self.presentar_pantalla()
+            # sleep(0.5)
+
+    def replanificar(self):
+        """
+        Calcula la ruta entre los puntos marcados con el planificador incremental. El
+        planificador se conserva mientras no cambien el punto final ni el agente, así
+        que después de editar el mapa o mover el inicio solo se repara lo afectado.
+        """
+        if not (self.punto_inicio and self.punto_fin):
+            print("Seleccione primero los puntos de inicio y fin.")
+            return
+        if not self.hay_camino_posible():
+            return
+        if self.planificador is None or self.planificador.punto_fin != self.punto_fin:
+            self.planificador = PlanificadorIncremental(self.mapa.costos_agente(self.tipo_agente),
+                                                        self.mapa.matriz.shape[1],
+                                                        self.punto_inicio, self.punto_fin)
+        elif self.planificador.punto_inicio != self.punto_inicio:
+            self.planificador.mover_inicio(self.punto_inicio)
+
+        inicio = perf_counter()
+        resultado = self.planificador.planificar()
+        transcurrido = (perf_counter() - inicio) * 1000
+        print(f"Ruta calculada en {transcurrido:.1f} ms ({self.planificador.expandidos} nodos expandidos)")
+        if resultado.camino:
+            print("Camino encontrado:", resultado.camino)
+            print(f"Costo del camino: {resultado.costo}")
+            self.recorrer_camino(resultado.camino)
+        else:
+            print("No se encontró ningún camino")
+
+    def planificar_jerarquico(self):
+        """
+        Calcula la ruta entre los puntos marcados con el planificador jerárquico del
+        agente actual. Cada tipo de agente conserva su planificador, que al editar el
+        mapa solo recalcula los clusters afectados.
+        """
+        if not (self.punto_inicio and self.punto_fin):
+            print("Seleccione primero los puntos de inicio y fin.")
+            return
+        if not self.hay_camino_posible():
+            return
+        planificador = self.planificadores_jerarquicos.get(self.tipo_agente)
+        if planificador is None:
+            planificador = PlanificadorJerarquico(self.mapa.costos_agente(self.tipo_agente),
+                                                  self.mapa.matriz.shape[1])
+            self.planificadores_jerarquicos[self.tipo_agente] = planificador
+
+        inicio = perf_counter()
+        resultado = planificador.planificar(self.punto_inicio, self.punto_fin)
+        transcurrido = (perf_counter() - inicio) * 1000
+        print(f"Ruta calculada en {transcurrido:.1f} ms ({resultado.nodos_expandidos} nodos abstractos expandidos)")
+        if resultado.camino:
+            print("Camino encontrado:", resultado.camino)
+            print(f"Costo del camino: {resultado.costo} (cota inferior {resultado.cota_inferior}, "
+                  f"a lo sumo {resultado.suboptimalidad_maxima:.2f} veces el óptimo)")
+            self.recorrer_camino(resultado.camino)
+        else:
+            print("No se encontró ningún camino")
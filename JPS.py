@@ -0,0 +1,33 @@
+# JPS.py
+from busqueda import jps
+
+
+def jps_paso_a_paso_con_arbol(agente, punto_inicio, punto_fin, game_manager=None, estadisticas=None):
+    """
+    Realiza una búsqueda Jump Point Search paso a paso con un árbol de decisiones.
+    Salta por las regiones de costo uniforme y usa A* normal en los bordes entre terrenos.
+
+    Parámetros:
+        agente (Agente): Instancia de la clase Agente.
+        punto_inicio (tuple): Coordenadas iniciales del agente (x, y).
+        punto_fin (tuple): Coordenadas objetivo (x, y).
+        game_manager: Objeto para actualizar y dibujar el mapa (None para buscar sin visualizar).
+        estadisticas: EstadisticasBusqueda opcional donde contar la búsqueda.
+
+    Retorna:
+        tuple: Una lista con el camino hacia el objetivo o lista vacía si no es alcanzable, y el árbol de decisiones (ArbolBusqueda).
+    """
+    observador = game_manager.observador_busqueda('paso_a_paso') if game_manager else None
+    resultado = jps(agente.costos, len(agente.mapa_original[0]), punto_inicio, punto_fin, observador, estadisticas)
+    return resultado.camino, resultado.arbol
+
+
+def jps_decision_por_decision_con_arbol(agente, punto_inicio, punto_fin, game_manager=None, estadisticas=None):
+    """
+    Realiza una búsqueda Jump Point Search mostrando las decisiones en cada punto de salto.
+
+    Mismos parámetros y retorno que `jps_paso_a_paso_con_arbol`.
+    """
+    observador = game_manager.observador_busqueda('decision_por_decision') if game_manager else None
+    resultado = jps(agente.costos, len(agente.mapa_original[0]), punto_inicio, punto_fin, observador, estadisticas)
+    return resultado.camino, resultado.arbol
@@ -1,40 +1,261 @@
-import csv
+from array import array
+import os
+import struct
+import numpy as np
 import pygame
 
+from constantes import TABLAS_COSTOS
+from componentes import ComponentesConexas
+from pasillos import GrafoPasillos
+
+# Formato binario de mapas (.mapb): cabecera fija seguida de las celdas uint8 fila por fila.
+# Cabecera: firma, versión, codificación de terrenos, ancho y alto, rellenada hasta TAMANO_CABECERA.
+EXTENSION_BINARIA = '.mapb'
+FIRMA_BINARIA = b'SKIBIMAP'
+VERSION_BINARIA = 1
+CODIFICACION_TERRENOS = 1  # Códigos de constantes.TERRENOS
+FORMATO_CABECERA = '<8sHHII'
+TAMANO_CABECERA = 32
+
+
+def detectar_delimitador(datos):
+    """
+    Detecta el delimitador de un mapa de texto: ',' para CSV, espacio en otro caso.
+    """
+    primera_linea = datos.lstrip().split(b'\n', 1)[0]
+    return ',' if b',' in primera_linea else ' '
+
+
+def _contar_valores_por_fila(datos, delimitador):
+    """
+    Cuenta los valores de cada fila no vacía sobre los bytes, sin partir el texto en
+    líneas, y devuelve (alto, ancho) si todas las filas tienen los mismos valores.
+    """
+    caracteres = np.frombuffer(datos, dtype=np.uint8)
+    # Separan valores los espacios, saltos de línea y demás caracteres de control
+    separadores = (caracteres <= ord(' ')) | (caracteres == ord(delimitador))
+    comienzos = ~separadores
+    comienzos[1:] &= separadores[:-1]
+    if not comienzos.any():
+        raise ValueError("el mapa está vacío")
+    # Filas separadas por '\n' (o por '\r' en los archivos que solo usan ese salto)
+    salto = b'\n' if b'\n' in datos else b'\r'
+    inicios = np.flatnonzero(caracteres == salto[0]) + 1
+    inicios = np.concatenate(([0], inicios[inicios < caracteres.size]))
+    conteos = np.add.reduceat(comienzos, inicios, dtype=np.int32)
+    conteos = conteos[conteos > 0]
+    ancho = int(conteos[0])
+    distintas = np.flatnonzero(conteos != ancho)
+    if distintas.size:
+        numero = int(distintas[0]) + 1
+        raise ValueError(f"las filas del mapa no tienen la misma longitud (la fila {numero} no tiene {ancho} valores)")
+    return conteos.size, ancho
+
+
+def parsear_mapa(datos, delimitador=None):
+    """
+    Convierte el contenido (bytes) de un mapa .txt o .csv en una matriz uint8 de forma (alto, ancho).
+    """
+    if delimitador is None:
+        delimitador = detectar_delimitador(datos)
+    alto, ancho = _contar_valores_por_fila(datos, delimitador)
+    texto = datos.decode()
+    if delimitador != ' ':
+        texto = texto.replace(delimitador, ' ')
+    try:
+        valores = np.fromstring(texto, dtype=np.int64, sep=' ')
+    except ValueError:
+        # Las versiones recientes de numpy fallan en el primer valor inválido; las
+        # anteriores dejan de leer ahí y la cantidad de valores no coincide
+        valores = None
+    if valores is None or valores.size != alto * ancho:
+        raise ValueError("el mapa contiene valores que no son números")
+    if valores.size and (valores.min() < 0 or valores.max() > 255):
+        raise ValueError("los valores del mapa deben estar entre 0 y 255")
+    return valores.astype(np.uint8).reshape(alto, ancho)
+
+
+def serializar_mapa(matriz, delimitador=','):
+    """
+    Convierte una matriz de terrenos en el texto (bytes) de un mapa, una fila por línea.
+    """
+    alto, ancho = matriz.shape
+    if matriz.size and matriz.max() < 10:
+        # Todos los valores son de un dígito: se arma el texto directamente como bytes
+        salida = np.full((alto, 2 * ancho), ord(delimitador), dtype=np.uint8)
+        salida[:, 0::2] = matriz + ord('0')
+        salida[:, -1] = ord('\n')
+        return salida.tobytes()
+    filas = [delimitador.join(map(str, fila)) for fila in matriz.tolist()]
+    return ''.join(fila + '\n' for fila in filas).encode()
+
+
+def compilar_costos(matriz, tipo_agente):
+    """
+    Compila la malla densa de costos de un agente para una matriz de terrenos.
+
+    Retorna un array('H') plano indexado por y * ancho + x con el costo de entrar en
+    cada celda, o INTRANSITABLE si el agente no puede pisarla.
+    """
+    tabla = np.array(TABLAS_COSTOS[tipo_agente], dtype=np.uint16)
+    costos = array('H')
+    costos.frombytes(tabla[np.asarray(matriz, dtype=np.uint8)].tobytes())
+    return costos
+
+
+def es_mapa_binario(nombre_archivo):
+    """
+    Indica si el archivo empieza con la firma del formato binario.
+    """
+    with open(nombre_archivo, 'rb') as archivo:
+        return archivo.read(len(FIRMA_BINARIA)) == FIRMA_BINARIA
+
+
+def abrir_mapa_binario(nombre_archivo):
+    """
+    Abre un mapa binario con memoria mapeada (copia en escritura): la apertura no lee
+    las celdas, las páginas se cargan del disco a medida que se usan y las
+    modificaciones no se escriben en el archivo.
+    """
+    with open(nombre_archivo, 'rb') as archivo:
+        cabecera = archivo.read(TAMANO_CABECERA)
+    if len(cabecera) < TAMANO_CABECERA:
+        raise ValueError("cabecera de mapa binario incompleta")
+    firma, version, codificacion, ancho, alto = struct.unpack_from(FORMATO_CABECERA, cabecera)
+    if firma != FIRMA_BINARIA:
+        raise ValueError("el archivo no es un mapa binario")
+    if version != VERSION_BINARIA:
+        raise ValueError(f"versión de mapa binario no soportada: {version}")
+    if codificacion != CODIFICACION_TERRENOS:
+        raise ValueError(f"codificación de terrenos no soportada: {codificacion}")
+    if os.path.getsize(nombre_archivo) < TAMANO_CABECERA + ancho * alto:
+        raise ValueError("el mapa binario está truncado")
+    return np.memmap(nombre_archivo, dtype=np.uint8, mode='c', offset=TAMANO_CABECERA, shape=(alto, ancho))
+
+
+def guardar_mapa_binario(matriz, nombre_archivo):
+    """
+    Escribe la matriz en formato binario. Se escribe a un archivo temporal que luego
+    reemplaza al destino, así un mapa abierto con memoria mapeada sigue siendo válido.
+    """
+    alto, ancho = matriz.shape
+    cabecera = struct.pack(FORMATO_CABECERA, FIRMA_BINARIA, VERSION_BINARIA, CODIFICACION_TERRENOS, ancho, alto)
+    temporal = nombre_archivo + '.tmp'
+    with open(temporal, 'wb') as archivo:
+        archivo.write(cabecera.ljust(TAMANO_CABECERA, b'\0'))
+        archivo.write(np.ascontiguousarray(matriz, dtype=np.uint8).tobytes())
+    os.replace(temporal, nombre_archivo)
+
+
+def convertir_mapa(origen, destino):
+    """
+    Convierte un mapa entre los formatos .txt, .csv y binario según la extensión del destino.
+    """
+    mapa = Mapa(1)
+    if not mapa.cargar_mapa(origen):
+        return False
+    return mapa.guardar_mapa(destino, ' ' if destino.endswith('.txt') else ',')
+
 
 class Mapa:
     def __init__(self, cell_size: int) -> None:
-        self.matriz = []
+        self.matriz = np.zeros((0, 0), dtype=np.uint8)
         self.cell_size = cell_size
+        self._costos_por_agente = {}  # Caché de mallas de costos compiladas por tipo de agente
+        self._componentes_por_agente = {}  # Componentes conexas por tipo de agente
+        self._pasillos_por_agente = {}  # Grafos de pasillos por tipo de agente
+        self._suscriptores = []  # Funciones notificadas como funcion(x, y, valor) al modificar una celda
+        self.version = 0  # Aumenta con cada carga o modificación, para invalidar resultados guardados
 
-    def cargar_mapa(self, archivo, delimitador):
+    def cargar_mapa(self, archivo, delimitador=None):
         """
-        Cargar un mapa desde un archivo.
+        Cargar un mapa desde un archivo .txt (separado por espacios), .csv o binario (.mapb).
+        Si no se indica el delimitador se detecta a partir del contenido.
         """
         try:
-            with open(archivo, newline='') as archivo_texto:
-                lector = csv.reader(archivo_texto, delimiter=delimitador)
-                self.matriz = [[int(celda) for celda in fila] for fila in lector]
+            if es_mapa_binario(archivo):
+                self.matriz = abrir_mapa_binario(archivo)
+            else:
+                with open(archivo, 'rb') as archivo_mapa:
+                    self.matriz = parsear_mapa(archivo_mapa.read(), delimitador)
+            self._costos_por_agente = {}
+            self._componentes_por_agente = {}
+            self._pasillos_por_agente = {}
+            self.version += 1
         except FileNotFoundError:
             print(f"El archivo {archivo} no se encontró.")
             return None
         except Exception as e:
             print(f"Error al leer el archivo: {e}")
             return None
-        print("Mapa cargado exitosamente:")
-        print(self.matriz)
+        print(f"Mapa cargado exitosamente: {self.matriz.shape[1]}x{self.matriz.shape[0]}")
+        return True
+
+    def costos_agente(self, tipo_agente):
+        """
+        Devuelve la malla de costos compilada del agente, compilándola solo la primera vez.
+        La malla se mantiene al día cuando se modifica una celda.
+        """
+        costos = self._costos_por_agente.get(tipo_agente)
+        if costos is None:
+            costos = compilar_costos(self.matriz, tipo_agente)
+            self._costos_por_agente[tipo_agente] = costos
+        return costos
+
+    def componentes_agente(self, tipo_agente):
+        """
+        Devuelve las componentes conexas de las celdas transitables para el agente,
+        calculándolas solo la primera vez. Se mantienen al día cuando se modifica una celda.
+        """
+        componentes = self._componentes_por_agente.get(tipo_agente)
+        if componentes is None:
+            componentes = ComponentesConexas(self.costos_agente(tipo_agente), self.matriz.shape[1])
+            self._componentes_por_agente[tipo_agente] = componentes
+        return componentes
 
-    def guardar_mapa(self, nombre_archivo):
+    def grafo_pasillos(self, tipo_agente):
         """
-        Guardar el estado actual del mapa en un archivo.
+        Devuelve el grafo de pasillos del agente, construyéndolo solo la primera vez.
+        Modificar una celda lo descarta y se vuelve a construir al pedirlo.
+        """
+        grafo = self._pasillos_por_agente.get(tipo_agente)
+        if grafo is None:
+            grafo = GrafoPasillos(self.costos_agente(tipo_agente), self.matriz.shape[1])
+            self._pasillos_por_agente[tipo_agente] = grafo
+        return grafo
+
+    def soltar_mapeo(self, nombre_archivo):
+        """
+        Si la matriz es una memoria mapeada de nombre_archivo, la copia a memoria y
+        suelta el mapeo, para poder reemplazar el archivo (en Windows no se puede
+        reemplazar un archivo mapeado). Quien guarde otra referencia a la matriz
+        debe cambiarla por self.matriz. Retorna True si se copió.
+        """
+        if not isinstance(self.matriz, np.memmap) or not os.path.exists(nombre_archivo):
+            return False
+        if not os.path.samefile(self.matriz.filename, nombre_archivo):
+            return False
+        self.matriz = np.array(self.matriz)
+        return True
+
+    def guardar_mapa(self, nombre_archivo, delimitador=','):
+        """
+        Guardar el estado actual del mapa en un archivo. Los archivos con extensión
+        .mapb se guardan en formato binario; si es el archivo del que se abrió el
+        mapa, antes se suelta su memoria mapeada (ver soltar_mapeo).
         """
         try:
-            with open(nombre_archivo, 'w') as archivo:
-                for fila in self.matriz:
-                    archivo.write(','.join(map(str, fila)) + '\n')
+            if nombre_archivo.endswith(EXTENSION_BINARIA):
+                self.soltar_mapeo(nombre_archivo)
+                guardar_mapa_binario(self.matriz, nombre_archivo)
+            else:
+                with open(nombre_archivo, 'wb') as archivo:
+                    archivo.write(serializar_mapa(self.matriz, delimitador))
             print(f"Mapa guardado en {nombre_archivo}")
         except Exception as e:
             print(f"Error al guardar el mapa: {e}")
+            return False
+        return True
 
     def dibujar(self, screen, colores):
         """
@@ -47,10 +268,14 @@ class Mapa:
                     x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size
                 ))
 
-    def detectar_celda(self, mouse_pos):
+    def detectar_celda(self, mouse_pos, camara=None):
         """
         Detectar la celda seleccionada a partir de la posición del mouse.
+        Si se indica una cámara, la posición se traduce con su desplazamiento y zoom.
         """
+        if camara is not None:
+            celda = camara.celda_en(mouse_pos)
+            return celda if celda is not None else (None, None)
         x, y = mouse_pos
         celda_x = x // self.cell_size
         celda_y = y // self.cell_size
@@ -58,12 +283,28 @@ class Mapa:
             return celda_x, celda_y
         return None, None
 
+    def suscribir(self, funcion):
+        """
+        Registra una función que se llama como funcion(x, y, valor) cada vez que se modifica una celda.
+        """
+        self._suscriptores.append(funcion)
+
     def modificar_celda(self, pos_x, pos_y, valor):
         """
         Cambiar el tipo de terreno de una celda específica.
         """
         if 0 <= pos_x < len(self.matriz[0]) and 0 <= pos_y < len(self.matriz):
-            self.matriz[pos_y][pos_x] = valor
+            self.matriz[pos_y, pos_x] = valor
+            self.version += 1
+            # Actualizar la celda en las mallas de costos ya compiladas
+            indice = pos_y * self.matriz.shape[1] + pos_x
+            for tipo_agente, costos in self._costos_por_agente.items():
+                costos[indice] = TABLAS_COSTOS[tipo_agente][valor]
+            for componentes in self._componentes_por_agente.values():
+                componentes.actualizar_celda(pos_x, pos_y)
+            self._pasillos_por_agente = {}
+            for funcion in self._suscriptores:
+                funcion(pos_x, pos_y, valor)
 
 
 """
@@ -90,7 +331,7 @@ if __name__ == "__main__":
     mi_mapa = Mapa(cell_size)
 
     # Cargar el mapa desde un archivo (ejemplo con delimitador ',' para CSV)
-    mi_mapa.cargar_mapa('ejemplo1_mapa.txt', ' ')
+    mi_mapa.cargar_mapa('ejemplo1_mapa.txt')
 
     # Dibuja el mapa en una pantalla de Pygame
     # screen es el objeto de superficie de Pygame
@@ -0,0 +1,139 @@
+# arbol.py
+"""
+Árbol de decisiones compacto de las búsquedas.
+
+Cada nodo se guarda como una entrada en arreglos planos (celda, padre y
+profundidad), en el orden en que la búsqueda lo agregó, así que un padre siempre
+aparece antes que sus hijos. La estructura de anytree solo se construye cuando se
+pide, y las exportaciones a DOT/JSON se escriben al archivo nodo por nodo.
+"""
+from array import array
+import json
+
+SIN_PADRE = -1
+
+# Límites por defecto de nodos para volcar en consola o exportar a archivo
+MAX_NODOS_CONSOLA = 2000
+MAX_NODOS_EXPORTACION = 100000
+
+
+class ArbolBusqueda:
+    def __init__(self, ancho, total_celdas, celda_raiz):
+        """
+        Crea el árbol con la celda raíz (índice y * ancho + x).
+        """
+        self.ancho = ancho
+        self.celdas = array('i', [celda_raiz])
+        self.padres = array('i', [SIN_PADRE])
+        self.profundidades = array('i', [0])
+        # Último nodo creado para cada celda, para colgar de él a los hijos
+        self._nodo_de_celda = array('i', [SIN_PADRE]) * total_celdas
+        self._nodo_de_celda[celda_raiz] = 0
+        self._raiz_anytree = None
+
+    def __len__(self):
+        return len(self.celdas)
+
+    def agregar(self, celda, celda_padre):
+        """
+        Agrega un nodo para `celda` como hijo del último nodo de `celda_padre`.
+        """
+        padre = self._nodo_de_celda[celda_padre]
+        nodo = len(self.celdas)
+        self.celdas.append(celda)
+        self.padres.append(padre)
+        self.profundidades.append(self.profundidades[padre] + 1)
+        self._nodo_de_celda[celda] = nodo
+        self._raiz_anytree = None
+        return nodo
+
+    def cerrar(self):
+        """
+        Libera el índice de celdas a nodos (4 bytes por celda del mapa), que solo
+        usa `agregar`. Se llama al terminar la búsqueda; después el árbol ya no crece.
+        """
+        self._nodo_de_celda = None
+
+    @property
+    def nbytes(self):
+        """
+        Bytes que ocupan los arreglos del árbol (sin contar la versión de anytree).
+        """
+        arreglos = [self.celdas, self.padres, self.profundidades]
+        if self._nodo_de_celda is not None:
+            arreglos.append(self._nodo_de_celda)
+        return sum(len(arreglo) * arreglo.itemsize for arreglo in arreglos)
+
+    def posicion(self, nodo):
+        """
+        Devuelve la posición (x, y) de un nodo.
+        """
+        y, x = divmod(self.celdas[nodo], self.ancho)
+        return (x, y)
+
+    def a_anytree(self, max_nodos=None):
+        """
+        Construye (y guarda) el árbol como nodos de anytree y devuelve la raíz.
+        Con `max_nodos` solo se incluyen los primeros nodos agregados.
+        """
+        if self._raiz_anytree is not None and max_nodos is None:
+            return self._raiz_anytree
+        from anytree import Node
+
+        total = len(self) if max_nodos is None else min(len(self), max_nodos)
+        nodos = []
+        for nodo in range(total):
+            padre = self.padres[nodo]
+            nodos.append(Node(f"Punto: {self.posicion(nodo)}",
+                              parent=nodos[padre] if padre != SIN_PADRE else None))
+        if max_nodos is None:
+            self._raiz_anytree = nodos[0]
+        return nodos[0]
+
+    @property
+    def raiz(self):
+        """
+        Nodo raíz en formato anytree (se construye la primera vez que se pide).
+        """
+        return self.a_anytree()
+
+    def imprimir(self, max_nodos=MAX_NODOS_CONSOLA):
+        """
+        Imprime el árbol en consola, como máximo `max_nodos` nodos.
+        """
+        from anytree import RenderTree
+
+        for pre, _, node in RenderTree(self.a_anytree(max_nodos)):
+            print(f"{pre}{node.name}")
+        if len(self) > max_nodos:
+            print(f"... ({len(self) - max_nodos} nodos más)")
+
+    def exportar_dot(self, nombre_archivo, max_nodos=MAX_NODOS_EXPORTACION):
+        """
+        Escribe el árbol en formato DOT (Graphviz), como máximo `max_nodos` nodos.
+        """
+        total = min(len(self), max_nodos)
+        with open(nombre_archivo, 'w') as archivo:
+            archivo.write("digraph arbol {\n")
+            for nodo in range(total):
+                x, y = self.posicion(nodo)
+                archivo.write(f'  n{nodo} [label="({x}, {y})"];\n')
+                if self.padres[nodo] != SIN_PADRE:
+                    archivo.write(f"  n{self.padres[nodo]} -> n{nodo};\n")
+            archivo.write("}\n")
+        return total
+
+    def exportar_json(self, nombre_archivo, max_nodos=MAX_NODOS_EXPORTACION):
+        """
+        Escribe el árbol en JSON como lista plana de nodos, como máximo `max_nodos` nodos.
+        """
+        total = min(len(self), max_nodos)
+        with open(nombre_archivo, 'w') as archivo:
+            archivo.write(f'{{"total_nodos": {len(self)}, "truncado": {json.dumps(total < len(self))}, "nodos": [\n')
+            for nodo in range(total):
+                x, y = self.posicion(nodo)
+                separador = ",\n" if nodo < total - 1 else "\n"
+                archivo.write(json.dumps({"id": nodo, "padre": self.padres[nodo], "x": x, "y": y,
+                                          "profundidad": self.profundidades[nodo]}) + separador)
+            archivo.write("]}\n")
+        return total
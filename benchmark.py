@@ -0,0 +1,259 @@
+# benchmark.py
+"""
+Benchmark de los algoritmos de búsqueda sin interfaz gráfica.
+
+Ejecuta cada algoritmo de busqueda.ALGORITMOS sobre los mapas de ejemplo y sobre
+mapas generados de distintos tamaños y mezclas de terreno, para cada tipo de
+agente, y reporta tiempo, nodos expandidos, frontera máxima, memoria pico y costo
+del camino. Los resultados se pueden guardar en JSON/CSV y comparar contra un
+baseline guardado para detectar regresiones.
+
+Uso:
+    python benchmark.py --json resultados.json --csv resultados.csv
+    python benchmark.py --grandes --tamanos 128
+    python benchmark.py --guardar-baseline benchmark_baseline.json
+    python benchmark.py --baseline benchmark_baseline.json
+
+Por omisión se miden los tamaños de TAMANOS, que son los del baseline guardado en
+el repositorio (benchmark_baseline.json); --grandes agrega los de TAMANOS_GRANDES.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from busqueda import ALGORITMOS, EstadisticasBusqueda
+from constantes import COSTOS_MOVIMIENTO, INTRANSITABLE
+from Mapa import Mapa
+
+MAPAS_EJEMPLO = ['ejemplo1_mapa.txt', 'ejemplo2_mapa.txt', 'ejemplo3_mapa.csv']
+TAMANOS = [16, 64, 256]
+TAMANOS_GRANDES = [1024, 2048]  # Solo con --grandes: tardan varios minutos
+
+# Probabilidad de cada código de terreno (0-6) en los mapas generados;
+# 'laberinto' se genera aparte con muros de montaña
+MEZCLAS = {
+    'abierto': [0.02, 0.90, 0.02, 0.02, 0.02, 0.01, 0.01],
+    'mixto': [0.10, 0.30, 0.15, 0.10, 0.15, 0.10, 0.10],
+    'laberinto': None,
+}
+
+# Diferencia mínima de tiempo (s) para considerar una regresión, por debajo es ruido
+DIFERENCIA_MINIMA_S = 0.005
+
+CAMPOS = ['mapa', 'ancho', 'alto', 'agente', 'algoritmo', 'tiempo_s', 'expandidos',
+          'frontera_maxima', 'memoria_pico_bytes', 'costo', 'longitud_camino']
+
+
+def generar_mapa(tamano, mezcla, semilla=0):
+    """
+    Genera un mapa cuadrado reproducible con la mezcla de terrenos indicada.
+    """
+    rng = np.random.default_rng(semilla)
+    if MEZCLAS[mezcla] is not None:
+        return rng.choice(len(MEZCLAS[mezcla]), size=(tamano, tamano), p=MEZCLAS[mezcla]).astype(np.uint8)
+
+    # Laberinto de árbol binario: las celdas con coordenadas pares son pasillos y
+    # cada una abre el muro de arriba o el de la izquierda
+    matriz = np.zeros((tamano, tamano), dtype=np.uint8)
+    matriz[0::2, 0::2] = 1
+    ys, xs = np.mgrid[0:tamano:2, 0:tamano:2]
+    hacia_arriba = rng.random(ys.shape) < 0.5
+    hacia_arriba[:, 0] = True
+    hacia_arriba[0, :] = False
+    arriba = hacia_arriba & (ys > 0)
+    izquierda = ~hacia_arriba & (xs > 0)
+    matriz[ys[arriba] - 1, xs[arriba]] = 1
+    matriz[ys[izquierda], xs[izquierda] - 1] = 1
+    return matriz
+
+
+def extremos(costos, ancho):
+    """
+    Elige como inicio y fin la primera y la última celda de la mayor región
+    transitable del mapa, para que las búsquedas tengan un recorrido largo.
+    """
+    total = len(costos)
+    marcadas = bytearray(total)
+    pendientes = int(np.count_nonzero(np.frombuffer(costos, dtype=np.uint16)))
+    mejor = (0, None, None)  # (tamaño, primera celda, última celda)
+    for semilla in range(total):
+        if costos[semilla] == INTRANSITABLE or marcadas[semilla]:
+            continue
+        marcadas[semilla] = 1
+        pila = [semilla]
+        tamano, ultima = 0, semilla
+        while pila:
+            celda = pila.pop()
+            tamano += 1
+            ultima = max(ultima, celda)
+            x = celda % ancho
+            for vecino, valido in ((celda - 1, x > 0), (celda + 1, x < ancho - 1),
+                                   (celda - ancho, celda >= ancho), (celda + ancho, celda + ancho < total)):
+                if valido and not marcadas[vecino] and costos[vecino] != INTRANSITABLE:
+                    marcadas[vecino] = 1
+                    pila.append(vecino)
+        if tamano > mejor[0]:
+            mejor = (tamano, semilla, ultima)
+        pendientes -= tamano
+        if mejor[0] >= pendientes:
+            break
+    if mejor[1] is None:
+        return None, None
+    _, inicio, fin = mejor
+    return (inicio % ancho, inicio // ancho), (fin % ancho, fin // ancho)
+
+
+def medir(algoritmo, costos, ancho, inicio, fin, repeticiones=3):
+    """
+    Ejecuta un algoritmo cronometrado (se toma el mejor de `repeticiones`), una vez
+    con EstadisticasBusqueda para contar nodos y otra sin instrumentar para medir la
+    memoria pico (los contadores por celda de las estadísticas la inflarían).
+    """
+    tiempo = None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = algoritmo(costos, ancho, inicio, fin)
+        transcurrido = time.perf_counter() - t0
+        tiempo = transcurrido if tiempo is None else min(tiempo, transcurrido)
+
+    estadisticas = EstadisticasBusqueda()
+    algoritmo(costos, ancho, inicio, fin, estadisticas=estadisticas)
+
+    tracemalloc.start()
+    algoritmo(costos, ancho, inicio, fin)
+    _, memoria_pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'tiempo_s': round(tiempo, 6),
+        'expandidos': estadisticas.expandidos,
+        'frontera_maxima': estadisticas.frontera_maxima,
+        'memoria_pico_bytes': memoria_pico,
+        'costo': resultado.costo,
+        'longitud_camino': len(resultado.camino),
+    }
+
+
+def casos(tamanos, mezclas, incluir_ejemplos=True):
+    """
+    Genera los pares (nombre, Mapa) a medir.
+    """
+    if incluir_ejemplos:
+        for archivo in MAPAS_EJEMPLO:
+            mapa = Mapa(1)
+            mapa.cargar_mapa(archivo)
+            yield archivo, mapa
+    for tamano in tamanos:
+        for mezcla in mezclas:
+            mapa = Mapa(1)
+            mapa.matriz = generar_mapa(tamano, mezcla)
+            yield f"{mezcla}_{tamano}x{tamano}", mapa
+
+
+def ejecutar(tamanos, mezclas, agentes, algoritmos, incluir_ejemplos=True, repeticiones=3):
+    resultados = []
+    for nombre_mapa, mapa in casos(tamanos, mezclas, incluir_ejemplos):
+        alto, ancho = mapa.matriz.shape
+        for agente in agentes:
+            costos = mapa.costos_agente(agente)
+            inicio, fin = extremos(costos, ancho)
+            if inicio is None:
+                continue
+            for nombre_algoritmo in algoritmos:
+                fila = {'mapa': nombre_mapa, 'ancho': ancho, 'alto': alto,
+                        'agente': agente, 'algoritmo': nombre_algoritmo}
+                fila.update(medir(ALGORITMOS[nombre_algoritmo], costos, ancho, inicio, fin, repeticiones))
+                print(f"{nombre_mapa:24} {agente:10} {nombre_algoritmo:4} "
+                      f"{fila['tiempo_s']:10.4f}s {fila['expandidos']:9} expandidos  costo {fila['costo']}")
+                resultados.append(fila)
+    return resultados
+
+
+def clave(fila):
+    return f"{fila['mapa']}|{fila['agente']}|{fila['algoritmo']}"
+
+
+def comparar(resultados, baseline, tolerancia):
+    """
+    Compara contra un baseline y devuelve la lista de regresiones encontradas.
+    Un caso regresa si es más lento que el baseline más la tolerancia (y al menos
+    DIFERENCIA_MINIMA_S), si expande más nodos o si cambia el costo del camino.
+    """
+    anteriores = {clave(fila): fila for fila in baseline}
+    regresiones = []
+    for fila in resultados:
+        anterior = anteriores.get(clave(fila))
+        if anterior is None:
+            continue
+        if fila['tiempo_s'] > anterior['tiempo_s'] * (1 + tolerancia) and \
+                fila['tiempo_s'] - anterior['tiempo_s'] > DIFERENCIA_MINIMA_S:
+            regresiones.append(f"{clave(fila)}: tiempo {anterior['tiempo_s']}s -> {fila['tiempo_s']}s")
+        if fila['expandidos'] > anterior['expandidos']:
+            regresiones.append(f"{clave(fila)}: expandidos {anterior['expandidos']} -> {fila['expandidos']}")
+        if fila['costo'] != anterior['costo']:
+            regresiones.append(f"{clave(fila)}: costo {anterior['costo']} -> {fila['costo']}")
+    return regresiones
+
+
+def guardar_json(resultados, nombre_archivo):
+    with open(nombre_archivo, 'w') as archivo:
+        json.dump(resultados, archivo, indent=2)
+
+
+def guardar_csv(resultados, nombre_archivo):
+    with open(nombre_archivo, 'w', newline='') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los algoritmos de búsqueda")
+    parser.add_argument('--tamanos', type=int, nargs='*', default=TAMANOS)
+    parser.add_argument('--grandes', action='store_true', help="Agregar también los mapas de TAMANOS_GRANDES")
+    parser.add_argument('--mezclas', nargs='*', default=list(MEZCLAS), choices=list(MEZCLAS))
+    parser.add_argument('--agentes', nargs='*', default=list(COSTOS_MOVIMIENTO), choices=list(COSTOS_MOVIMIENTO))
+    parser.add_argument('--algoritmos', nargs='*', default=list(ALGORITMOS), choices=list(ALGORITMOS))
+    parser.add_argument('--repeticiones', type=int, default=3, help="Ejecuciones cronometradas por caso")
+    parser.add_argument('--sin-ejemplos', action='store_true', help="No incluir los mapas de ejemplo")
+    parser.add_argument('--json', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--csv', help="Archivo CSV donde guardar los resultados")
+    parser.add_argument('--baseline', help="Baseline JSON contra el cual comparar")
+    parser.add_argument('--guardar-baseline', help="Guardar los resultados como nuevo baseline")
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help="Aumento relativo de tiempo permitido antes de marcar regresión")
+    args = parser.parse_args(argumentos)
+
+    tamanos = args.tamanos + TAMANOS_GRANDES if args.grandes else args.tamanos
+    resultados = ejecutar(tamanos, args.mezclas, args.agentes, args.algoritmos,
+                          not args.sin_ejemplos, max(1, args.repeticiones))
+
+    if args.json:
+        guardar_json(resultados, args.json)
+    if args.csv:
+        guardar_csv(resultados, args.csv)
+    if args.guardar_baseline:
+        guardar_json(resultados, args.guardar_baseline)
+
+    if args.baseline:
+        with open(args.baseline) as archivo:
+            regresiones = comparar(resultados, json.load(archivo), args.tolerancia)
+        if regresiones:
+            print("Regresiones respecto al baseline:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+        print("Sin regresiones respecto al baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
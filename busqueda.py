@@ -0,0 +1,899 @@
+# busqueda.py
+"""
+Núcleo de búsqueda sin interfaz gráfica.
+
+Los algoritmos de este módulo no dependen de pygame ni imprimen nada: reciben la
+malla de costos compilada del agente (ver Mapa.compilar_costos), el ancho del mapa
+y los puntos de inicio y fin, y devuelven el camino, su costo y el árbol de
+decisiones. La visualización se
+engancha mediante un observador opcional que recibe cada evento de la búsqueda,
+o recorriendo la búsqueda paso a paso con `eventos_busqueda`, que la expone como
+un generador de eventos para que quien la consume decida el ritmo.
+"""
+from array import array
+from collections import deque
+from functools import partial
+import heapq
+import json
+from time import perf_counter
+
+import numpy as np
+
+from arbol import ArbolBusqueda, SIN_PADRE
+from constantes import INTRANSITABLE
+
+MOVIMIENTOS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# Costo acumulado de las celdas aún no alcanzadas
+INFINITO = 2 ** 62
+
+# Eventos que se notifican al observador como observador(evento, pos, costo)
+EVENTO_EXPANDIR = "expandir"  # Se saca un nodo de la frontera
+EVENTO_DECISION = "decision"  # El nodo expandido es una bifurcación o el inicio
+EVENTO_AGREGAR = "agregar"    # Se agrega un vecino a la frontera
+EVENTO_OBJETIVO = "objetivo"  # Se alcanzó el punto final
+
+
+class ResultadoBusqueda:
+    def __init__(self, camino, costo, arbol):
+        """
+        Resultado de una búsqueda.
+
+        camino: lista de posiciones (x, y) desde el inicio hasta el fin, vacía si no hay camino.
+        costo: costo acumulado del camino, None si no hay camino.
+        arbol: árbol de decisiones (ArbolBusqueda). Se cierra, porque la búsqueda ya
+            terminó, para no guardar su índice por celda junto con el resultado.
+        """
+        self.camino = camino
+        self.costo = costo
+        self.arbol = arbol
+        if arbol is not None:
+            arbol.cerrar()
+
+
+class EstadisticasBusqueda:
+    def __init__(self):
+        """
+        Contadores de una búsqueda, que el algoritmo llena si recibe este objeto
+        (sin él no se mide nada).
+
+        expandidos: nodos expandidos; agregados: inserciones en la frontera;
+        descartados: entradas sacadas de la frontera que ya estaban cerradas;
+        frontera_maxima y cerrados_maximo: tamaños máximos de la frontera y del
+        conjunto de cerrados (o visitados); tiempos: segundos por fase
+        ('preparacion', 'busqueda', 'camino'), sin contar lo que tarda quien
+        consume los eventos; expansiones: array('I') con las expansiones de cada celda.
+        """
+        self.ancho = 0
+        self.expandidos = 0
+        self.agregados = 0
+        self.descartados = 0
+        self.frontera_maxima = 0
+        self.cerrados_maximo = 0
+        self.tiempos = {}
+        self.expansiones = array('I')
+        self.tiempo_pausado = 0.0  # Tiempo con la búsqueda detenida en un evento
+        self._marca = 0.0
+        self._pausado_en_marca = 0.0
+
+    def iniciar(self, total, ancho):
+        """
+        Lo llama el algoritmo al empezar: reinicia los contadores y el reloj.
+        """
+        self.__init__()
+        self.ancho = ancho
+        self.expansiones = array('I', bytes(4 * total))
+        self._marca = perf_counter()
+
+    def marcar_fase(self, fase):
+        """
+        Cierra la fase en curso: acumula el tiempo desde la marca anterior,
+        descontando el que la búsqueda pasó detenida en los eventos.
+        """
+        ahora = perf_counter()
+        pausado = self.tiempo_pausado - self._pausado_en_marca
+        self.tiempos[fase] = self.tiempos.get(fase, 0.0) + ahora - self._marca - pausado
+        self._marca = ahora
+        self._pausado_en_marca = self.tiempo_pausado
+
+    def tiempo_total(self):
+        return sum(self.tiempos.values())
+
+    def expansiones_matriz(self):
+        """
+        Expansiones por celda como matriz numpy (alto x ancho).
+        """
+        return np.frombuffer(self.expansiones, dtype=np.uint32).reshape(-1, self.ancho)
+
+    def como_dict(self):
+        expansiones = np.frombuffer(self.expansiones, dtype=np.uint32)
+        return {
+            'expandidos': self.expandidos,
+            'agregados': self.agregados,
+            'descartados': self.descartados,
+            'frontera_maxima': self.frontera_maxima,
+            'cerrados_maximo': self.cerrados_maximo,
+            'tiempos_s': {fase: round(tiempo, 6) for fase, tiempo in self.tiempos.items()},
+            'celdas_expandidas': int(np.count_nonzero(expansiones)),
+            'expansiones_maximas_por_celda': int(expansiones.max()) if expansiones.size else 0,
+        }
+
+    def exportar_json(self, nombre_archivo):
+        with open(nombre_archivo, 'w') as archivo:
+            json.dump(self.como_dict(), archivo, indent=2)
+
+
+def heuristica(a, b):
+    # Usamos la distancia de Manhattan como heurística
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def costo_minimo_transitable(costos):
+    """
+    Menor costo de entrada entre las celdas transitables de la malla (1 si no hay ninguna).
+    """
+    transitables = np.frombuffer(costos, dtype=np.uint16)
+    transitables = transitables[transitables != INTRANSITABLE]
+    return int(transitables.min()) if transitables.size else 1
+
+
+def heuristica_escalada(costos, ancho, punto_fin):
+    """
+    Estimador para `astar`: distancia de Manhattan al fin multiplicada por el menor
+    costo transitable de la malla. Sigue siendo admisible y, para agentes cuyo
+    terreno más barato cuesta más de 1, acota mucho mejor el costo real.
+    """
+    minimo = costo_minimo_transitable(costos)
+    x_fin, y_fin = punto_fin
+
+    def estimador(indice):
+        y, x = divmod(indice, ancho)
+        return (abs(x - x_fin) + abs(y - y_fin)) * minimo
+    return estimador
+
+
+def _vecinos(costos, indice, ancho):
+    """
+    Lista los vecinos transitables de la celda `indice` (y * ancho + x) junto con
+    el costo de entrar en ellos, en el orden de MOVIMIENTOS.
+    """
+    resultado = []
+    x = indice % ancho
+    if x > 0 and costos[indice - 1] != INTRANSITABLE:
+        resultado.append((indice - 1, costos[indice - 1]))
+    if x < ancho - 1 and costos[indice + 1] != INTRANSITABLE:
+        resultado.append((indice + 1, costos[indice + 1]))
+    if indice >= ancho and costos[indice - ancho] != INTRANSITABLE:
+        resultado.append((indice - ancho, costos[indice - ancho]))
+    if indice + ancho < len(costos) and costos[indice + ancho] != INTRANSITABLE:
+        resultado.append((indice + ancho, costos[indice + ancho]))
+    return resultado
+
+
+def _predecesores(costos, indice, ancho):
+    """
+    Lista las celdas desde las que se puede entrar a `indice` junto con el costo de
+    hacerlo, que es el de la propia celda `indice` (los costos dependen del terreno
+    de destino). Se usa para buscar hacia atrás desde el punto final.
+    """
+    costo = costos[indice]
+    if costo == INTRANSITABLE:
+        return []
+    resultado = []
+    x = indice % ancho
+    if x > 0:
+        resultado.append((indice - 1, costo))
+    if x < ancho - 1:
+        resultado.append((indice + 1, costo))
+    if indice >= ancho:
+        resultado.append((indice - ancho, costo))
+    if indice + ancho < len(costos):
+        resultado.append((indice + ancho, costo))
+    return resultado
+
+
+def _posicion(indice, ancho):
+    y, x = divmod(indice, ancho)
+    return (x, y)
+
+
+def _reconstruir_camino(padres, indice, ancho):
+    """
+    Reconstruye el camino desde el inicio siguiendo los punteros a padre.
+    """
+    camino = []
+    while indice != SIN_PADRE:
+        camino.append(_posicion(indice, ancho))
+        indice = padres[indice]
+    camino.reverse()
+    return camino
+
+
+def _estado_inicial(total):
+    """
+    Arreglos compactos preasignados para el estado de la búsqueda, indexados por y * ancho + x:
+    padre de cada celda, costo acumulado y bandera de cerrado/visitado.
+    """
+    padres = array('i', [SIN_PADRE]) * total
+    costos_acumulados = array('q', [INFINITO]) * total
+    cerrados = bytearray(total)
+    return padres, costos_acumulados, cerrados
+
+
+def _conducir(eventos, observador):
+    """
+    Recorre una búsqueda generadora pasando cada evento al observador y devuelve su
+    resultado. Sin observador la búsqueda no emite eventos y termina en el primer paso.
+    """
+    while True:
+        try:
+            evento = next(eventos)
+        except StopIteration as fin:
+            return fin.value
+        observador(*evento)
+
+
+def _contar_frontera(estadisticas, agregados, frontera):
+    estadisticas.agregados += agregados
+    if frontera > estadisticas.frontera_maxima:
+        estadisticas.frontera_maxima = frontera
+
+
+def _terminar_busqueda(estadisticas, cerrados):
+    estadisticas.cerrados_maximo = cerrados
+    estadisticas.marcar_fase('busqueda')
+
+
+def _medir_pausas(eventos, estadisticas):
+    """
+    Envuelve una búsqueda generadora sumando a estadisticas.tiempo_pausado el tiempo
+    que pasa detenida en cada evento, para que no cuente en sus fases.
+    """
+    while True:
+        try:
+            evento = next(eventos)
+        except StopIteration as fin:
+            return fin.value
+        salida = perf_counter()
+        yield evento
+        estadisticas.tiempo_pausado += perf_counter() - salida
+
+
+def _preparar(eventos, emitir, estadisticas):
+    """
+    Devuelve la búsqueda generadora lista para recorrer, midiendo sus pausas si
+    emite eventos y se piden estadísticas.
+    """
+    return _medir_pausas(eventos, estadisticas) if emitir and estadisticas is not None else eventos
+
+
+def _eventos_no_informada(costos, ancho, punto_inicio, punto_fin, emitir, profundidad, estadisticas=None):
+    """
+    Búsqueda en anchura (cola) o en profundidad (pila) según `profundidad`, como
+    generador de eventos que devuelve el ResultadoBusqueda.
+    """
+    medir = estadisticas is not None
+    if medir:
+        estadisticas.iniciar(len(costos), ancho)
+    inicio = punto_inicio[1] * ancho + punto_inicio[0]
+    fin = punto_fin[1] * ancho + punto_fin[0]
+
+    padres, costos_acumulados, visitados = _estado_inicial(len(costos))
+    costos_acumulados[inicio] = 0
+    visitados[inicio] = 1
+    frontera = deque([inicio])
+    extraer = frontera.pop if profundidad else frontera.popleft
+
+    # Crear el árbol de decisiones con la raíz en el inicio
+    arbol = ArbolBusqueda(ancho, len(costos), inicio)
+    if medir:
+        estadisticas.marcar_fase('preparacion')
+
+    while frontera:
+        actual = extraer()
+        costo_g = costos_acumulados[actual]
+        if medir:
+            estadisticas.expandidos += 1
+            estadisticas.expansiones[actual] += 1
+        if emitir:
+            yield EVENTO_EXPANDIR, _posicion(actual, ancho), costo_g
+
+        # Verificar si llegamos al objetivo
+        if actual == fin:
+            if medir:
+                _terminar_busqueda(estadisticas, estadisticas.agregados + 1)
+            if emitir:
+                yield EVENTO_OBJETIVO, punto_fin, costo_g
+            camino = _reconstruir_camino(padres, fin, ancho)
+            if medir:
+                estadisticas.marcar_fase('camino')
+            return ResultadoBusqueda(camino, costo_g, arbol)
+
+        opciones = [(vecino, costo) for vecino, costo in _vecinos(costos, actual, ancho)
+                    if not visitados[vecino]]
+        if emitir and (len(opciones) > 1 or actual == inicio):
+            yield EVENTO_DECISION, _posicion(actual, ancho), costo_g
+
+        for vecino, costo in opciones:
+            # Movimiento válido, agregar a la frontera y al árbol de decisiones
+            visitados[vecino] = 1
+            padres[vecino] = actual
+            costos_acumulados[vecino] = costo_g + costo
+            frontera.append(vecino)
+            arbol.agregar(vecino, actual)
+            if emitir:
+                yield EVENTO_AGREGAR, _posicion(vecino, ancho), costo_g + costo
+        if medir:
+            _contar_frontera(estadisticas, len(opciones), len(frontera))
+
+    if medir:
+        _terminar_busqueda(estadisticas, estadisticas.agregados + 1)
+    return ResultadoBusqueda([], None, arbol)
+
+
+def bfs(costos, ancho, punto_inicio, punto_fin, observador=None, estadisticas=None):
+    """
+    Búsqueda en anchura.
+
+    Parámetros:
+        costos: malla de costos compilada del agente, indexada por y * ancho + x.
+        ancho (int): ancho del mapa en celdas.
+        punto_inicio (tuple): coordenadas iniciales (x, y).
+        punto_fin (tuple): coordenadas objetivo (x, y).
+        observador: función opcional observador(evento, pos, costo).
+        estadisticas: EstadisticasBusqueda opcional donde contar la búsqueda.
+
+    Retorna:
+        ResultadoBusqueda
+    """
+    emitir = observador is not None
+    eventos = _eventos_no_informada(costos, ancho, punto_inicio, punto_fin, emitir, False, estadisticas)
+    return _conducir(_preparar(eventos, emitir, estadisticas), observador)
+
+
+def dfs(costos, ancho, punto_inicio, punto_fin, observador=None, estadisticas=None):
+    """
+    Búsqueda en profundidad. Mismos parámetros que `bfs`.
+    """
+    emitir = observador is not None
+    eventos = _eventos_no_informada(costos, ancho, punto_inicio, punto_fin, emitir, True, estadisticas)
+    return _conducir(_preparar(eventos, emitir, estadisticas), observador)
+
+
+def _eventos_astar(costos, ancho, punto_inicio, punto_fin, emitir=True, estimador=None, estadisticas=None):
+    """
+    Versión generadora de `astar`: produce los eventos (evento, pos, costo) si
+    `emitir` y devuelve el ResultadoBusqueda.
+    """
+    medir = estadisticas is not None
+    if medir:
+        estadisticas.iniciar(len(costos), ancho)
+    inicio = punto_inicio[1] * ancho + punto_inicio[0]
+    fin = punto_fin[1] * ancho + punto_fin[0]
+
+    padres, costos_acumulados, visitados = _estado_inicial(len(costos))
+    costos_acumulados[inicio] = 0
+    heap = [(0, inicio)]  # (costo total estimado, celda)
+
+    # Crear el árbol de decisiones con la raíz en el inicio
+    arbol = ArbolBusqueda(ancho, len(costos), inicio)
+    if medir:
+        estadisticas.marcar_fase('preparacion')
+
+    while heap:
+        _, actual = heapq.heappop(heap)
+        # Las entradas de celdas ya cerradas se descartan sin contarlas como expansión
+        if visitados[actual]:
+            if medir:
+                estadisticas.descartados += 1
+            continue
+        costo_g = costos_acumulados[actual]
+        if emitir:
+            yield EVENTO_EXPANDIR, _posicion(actual, ancho), costo_g
+
+        if actual == fin:
+            if medir:
+                estadisticas.expandidos += 1
+                estadisticas.expansiones[actual] += 1
+                _terminar_busqueda(estadisticas, estadisticas.expandidos)
+            if emitir:
+                yield EVENTO_OBJETIVO, punto_fin, costo_g
+            camino = _reconstruir_camino(padres, fin, ancho)
+            if medir:
+                estadisticas.marcar_fase('camino')
+            return ResultadoBusqueda(camino, costo_g, arbol)
+
+        visitados[actual] = 1
+        if medir:
+            estadisticas.expandidos += 1
+            estadisticas.expansiones[actual] += 1
+            agregados = len(heap)
+
+        opciones = [(vecino, costo) for vecino, costo in _vecinos(costos, actual, ancho)
+                    if not visitados[vecino]]
+        if emitir and (len(opciones) > 1 or actual == inicio):
+            yield EVENTO_DECISION, _posicion(actual, ancho), costo_g
+
+        for vecino, costo_mov in opciones:
+            nuevo_g = costo_g + costo_mov
+            if nuevo_g >= costos_acumulados[vecino]:
+                continue
+            costos_acumulados[vecino] = nuevo_g
+            padres[vecino] = actual
+
+            # Añadir a la cola y al árbol
+            nueva_pos = _posicion(vecino, ancho)
+            estimado = heuristica(nueva_pos, punto_fin) if estimador is None else estimador(vecino)
+            heapq.heappush(heap, (nuevo_g + estimado, vecino))
+            arbol.agregar(vecino, actual)
+            if emitir:
+                yield EVENTO_AGREGAR, nueva_pos, nuevo_g
+        if medir:
+            _contar_frontera(estadisticas, len(heap) - agregados, len(heap))
+
+    if medir:
+        _terminar_busqueda(estadisticas, estadisticas.expandidos)
+    return ResultadoBusqueda([], None, arbol)
+
+
+def astar(costos, ancho, punto_inicio, punto_fin, observador=None, estimador=None, estadisticas=None):
+    """
+    Búsqueda A*. Mismos parámetros que `bfs`, más:
+
+    estimador: función celda (y * ancho + x) -> costo estimado hasta el fin. Por
+        defecto, la distancia de Manhattan. Debe ser consistente para que el camino
+        sea óptimo (ver heuristica_escalada y hitos.TablaHitos).
+    """
+    emitir = observador is not None
+    eventos = _eventos_astar(costos, ancho, punto_inicio, punto_fin, emitir, estimador, estadisticas)
+    return _conducir(_preparar(eventos, emitir, estadisticas), observador)
+
+
+def _unir_caminos(padres, siguientes, encuentro, fin, ancho, arbol):
+    """
+    Une el camino del inicio hasta `encuentro` (punteros a padre de la búsqueda hacia
+    adelante) con el de `encuentro` hasta el fin (punteros al siguiente paso de la
+    búsqueda hacia atrás). La segunda mitad se cuelga del árbol de decisiones para
+    que el árbol contenga el camino completo.
+    """
+    camino = _reconstruir_camino(padres, encuentro, ancho)
+    actual = encuentro
+    while actual != fin:
+        arbol.agregar(siguientes[actual], actual)
+        actual = siguientes[actual]
+        camino.append(_posicion(actual, ancho))
+    return camino
+
+
+def _eventos_bfs_bidireccional(costos, ancho, punto_inicio, punto_fin, emitir=True, estadisticas=None):
+    """
+    Versión generadora de `bfs_bidireccional`: produce los eventos (evento, pos, costo) si
+    `emitir` y devuelve el ResultadoBusqueda.
+    """
+    medir = estadisticas is not None
+    if medir:
+        estadisticas.iniciar(len(costos), ancho)
+    inicio = punto_inicio[1] * ancho + punto_inicio[0]
+    fin = punto_fin[1] * ancho + punto_fin[0]
+    total = len(costos)
+
+    padres = array('i', [SIN_PADRE]) * total
+    siguientes = array('i', [SIN_PADRE]) * total
+    pasos_inicio = array('i', [-1]) * total  # Pasos desde el inicio, -1 si no se alcanzó
+    pasos_fin = array('i', [-1]) * total     # Pasos hasta el fin, -1 si no se alcanzó
+    pasos_inicio[inicio] = 0
+    pasos_fin[fin] = 0
+    frontera_inicio, frontera_fin = [inicio], [fin]
+    arbol = ArbolBusqueda(ancho, total, inicio)
+    mejor, encuentro = (0, inicio) if inicio == fin else (None, None)
+    if medir:
+        estadisticas.marcar_fase('preparacion')
+
+    while mejor is None and frontera_inicio and frontera_fin:
+        nueva_frontera = []
+        if medir:
+            estadisticas.expandidos += min(len(frontera_inicio), len(frontera_fin))
+        if len(frontera_inicio) <= len(frontera_fin):
+            for actual in frontera_inicio:
+                if medir:
+                    estadisticas.expansiones[actual] += 1
+                if emitir:
+                    yield EVENTO_EXPANDIR, _posicion(actual, ancho), pasos_inicio[actual]
+                opciones = [vecino for vecino, _ in _vecinos(costos, actual, ancho) if pasos_inicio[vecino] < 0]
+                if emitir and (len(opciones) > 1 or actual == inicio):
+                    yield EVENTO_DECISION, _posicion(actual, ancho), pasos_inicio[actual]
+                for vecino in opciones:
+                    pasos_inicio[vecino] = pasos_inicio[actual] + 1
+                    padres[vecino] = actual
+                    nueva_frontera.append(vecino)
+                    arbol.agregar(vecino, actual)
+                    if emitir:
+                        yield EVENTO_AGREGAR, _posicion(vecino, ancho), pasos_inicio[vecino]
+                    if pasos_fin[vecino] >= 0 and (mejor is None or pasos_inicio[vecino] + pasos_fin[vecino] < mejor):
+                        mejor, encuentro = pasos_inicio[vecino] + pasos_fin[vecino], vecino
+            frontera_inicio = nueva_frontera
+        else:
+            for actual in frontera_fin:
+                if medir:
+                    estadisticas.expansiones[actual] += 1
+                if emitir:
+                    yield EVENTO_EXPANDIR, _posicion(actual, ancho), pasos_fin[actual]
+                for vecino, _ in _predecesores(costos, actual, ancho):
+                    if pasos_fin[vecino] >= 0:
+                        continue
+                    pasos_fin[vecino] = pasos_fin[actual] + 1
+                    siguientes[vecino] = actual
+                    nueva_frontera.append(vecino)
+                    if emitir:
+                        yield EVENTO_AGREGAR, _posicion(vecino, ancho), pasos_fin[vecino]
+                    if pasos_inicio[vecino] >= 0 and (mejor is None or pasos_inicio[vecino] + pasos_fin[vecino] < mejor):
+                        mejor, encuentro = pasos_inicio[vecino] + pasos_fin[vecino], vecino
+            frontera_fin = nueva_frontera
+        if medir:
+            _contar_frontera(estadisticas, len(nueva_frontera), len(frontera_inicio) + len(frontera_fin))
+
+    if medir:
+        _terminar_busqueda(estadisticas, estadisticas.agregados + (1 if inicio == fin else 2))
+    if mejor is None:
+        return ResultadoBusqueda([], None, arbol)
+    camino = _unir_caminos(padres, siguientes, encuentro, fin, ancho, arbol)
+    costo = sum(costos[y * ancho + x] for x, y in camino[1:])
+    if medir:
+        estadisticas.marcar_fase('camino')
+    if emitir:
+        yield EVENTO_OBJETIVO, punto_fin, costo
+    return ResultadoBusqueda(camino, costo, arbol)
+
+
+def bfs_bidireccional(costos, ancho, punto_inicio, punto_fin, observador=None, estadisticas=None):
+    """
+    Búsqueda en anchura desde ambos extremos a la vez. Mismos parámetros que `bfs`.
+
+    Se expande siempre un nivel completo de la frontera más pequeña; cuando las
+    búsquedas se tocan, se termina el nivel y se elige el encuentro con menos pasos,
+    así que el camino tiene tantos pasos como el de `bfs`. El árbol de decisiones
+    contiene la búsqueda hacia adelante más la mitad final del camino.
+    """
+    emitir = observador is not None
+    eventos = _eventos_bfs_bidireccional(costos, ancho, punto_inicio, punto_fin, emitir, estadisticas)
+    return _conducir(_preparar(eventos, emitir, estadisticas), observador)
+
+
+def _eventos_astar_bidireccional(costos, ancho, punto_inicio, punto_fin, emitir=True, estadisticas=None):
+    """
+    Versión generadora de `astar_bidireccional`: produce los eventos (evento, pos, costo) si
+    `emitir` y devuelve el ResultadoBusqueda.
+    """
+    medir = estadisticas is not None
+    if medir:
+        estadisticas.iniciar(len(costos), ancho)
+    inicio = punto_inicio[1] * ancho + punto_inicio[0]
+    fin = punto_fin[1] * ancho + punto_fin[0]
+    total = len(costos)
+
+    def potencial(indice):
+        pos = _posicion(indice, ancho)
+        return heuristica(pos, punto_fin) - heuristica(punto_inicio, pos)
+
+    padres, costos_inicio, cerrados_inicio = _estado_inicial(total)
+    siguientes, costos_fin, cerrados_fin = _estado_inicial(total)
+    costos_inicio[inicio] = 0
+    costos_fin[fin] = 0
+    heap_inicio = [(potencial(inicio), inicio)]
+    heap_fin = [(-potencial(fin), fin)]
+    arbol = ArbolBusqueda(ancho, total, inicio)
+    mejor, encuentro = (0, inicio) if inicio == fin else (INFINITO, None)
+    if medir:
+        estadisticas.marcar_fase('preparacion')
+
+    while True:
+        # Descartar las entradas de celdas ya cerradas
+        while heap_inicio and cerrados_inicio[heap_inicio[0][1]]:
+            heapq.heappop(heap_inicio)
+            if medir:
+                estadisticas.descartados += 1
+        while heap_fin and cerrados_fin[heap_fin[0][1]]:
+            heapq.heappop(heap_fin)
+            if medir:
+                estadisticas.descartados += 1
+        if not heap_inicio or not heap_fin or heap_inicio[0][0] + heap_fin[0][0] >= 2 * mejor:
+            break
+
+        if medir:
+            estadisticas.expandidos += 1
+            agregados = len(heap_inicio) + len(heap_fin) - 1
+        if len(heap_inicio) <= len(heap_fin):
+            _, actual = heapq.heappop(heap_inicio)
+            cerrados_inicio[actual] = 1
+            costo_g = costos_inicio[actual]
+            if emitir:
+                yield EVENTO_EXPANDIR, _posicion(actual, ancho), costo_g
+            opciones = [(vecino, costo) for vecino, costo in _vecinos(costos, actual, ancho)
+                        if not cerrados_inicio[vecino]]
+            if emitir and (len(opciones) > 1 or actual == inicio):
+                yield EVENTO_DECISION, _posicion(actual, ancho), costo_g
+            for vecino, costo in opciones:
+                nuevo_g = costo_g + costo
+                if nuevo_g >= costos_inicio[vecino]:
+                    continue
+                costos_inicio[vecino] = nuevo_g
+                padres[vecino] = actual
+                heapq.heappush(heap_inicio, (2 * nuevo_g + potencial(vecino), vecino))
+                arbol.agregar(vecino, actual)
+                if emitir:
+                    yield EVENTO_AGREGAR, _posicion(vecino, ancho), nuevo_g
+                if nuevo_g + costos_fin[vecino] < mejor:
+                    mejor, encuentro = nuevo_g + costos_fin[vecino], vecino
+        else:
+            _, actual = heapq.heappop(heap_fin)
+            cerrados_fin[actual] = 1
+            costo_g = costos_fin[actual]
+            if emitir:
+                yield EVENTO_EXPANDIR, _posicion(actual, ancho), costo_g
+            for vecino, costo in _predecesores(costos, actual, ancho):
+                if cerrados_fin[vecino]:
+                    continue
+                nuevo_g = costo_g + costo
+                if nuevo_g >= costos_fin[vecino]:
+                    continue
+                costos_fin[vecino] = nuevo_g
+                siguientes[vecino] = actual
+                heapq.heappush(heap_fin, (2 * nuevo_g - potencial(vecino), vecino))
+                if emitir:
+                    yield EVENTO_AGREGAR, _posicion(vecino, ancho), nuevo_g
+                if costos_inicio[vecino] + nuevo_g < mejor:
+                    mejor, encuentro = costos_inicio[vecino] + nuevo_g, vecino
+        if medir:
+            estadisticas.expansiones[actual] += 1
+            frontera = len(heap_inicio) + len(heap_fin)
+            _contar_frontera(estadisticas, frontera - agregados, frontera)
+
+    if medir:
+        _terminar_busqueda(estadisticas, estadisticas.expandidos)
+    if encuentro is None:
+        return ResultadoBusqueda([], None, arbol)
+    camino = _unir_caminos(padres, siguientes, encuentro, fin, ancho, arbol)
+    if medir:
+        estadisticas.marcar_fase('camino')
+    if emitir:
+        yield EVENTO_OBJETIVO, punto_fin, mejor
+    return ResultadoBusqueda(camino, mejor, arbol)
+
+
+def astar_bidireccional(costos, ancho, punto_inicio, punto_fin, observador=None, estadisticas=None):
+    """
+    A* desde ambos extremos a la vez. Mismos parámetros que `bfs`.
+
+    Hacia adelante cada paso cuesta lo que cuesta entrar a la celda de destino, y
+    hacia atrás se paga el costo de la celda desde la que se retrocede, así que
+    ambas búsquedas miden el mismo camino. Las dos usan el potencial promedio
+    (h_fin - h_inicio) / 2, que es consistente en los dos sentidos, y se detienen
+    cuando la suma de las prioridades mínimas alcanza el mejor camino encontrado,
+    por lo que el costo es el mismo que el de `astar`. Las prioridades se guardan
+    multiplicadas por 2 para trabajar con enteros.
+    """
+    emitir = observador is not None
+    eventos = _eventos_astar_bidireccional(costos, ancho, punto_inicio, punto_fin, emitir, estadisticas)
+    return _conducir(_preparar(eventos, emitir, estadisticas), observador)
+
+
+def _regiones_uniformes(costos, ancho):
+    """
+    Para Jump Point Search: elige como costo base el costo transitable más frecuente
+    y devuelve (costo_base, base, interior), donde base marca las celdas con ese
+    costo e interior las de base sin vecinos transitables de otro costo.
+    """
+    matriz = np.frombuffer(costos, dtype=np.uint16).reshape(-1, ancho)
+    transitables = matriz[matriz != INTRANSITABLE]
+    if transitables.size == 0:
+        return None, bytearray(len(costos)), bytearray(len(costos))
+    costo_base = int(np.bincount(transitables).argmax())
+    base = matriz == costo_base
+    otro_costo = (matriz != INTRANSITABLE) & ~base
+    frontera = np.zeros_like(base)
+    frontera[:, 1:] |= otro_costo[:, :-1]
+    frontera[:, :-1] |= otro_costo[:, 1:]
+    frontera[1:, :] |= otro_costo[:-1, :]
+    frontera[:-1, :] |= otro_costo[1:, :]
+    return costo_base, bytearray(base.tobytes()), bytearray((base & ~frontera).tobytes())
+
+
+def _eventos_jps(costos, ancho, punto_inicio, punto_fin, emitir=True, estadisticas=None):
+    """
+    Versión generadora de `jps`: produce los eventos (evento, pos, costo) si
+    `emitir` y devuelve el ResultadoBusqueda.
+    """
+    if ancho == 1:
+        # En una sola columna no hay nada que saltar
+        return (yield from _eventos_astar(costos, ancho, punto_inicio, punto_fin, emitir, None, estadisticas))
+    medir = estadisticas is not None
+    if medir:
+        estadisticas.iniciar(len(costos), ancho)
+    inicio = punto_inicio[1] * ancho + punto_inicio[0]
+    fin = punto_fin[1] * ancho + punto_fin[0]
+    total = len(costos)
+    costo_base, base, interior = _regiones_uniformes(costos, ancho)
+
+    def saltar(celda, delta):
+        # Avanza desde celda en la dirección delta (±1 horizontal, ±ancho vertical) y
+        # devuelve (punto de salto, pasos) o None si se choca sin encontrar ninguno
+        horizontal = delta in (1, -1)
+        x = celda % ancho
+        pasos = 0
+        while True:
+            if horizontal:
+                x += delta
+                if not 0 <= x < ancho:
+                    return None
+            siguiente = celda + delta
+            if not 0 <= siguiente < total or not base[siguiente]:
+                return None
+            pasos += 1
+            if siguiente == fin or not interior[siguiente]:
+                return siguiente, pasos
+            if horizontal:
+                if saltar(siguiente, ancho) is not None or saltar(siguiente, -ancho) is not None:
+                    return siguiente, pasos
+            else:
+                # Vecino forzado: al lado de la celda anterior hay un obstáculo y al lado de esta no
+                for lado, valido in ((-1, x > 0), (1, x < ancho - 1)):
+                    if valido and not base[celda + lado] and base[siguiente + lado]:
+                        return siguiente, pasos
+            celda = siguiente
+
+    padres, costos_acumulados, visitados = _estado_inicial(total)
+    direcciones = {inicio: None}  # Dirección con la que se llegó a cada punto de salto
+    costos_acumulados[inicio] = 0
+    heap = [(0, inicio)]
+    arbol = ArbolBusqueda(ancho, total, inicio)
+    if medir:
+        estadisticas.marcar_fase('preparacion')
+
+    while heap:
+        _, actual = heapq.heappop(heap)
+        # Las entradas de celdas ya cerradas se descartan sin contarlas como expansión
+        if visitados[actual]:
+            if medir:
+                estadisticas.descartados += 1
+            continue
+        costo_g = costos_acumulados[actual]
+        if emitir:
+            yield EVENTO_EXPANDIR, _posicion(actual, ancho), costo_g
+
+        if actual == fin:
+            if medir:
+                estadisticas.expandidos += 1
+                estadisticas.expansiones[actual] += 1
+                _terminar_busqueda(estadisticas, estadisticas.expandidos)
+            if emitir:
+                yield EVENTO_OBJETIVO, punto_fin, costo_g
+            camino = _reconstruir_camino_saltos(padres, fin, ancho)
+            if medir:
+                estadisticas.marcar_fase('camino')
+            return ResultadoBusqueda(camino, costo_g, arbol)
+
+        visitados[actual] = 1
+        if medir:
+            estadisticas.expandidos += 1
+            estadisticas.expansiones[actual] += 1
+            agregados = len(heap)
+
+        # Direcciones a explorar: todas fuera del interior de una región uniforme;
+        # dentro, las naturales según cómo se llegó más las forzadas
+        x = actual % ancho
+        validos = {-1: x > 0, 1: x < ancho - 1, -ancho: actual >= ancho, ancho: actual + ancho < total}
+        direccion = direcciones.get(actual)
+        if not interior[actual] or direccion is None:
+            deltas = list(validos)
+        elif direccion in (1, -1):
+            deltas = [direccion, -ancho, ancho]
+        else:
+            deltas = [direccion]
+            anterior = actual - direccion
+            for lado in (-1, 1):
+                if validos[lado] and not base[anterior + lado] and base[actual + lado]:
+                    deltas.append(lado)
+        deltas = [delta for delta in deltas if validos[delta]]
+
+        opciones = []
+        for delta in deltas:
+            vecino = actual + delta
+            if costos[vecino] == INTRANSITABLE:
+                continue
+            if base[vecino]:
+                salto = saltar(actual, delta)
+                if salto is not None:
+                    opciones.append((salto[0], salto[1] * costo_base, delta))
+            else:
+                opciones.append((vecino, costos[vecino], delta))
+        opciones = [opcion for opcion in opciones if not visitados[opcion[0]]]
+        if emitir and (len(opciones) > 1 or actual == inicio):
+            yield EVENTO_DECISION, _posicion(actual, ancho), costo_g
+
+        for vecino, costo_mov, delta in opciones:
+            nuevo_g = costo_g + costo_mov
+            if nuevo_g >= costos_acumulados[vecino]:
+                continue
+            costos_acumulados[vecino] = nuevo_g
+            padres[vecino] = actual
+            direcciones[vecino] = delta
+            nueva_pos = _posicion(vecino, ancho)
+            heapq.heappush(heap, (nuevo_g + heuristica(nueva_pos, punto_fin), vecino))
+            arbol.agregar(vecino, actual)
+            if emitir:
+                yield EVENTO_AGREGAR, nueva_pos, nuevo_g
+        if medir:
+            _contar_frontera(estadisticas, len(heap) - agregados, len(heap))
+
+    if medir:
+        _terminar_busqueda(estadisticas, estadisticas.expandidos)
+    return ResultadoBusqueda([], None, arbol)
+
+
+def jps(costos, ancho, punto_inicio, punto_fin, observador=None, estadisticas=None):
+    """
+    Jump Point Search para la malla de 4 vecinos. Mismos parámetros que `bfs`.
+
+    Dentro de las regiones donde todas las celdas cuestan lo mismo (el costo base),
+    en lugar de agregar cada vecino se salta en línea recta hasta el siguiente punto
+    de salto: el objetivo, una celda con un vecino forzado por un obstáculo, o una
+    celda en el borde con otro terreno. Los caminos se ordenan primero en
+    horizontal: al avanzar en horizontal se puede girar en cualquier celda (se
+    revisan los saltos verticales), y al avanzar en vertical solo donde un
+    obstáculo fuerza el giro. Las celdas de otro costo, las del borde y el inicio
+    se expanden como en A* normal, con todos sus vecinos, así que el costo del
+    camino es el mismo que el de `astar`. El árbol de decisiones contiene solo los
+    puntos de salto.
+    """
+    emitir = observador is not None
+    eventos = _eventos_jps(costos, ancho, punto_inicio, punto_fin, emitir, estadisticas)
+    return _conducir(_preparar(eventos, emitir, estadisticas), observador)
+
+
+def _reconstruir_camino_saltos(padres, indice, ancho):
+    """
+    Reconstruye el camino de una búsqueda con saltos, rellenando las celdas
+    intermedias de cada tramo recto entre puntos de salto.
+    """
+    saltos = _reconstruir_camino(padres, indice, ancho)
+    camino = saltos[:1]
+    for x, y in saltos[1:]:
+        x0, y0 = camino[-1]
+        dx = (x > x0) - (x < x0)
+        dy = (y > y0) - (y < y0)
+        while (x0, y0) != (x, y):
+            x0, y0 = x0 + dx, y0 + dy
+            camino.append((x0, y0))
+    return camino
+
+
+# Algoritmos disponibles por nombre, con los mismos nombres que usa GameManager
+ALGORITMOS = {
+    'bfs': bfs,
+    'dfs': dfs,
+    'a*': astar,
+    'bfs-bi': bfs_bidireccional,
+    'a*-bi': astar_bidireccional,
+    'jps': jps,
+}
+
+# Versiones generadoras de ALGORITMOS, con los mismos nombres
+_GENERADORES = {
+    'bfs': partial(_eventos_no_informada, profundidad=False),
+    'dfs': partial(_eventos_no_informada, profundidad=True),
+    'a*': _eventos_astar,
+    'bfs-bi': _eventos_bfs_bidireccional,
+    'a*-bi': _eventos_astar_bidireccional,
+    'jps': _eventos_jps,
+}
+
+
+def eventos_busqueda(algoritmo, costos, ancho, punto_inicio, punto_fin, **opciones):
+    """
+    Búsqueda de ALGORITMOS como generador: produce cada evento como una tupla
+    (evento, pos, costo) y al terminar devuelve el ResultadoBusqueda (valor de
+    StopIteration o de `yield from`). Las opciones extra se pasan al algoritmo
+    (por ejemplo, estimador para 'a*' o estadisticas).
+    """
+    eventos = _GENERADORES[algoritmo](costos, ancho, punto_inicio, punto_fin, emitir=True, **opciones)
+    return _preparar(eventos, True, opciones.get('estadisticas'))
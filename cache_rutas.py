@@ -0,0 +1,117 @@
+# cache_rutas.py
+"""
+Caché de resultados de búsqueda con desalojo LRU.
+
+Las entradas se indexan por (versión del mapa, tipo de agente, algoritmo, inicio,
+fin). Como Mapa.version aumenta con cada carga y cada modificación de celda, una
+entrada calculada sobre un mapa anterior nunca vuelve a coincidir y termina
+saliendo por el desalojo LRU.
+
+Además de la cantidad de entradas se puede limitar el tamaño total: con una
+función `tamano` que estima los bytes de cada resultado (ver tamano_ruta), se
+desalojan entradas hasta que la suma quede por debajo de `bytes_maximos`.
+"""
+from collections import OrderedDict
+
+CAPACIDAD_POR_DEFECTO = 64
+# Bytes máximos por defecto de las rutas guardadas en GameManager
+BYTES_MAXIMOS_RUTAS = 256 * 1024 * 1024
+# Bytes aproximados de cada paso (tupla (x, y) y su lugar en la lista) de un camino
+BYTES_POR_PASO = 72
+
+
+def tamano_ruta(resultado):
+    """
+    Bytes aproximados de un resultado (camino, arbol) guardado por GameManager.
+    """
+    camino, arbol = resultado
+    return len(camino) * BYTES_POR_PASO + (arbol.nbytes if arbol is not None else 0)
+
+
+class CacheRutas:
+    def __init__(self, capacidad=CAPACIDAD_POR_DEFECTO, bytes_maximos=None, tamano=None):
+        """
+        capacidad: cantidad máxima de entradas.
+        bytes_maximos: tamaño total máximo (None para no limitarlo); requiere `tamano`,
+            función resultado -> bytes aproximados.
+        """
+        if bytes_maximos is not None and tamano is None:
+            raise ValueError("bytes_maximos requiere una función tamano")
+        self.capacidad = capacidad
+        self.bytes_maximos = bytes_maximos
+        self._tamano = tamano
+        self._entradas = OrderedDict()
+        self._bytes_entradas = {}
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @staticmethod
+    def clave(mapa, tipo_agente, algoritmo, punto_inicio, punto_fin):
+        return (mapa.version, tipo_agente, algoritmo, tuple(punto_inicio), tuple(punto_fin))
+
+    def obtener(self, clave):
+        """
+        Devuelve el resultado guardado para la clave, o None si no está.
+        """
+        resultado = self._entradas.get(clave)
+        if resultado is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return resultado
+
+    def guardar(self, clave, resultado):
+        """
+        Guarda un resultado, desalojando los usados hace más tiempo mientras se supere
+        la capacidad o los bytes máximos. Un resultado que solo ya supera los bytes
+        máximos no se guarda.
+        """
+        self._quitar(clave)
+        self._entradas[clave] = resultado
+        if self._tamano is not None:
+            tamano = self._tamano(resultado)
+            self._bytes_entradas[clave] = tamano
+            self.bytes_usados += tamano
+        while len(self._entradas) > self.capacidad or \
+                (self.bytes_maximos is not None and self.bytes_usados > self.bytes_maximos):
+            self._quitar(next(iter(self._entradas)))
+
+    def _quitar(self, clave):
+        if self._entradas.pop(clave, None) is not None:
+            self.bytes_usados -= self._bytes_entradas.pop(clave, 0)
+
+    def buscar(self, mapa, tipo_agente, algoritmo, punto_inicio, punto_fin, calcular):
+        """
+        Devuelve el resultado de la caché o, si no está, lo calcula con calcular() y lo guarda.
+        """
+        clave = self.clave(mapa, tipo_agente, algoritmo, punto_inicio, punto_fin)
+        resultado = self.obtener(clave)
+        if resultado is None:
+            resultado = calcular()
+            self.guardar(clave, resultado)
+        return resultado
+
+    def limpiar(self):
+        self._entradas.clear()
+        self._bytes_entradas.clear()
+        self.bytes_usados = 0
+
+    def estadisticas(self):
+        """
+        Aciertos, fallos, tasa de aciertos y tamaño actual de la caché.
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            'entradas': len(self._entradas),
+            'capacidad': self.capacidad,
+            'bytes_usados': self.bytes_usados,
+            'bytes_maximos': self.bytes_maximos,
+        }
@@ -0,0 +1,100 @@
+# camara.py
+"""
+Cámara de la vista del mapa: desplazamiento y zoom sobre mapas más grandes que la ventana.
+
+La cámara trabaja en celdas enteras: (x, y) es la celda visible en la esquina
+superior izquierda y tamano_celda es el zoom en pixeles por celda.
+"""
+
+TAMANO_CELDA_MINIMO = 2
+TAMANO_CELDA_MAXIMO = 60
+FACTOR_ZOOM = 1.25
+
+
+class Camara:
+    def __init__(self, ancho_mapa, alto_mapa, ancho_vista, alto_vista, tamano_celda):
+        """
+        ancho_mapa, alto_mapa: tamaño del mapa en celdas.
+        ancho_vista, alto_vista: tamaño en pixeles del área de la ventana dedicada al mapa.
+        """
+        self.ancho_mapa = ancho_mapa
+        self.alto_mapa = alto_mapa
+        self.ancho_vista = ancho_vista
+        self.alto_vista = alto_vista
+        self.tamano_celda = tamano_celda
+        self.x = 0
+        self.y = 0
+
+    def columnas_visibles(self):
+        return -(-self.ancho_vista // self.tamano_celda)
+
+    def filas_visibles(self):
+        return -(-self.alto_vista // self.tamano_celda)
+
+    def rango_visible(self):
+        """
+        Devuelve (x0, y0, x1, y1): las celdas visibles son x0 <= x < x1, y0 <= y < y1.
+        """
+        x1 = min(self.ancho_mapa, self.x + self.columnas_visibles())
+        y1 = min(self.alto_mapa, self.y + self.filas_visibles())
+        return self.x, self.y, x1, y1
+
+    def es_visible(self, x, y):
+        x0, y0, x1, y1 = self.rango_visible()
+        return x0 <= x < x1 and y0 <= y < y1
+
+    def a_pantalla(self, x, y):
+        """
+        Esquina superior izquierda en pixeles de la celda (x, y).
+        """
+        return (x - self.x) * self.tamano_celda, (y - self.y) * self.tamano_celda
+
+    def celda_en(self, pixel):
+        """
+        Celda bajo un pixel de la ventana, o None si cae fuera del mapa visible.
+        """
+        px, py = pixel
+        if not (0 <= px < self.ancho_vista and 0 <= py < self.alto_vista):
+            return None
+        x = self.x + px // self.tamano_celda
+        y = self.y + py // self.tamano_celda
+        if x < self.ancho_mapa and y < self.alto_mapa:
+            return x, y
+        return None
+
+    def _limitar(self):
+        self.x = max(0, min(self.x, self.ancho_mapa - self.ancho_vista // self.tamano_celda))
+        self.y = max(0, min(self.y, self.alto_mapa - self.alto_vista // self.tamano_celda))
+
+    def desplazar(self, dx, dy):
+        """
+        Mueve la cámara dx, dy celdas. Devuelve True si la vista cambió.
+        """
+        anterior = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self._limitar()
+        return (self.x, self.y) != anterior
+
+    def centrar_en(self, x, y):
+        """
+        Centra la vista en la celda (x, y). Devuelve True si la vista cambió.
+        """
+        return self.desplazar(x - self.columnas_visibles() // 2 - self.x,
+                              y - self.filas_visibles() // 2 - self.y)
+
+    def acercar(self, pasos, pixel=None):
+        """
+        Cambia el zoom `pasos` niveles (positivo acerca, negativo aleja), manteniendo
+        fija la celda bajo `pixel` si se indica. Devuelve True si la vista cambió.
+        """
+        anterior = (self.x, self.y, self.tamano_celda)
+        ancla = self.celda_en(pixel) if pixel is not None else None
+        tamano = self.tamano_celda * FACTOR_ZOOM ** pasos
+        tamano = int(round(tamano)) if pasos < 0 else int(tamano + 0.999)
+        self.tamano_celda = max(TAMANO_CELDA_MINIMO, min(TAMANO_CELDA_MAXIMO, tamano))
+        if ancla is not None:
+            self.x = ancla[0] - pixel[0] // self.tamano_celda
+            self.y = ancla[1] - pixel[1] // self.tamano_celda
+        self._limitar()
+        return (self.x, self.y, self.tamano_celda) != anterior
@@ -0,0 +1,108 @@
+# campos.py
+"""
+Campos de distancia y de flujo hacia un punto final.
+
+Un solo Dijkstra inverso desde el punto final calcula, para cada celda, el costo
+mínimo para llegar al fin y la dirección del siguiente paso. Con eso el camino y
+el costo desde cualquier inicio se leen siguiendo las direcciones, en tiempo
+proporcional al largo del camino, en lugar de repetir una búsqueda por cada
+inicio. Como busqueda.py, trabaja sobre la malla de costos compilada del agente.
+"""
+from array import array
+import heapq
+
+import numpy as np
+
+from busqueda import ResultadoBusqueda, INFINITO, MOVIMIENTOS, _posicion
+from constantes import INTRANSITABLE
+
+# Dirección de las celdas sin camino al fin (o del propio fin)
+SIN_DIRECCION = 255
+
+
+class CampoDistancias:
+    def __init__(self, costos, ancho, punto_fin):
+        """
+        Calcula el campo para la malla de costos `costos` (indexada por y * ancho + x).
+
+        distancias: array('q') con el costo mínimo de cada celda al fin (INFINITO si no llega).
+        direcciones: bytearray con el índice en MOVIMIENTOS del siguiente paso de cada celda.
+        """
+        self.ancho = ancho
+        self.fin = punto_fin[1] * ancho + punto_fin[0]
+        total = len(costos)
+        distancias = array('q', [INFINITO]) * total
+        direcciones = bytearray([SIN_DIRECCION]) * total
+        distancias[self.fin] = 0
+
+        # Dijkstra hacia atrás: desde una celda transitable v se llega a cada vecina u
+        # pagando el costo de entrar a v, y la dirección de u apunta hacia v
+        heap = [(0, self.fin)]
+        while heap:
+            distancia, celda = heapq.heappop(heap)
+            if distancia > distancias[celda]:
+                continue
+            costo = costos[celda]
+            if costo == INTRANSITABLE:
+                continue
+            nueva = distancia + costo
+            x = celda % ancho
+            if x > 0 and nueva < distancias[celda - 1]:
+                distancias[celda - 1] = nueva
+                direcciones[celda - 1] = 1  # La vecina de la izquierda avanza a la derecha
+                heapq.heappush(heap, (nueva, celda - 1))
+            if x < ancho - 1 and nueva < distancias[celda + 1]:
+                distancias[celda + 1] = nueva
+                direcciones[celda + 1] = 0
+                heapq.heappush(heap, (nueva, celda + 1))
+            if celda >= ancho and nueva < distancias[celda - ancho]:
+                distancias[celda - ancho] = nueva
+                direcciones[celda - ancho] = 3  # La vecina de arriba avanza hacia abajo
+                heapq.heappush(heap, (nueva, celda - ancho))
+            if celda + ancho < total and nueva < distancias[celda + ancho]:
+                distancias[celda + ancho] = nueva
+                direcciones[celda + ancho] = 2
+                heapq.heappush(heap, (nueva, celda + ancho))
+
+        self.distancias = distancias
+        self.direcciones = direcciones
+        alcanzadas = self.como_matriz()
+        alcanzadas = alcanzadas[alcanzadas != INFINITO]
+        self.distancia_maxima = int(alcanzadas.max()) if alcanzadas.size else 0
+
+    @property
+    def punto_fin(self):
+        return _posicion(self.fin, self.ancho)
+
+    def como_matriz(self):
+        """
+        Vista (sin copiar) de las distancias como matriz numpy de alto x ancho.
+        """
+        return np.frombuffer(self.distancias, dtype=np.int64).reshape(-1, self.ancho)
+
+    def costo(self, punto_inicio):
+        """
+        Costo mínimo desde punto_inicio hasta el fin, None si no hay camino.
+        """
+        distancia = self.distancias[punto_inicio[1] * self.ancho + punto_inicio[0]]
+        return None if distancia == INFINITO else distancia
+
+    def camino(self, punto_inicio):
+        """
+        Camino desde punto_inicio hasta el fin siguiendo el campo de flujo, vacío si no hay camino.
+        """
+        if self.costo(punto_inicio) is None:
+            return []
+        x, y = punto_inicio
+        camino = [(x, y)]
+        while (x, y) != self.punto_fin:
+            dx, dy = MOVIMIENTOS[self.direcciones[y * self.ancho + x]]
+            x, y = x + dx, y + dy
+            camino.append((x, y))
+        return camino
+
+    def resultado(self, punto_inicio):
+        """
+        Camino y costo desde punto_inicio como ResultadoBusqueda (sin árbol de decisiones).
+        """
+        return ResultadoBusqueda(self.camino(punto_inicio), self.costo(punto_inicio), None)
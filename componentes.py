@@ -0,0 +1,269 @@
+# componentes.py
+"""
+Componentes conexas de las celdas transitables de un agente.
+
+Dos celdas están en la misma componente si el agente puede ir de una a otra, así
+que una consulta con el fin en otra componente no tiene camino y se contesta sin
+buscar. Las etiquetas se calculan con numpy: cada fila se parte en tramos
+transitables y los tramos que se tocan entre filas se unen propagando la etiqueta
+mínima. Al modificar una celda solo se unen las componentes vecinas (recorriendo
+las menores) o, si al quitarla la componente pudo partirse, se recorren las partes
+desde sus vecinas.
+"""
+import heapq
+from collections import deque
+
+import numpy as np
+
+from constantes import INTRANSITABLE
+
+# Etiqueta de las celdas intransitables
+SIN_COMPONENTE = -1
+# Al unir componentes, recorrer una celda en Python cuesta lo que comparar unas
+# miles con numpy: las componentes de menos de total / CELDAS_POR_RECORRIDA celdas
+# se reetiquetan recorriéndolas y las demás con una máscara sobre todo el mapa
+CELDAS_POR_RECORRIDA = 2000
+# Celdas que rodean a una celda, en orden circular (las de índice impar son sus vecinas directas)
+_ANILLO = [(-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0)]
+
+
+def etiquetar(transitables):
+    """
+    Etiqueta las componentes conexas (4 vecinos) de una matriz booleana.
+
+    Retorna:
+        matriz int32 con la etiqueta de cada celda (0, 1, ...) o SIN_COMPONENTE, y
+        la cantidad de componentes.
+    """
+    alto, ancho = transitables.shape
+    planas = transitables.ravel()
+    # Un tramo empieza en cada celda transitable sin vecina transitable a la izquierda
+    inicios = transitables.copy()
+    inicios[:, 1:] &= ~transitables[:, :-1]
+    tramos = np.cumsum(inicios.ravel()) - 1
+    cantidad_tramos = int(tramos[-1]) + 1 if planas.size else 0
+    etiquetas = np.full(planas.size, SIN_COMPONENTE, dtype=np.int32)
+    if cantidad_tramos == 0:
+        return etiquetas.reshape(alto, ancho), 0
+
+    # Pares de tramos que se tocan verticalmente
+    verticales = (transitables[:-1] & transitables[1:]).ravel()
+    arriba = tramos[:-ancho][verticales]
+    abajo = tramos[ancho:][verticales]
+
+    # Cada tramo termina con la etiqueta del menor tramo de su componente
+    raices = np.arange(cantidad_tramos)
+    while True:
+        minimos = np.minimum(raices[arriba], raices[abajo])
+        nuevas = raices.copy()
+        np.minimum.at(nuevas, raices[arriba], minimos)
+        np.minimum.at(nuevas, raices[abajo], minimos)
+        nuevas = nuevas[nuevas]
+        while True:
+            saltos = nuevas[nuevas]
+            if np.array_equal(saltos, nuevas):
+                break
+            nuevas = saltos
+        if np.array_equal(nuevas, raices):
+            break
+        raices = nuevas
+
+    _, compactas = np.unique(raices, return_inverse=True)
+    etiquetas[planas] = compactas.astype(np.int32)[tramos[planas]]
+    return etiquetas.reshape(alto, ancho), int(compactas.max()) + 1
+
+
+class ComponentesConexas:
+    def __init__(self, costos, ancho):
+        """
+        costos: malla de costos compilada del agente, indexada por y * ancho + x. Se
+        guarda la referencia, como en PlanificadorIncremental: después de cambiar una
+        celda en el mismo arreglo se llama a actualizar_celda.
+
+        etiquetas: array int32 plano con la componente de cada celda o SIN_COMPONENTE.
+        tamanos: diccionario componente -> cantidad de celdas.
+        revision: aumenta cada vez que cambian las componentes, para saber sin
+            recorrerlas si hay que recalcular lo que depende de ellas.
+        """
+        self.costos = costos
+        self.ancho = ancho
+        transitables = np.frombuffer(costos, dtype=np.uint16).reshape(-1, ancho) != INTRANSITABLE
+        matriz, cantidad = etiquetar(transitables)
+        self.etiquetas = matriz.ravel()
+        cuentas = np.bincount(self.etiquetas[self.etiquetas != SIN_COMPONENTE], minlength=cantidad)
+        self.tamanos = dict(enumerate(cuentas.tolist()))
+        self._siguiente = cantidad  # Próxima etiqueta libre
+        self.revision = 0
+
+    def __len__(self):
+        return len(self.tamanos)
+
+    def componente(self, pos):
+        return int(self.etiquetas[pos[1] * self.ancho + pos[0]])
+
+    def como_matriz(self):
+        return self.etiquetas.reshape(-1, self.ancho)
+
+    def mayores(self, cantidad=3):
+        """
+        Tamaños de las componentes más grandes, de mayor a menor.
+        """
+        return heapq.nlargest(cantidad, self.tamanos.values())
+
+    def _vecinas(self, indice):
+        x = indice % self.ancho
+        total = len(self.etiquetas)
+        for vecino, valido in ((indice - 1, x > 0), (indice + 1, x < self.ancho - 1),
+                               (indice - self.ancho, indice >= self.ancho),
+                               (indice + self.ancho, indice + self.ancho < total)):
+            if valido and self.etiquetas[vecino] != SIN_COMPONENTE:
+                yield vecino
+
+    def conectados(self, punto_inicio, punto_fin):
+        """
+        Indica si puede haber camino de punto_inicio a punto_fin. Como en busqueda.py
+        se paga la celda de destino, un inicio intransitable sale por sus vecinas.
+        """
+        if punto_inicio == punto_fin:
+            return True
+        destino = self.componente(punto_fin)
+        if destino == SIN_COMPONENTE:
+            return False
+        inicio = punto_inicio[1] * self.ancho + punto_inicio[0]
+        if self.etiquetas[inicio] != SIN_COMPONENTE:
+            return int(self.etiquetas[inicio]) == destino
+        return any(int(self.etiquetas[vecino]) == destino for vecino in self._vecinas(inicio))
+
+    def actualizar_celda(self, x, y):
+        """
+        Actualiza las componentes después de cambiar la celda (x, y) en la malla.
+        """
+        indice = y * self.ancho + x
+        transitable = self.costos[indice] != INTRANSITABLE
+        anterior = int(self.etiquetas[indice])
+        if transitable == (anterior != SIN_COMPONENTE):
+            return
+        if transitable:
+            self._agregar(indice)
+        else:
+            self._quitar(indice, anterior)
+
+    def _agregar(self, indice):
+        self.revision += 1
+        # La celda une a todas las componentes vecinas; se conserva la etiqueta de la
+        # más grande y solo se reetiquetan las demás
+        vecinas = {}
+        for vecino in self._vecinas(indice):
+            vecinas.setdefault(int(self.etiquetas[vecino]), vecino)
+        if not vecinas:
+            destino = self._siguiente
+            self._siguiente += 1
+            self.tamanos[destino] = 0
+        else:
+            destino = max(vecinas, key=self.tamanos.__getitem__)
+            for etiqueta, vecino in vecinas.items():
+                if etiqueta == destino:
+                    continue
+                if self.tamanos[etiqueta] * CELDAS_POR_RECORRIDA < len(self.etiquetas):
+                    self._reetiquetar(vecino, etiqueta, destino)
+                else:
+                    self.etiquetas[self.etiquetas == etiqueta] = destino
+                self.tamanos[destino] += self.tamanos.pop(etiqueta)
+        self.etiquetas[indice] = destino
+        self.tamanos[destino] += 1
+
+    def _reetiquetar(self, inicio, etiqueta, destino):
+        """
+        Cambia a `destino` la etiqueta de la componente de `inicio` con una búsqueda
+        en anchura, así que el trabajo depende solo del tamaño de esa componente.
+        """
+        self.etiquetas[inicio] = destino
+        cola = deque([inicio])
+        while cola:
+            actual = cola.popleft()
+            for vecino in self._vecinas(actual):
+                if self.etiquetas[vecino] == etiqueta:
+                    self.etiquetas[vecino] = destino
+                    cola.append(vecino)
+
+    def _anillo_conectado(self, indice):
+        """
+        Indica si las vecinas transitables de la celda quedan unidas por las ocho
+        celdas que la rodean; en ese caso quitarla no parte su componente.
+        """
+        x, y = indice % self.ancho, indice // self.ancho
+        alto = len(self.etiquetas) // self.ancho
+        transitables = []
+        for dx, dy in _ANILLO:
+            xv, yv = x + dx, y + dy
+            transitables.append(0 <= xv < self.ancho and 0 <= yv < alto and
+                                self.etiquetas[yv * self.ancho + xv] != SIN_COMPONENTE)
+        # Tramos del anillo (circular) que contienen alguna vecina directa
+        tramos = 0
+        for i in range(len(_ANILLO)):
+            if transitables[i] and not transitables[i - 1]:
+                j = i
+                con_vecina = False
+                while transitables[j % len(_ANILLO)] and j < i + len(_ANILLO):
+                    con_vecina |= j % 2 == 1
+                    j += 1
+                tramos += con_vecina
+        return tramos <= 1
+
+    def _quitar(self, indice, anterior):
+        self.revision += 1
+        self.etiquetas[indice] = SIN_COMPONENTE
+        self.tamanos[anterior] -= 1
+        if self.tamanos[anterior] == 0:
+            del self.tamanos[anterior]
+            return
+        vecinas = list(self._vecinas(indice))
+        if len(vecinas) < 2 or self._anillo_conectado(indice):
+            return
+
+        # Una búsqueda en anchura por vecina, avanzando por turnos: las que se tocan
+        # se unen y la que se agota sin tocar a las demás es una componente aparte.
+        # Así el trabajo depende del tamaño de las partes que se separan.
+        grupos = list(range(len(vecinas)))
+
+        def raiz(grupo):
+            while grupos[grupo] != grupo:
+                grupo = grupos[grupo]
+            return grupo
+
+        colas = [deque([vecina]) for vecina in vecinas]
+        duenos = {vecina: grupo for grupo, vecina in enumerate(vecinas)}
+        activos = set(grupos)
+        while len(activos) > 1:
+            for grupo in list(activos):
+                if grupo not in activos:
+                    continue
+                cola = colas[grupo]
+                if not cola:
+                    self._separar([celda for celda, dueno in duenos.items() if raiz(dueno) == grupo], anterior)
+                    activos.discard(grupo)
+                    break
+                actual = cola.popleft()
+                for vecino in self._vecinas(actual):
+                    if self.etiquetas[vecino] != anterior:
+                        continue
+                    dueno = duenos.get(vecino)
+                    if dueno is None:
+                        duenos[vecino] = grupo
+                        cola.append(vecino)
+                    elif raiz(dueno) != grupo:
+                        otro = raiz(dueno)
+                        grupos[otro] = grupo
+                        cola.extend(colas[otro])
+                        colas[otro] = deque()
+                        activos.discard(otro)
+                if len(activos) == 1:
+                    break
+
+    def _separar(self, celdas, anterior):
+        self.revision += 1
+        etiqueta = self._siguiente
+        self._siguiente += 1
+        self.etiquetas[celdas] = etiqueta
+        self.tamanos[etiqueta] = len(celdas)
+        self.tamanos[anterior] -= len(celdas)
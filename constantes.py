@@ -39,7 +39,10 @@ COSTOS_MOVIMIENTO = {
         "sand": 3,
         "forest": 4,
         "swamp": 5,
-        "snow": 5
+        "snow": 5,
+        "city": None,
+        "meadow": None,
+        "desert": None
     },
     "monkey": {
         "mountain": None,
@@ -48,7 +51,10 @@ COSTOS_MOVIMIENTO = {
         "sand": 3,
         "forest": 1,
         "swamp": 5,
-        "snow": None
+        "snow": None,
+        "city": None,
+        "meadow": None,
+        "desert": None
     },
     "octopus": {
         "mountain": None,
@@ -57,7 +63,10 @@ COSTOS_MOVIMIENTO = {
         "sand": None,
         "forest": 3,
         "swamp": 2,
-        "snow": None
+        "snow": None,
+        "city": None,
+        "meadow": None,
+        "desert": None
     },
     "sasquatch": {
         "mountain": 15,
@@ -66,11 +75,27 @@ COSTOS_MOVIMIENTO = {
         "sand": None,
         "forest": 4,
         "swamp": 5,
-        "snow": 3
+        "snow": 3,
+        "city": None,
+        "meadow": None,
+        "desert": None
     }
     
 }
 
+# Valor centinela de las tablas y mallas de costos compiladas para celdas intransitables
+INTRANSITABLE = 0
+
+# Tablas de costos compiladas: para cada tipo de agente, una lista indexada por el
+# código de terreno (0-255) con el costo de entrar en la celda o INTRANSITABLE
+TABLAS_COSTOS = {
+    tipo_agente: [
+        costos.get(TERRENOS.get(codigo)) or INTRANSITABLE
+        for codigo in range(256)
+    ]
+    for tipo_agente, costos in COSTOS_MOVIMIENTO.items()
+}
+
 # Colores asociados a cada tipo de agente
 COLORES_AGENTES = {
     "human": (0, 0, 255),      # Azul
@@ -0,0 +1,27 @@
+# convertir_mapa.py
+"""
+Convierte mapas entre los formatos de texto (.txt/.csv) y binario (.mapb).
+
+Uso:
+    python convertir_mapa.py ejemplo1_mapa.txt                 # genera ejemplo1_mapa.mapb
+    python convertir_mapa.py mapa.mapb mapa.csv
+"""
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from Mapa import EXTENSION_BINARIA, convertir_mapa
+
+
+def main(argumentos):
+    if len(argumentos) not in (1, 2):
+        print(__doc__)
+        return 1
+    origen = argumentos[0]
+    destino = argumentos[1] if len(argumentos) == 2 else os.path.splitext(origen)[0] + EXTENSION_BINARIA
+    return 0 if convertir_mapa(origen, destino) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
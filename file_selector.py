@@ -7,7 +7,7 @@ class FileSelector:
         root.withdraw()  # Oculta la ventana principal de Tkinter
         archivo = filedialog.askopenfilename(
             title="Selecciona archivo",
-            filetypes=[("Archivos de texto", "*.txt"), ("Archivos CSV", "*.csv")]
+            filetypes=[("Archivos de texto", "*.txt"), ("Archivos CSV", "*.csv"), ("Mapas binarios", "*.mapb")]
         )
         root.destroy()  # Destruye la ventana después de seleccionar el archivo
         return archivo
\ No newline at end of file
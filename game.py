@@ -13,11 +13,9 @@ def main():
         print("No se seleccionó ningún archivo. Terminando el programa.")
         sys.exit()
 
-    # Determinar el delimitador basado en la extensión del archivo
-    delimitador = ',' if archivo_mapa.endswith('.csv') else ' '
-
     # Inicializar el gestor del juego con el archivo de mapa seleccionado
-    gestor = GameManager(archivo_mapa, delimitador)
+    # (el delimitador .txt/.csv se detecta al cargar el mapa)
+    gestor = GameManager(archivo_mapa)
 
     # Ejecutar el bucle principal del juego
     gestor.ejecutar_juego()
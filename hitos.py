@@ -0,0 +1,187 @@
+# hitos.py
+"""
+Heurística ALT (A*, hitos y desigualdad triangular) para `busqueda.astar`.
+
+Para unos pocos hitos L se precalcula el costo d(v, L) desde cada celda v hasta
+el hito. Por la desigualdad triangular, d(v, fin) >= d(v, L) - d(fin, L), y como
+un camino y su inverso pagan las mismas celdas salvo los extremos, también
+d(v, fin) >= d(L, fin) - d(L, v). El máximo de estas cotas sobre todos los hitos
+(y la distancia de Manhattan escalada) es una heurística consistente, mucho más
+ajustada que Manhattan cuando hay muros o terrenos caros.
+
+Las distancias dependen de la malla de costos del agente, así que hay una tabla
+por tipo de agente. Se guardan en un archivo binario junto al mapa, con el
+ancho más chico que alcance para los valores y una suma de verificación de la
+malla para descartar tablas de un mapa que cambió.
+"""
+import os
+import struct
+import zlib
+from array import array
+
+import numpy as np
+
+from busqueda import INFINITO, costo_minimo_transitable
+from campos import CampoDistancias
+from constantes import INTRANSITABLE
+
+CANTIDAD_HITOS = 8
+
+# Formato de las tablas (.hitos): cabecera fija, índices de los hitos (uint32) y una
+# fila de distancias por hito. Cabecera: firma, versión, bytes por distancia, ancho,
+# alto, cantidad de hitos y CRC-32 de la malla de costos, rellenada hasta TAMANO_CABECERA_HITOS.
+EXTENSION_HITOS = '.hitos'
+FIRMA_HITOS = b'SKIBIHIT'
+VERSION_HITOS = 1
+FORMATO_CABECERA_HITOS = '<8sHHIIII'
+TAMANO_CABECERA_HITOS = 32
+TIPOS_DISTANCIA = {2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+
+class TablaHitos:
+    def __init__(self, costos, ancho, hitos, distancias):
+        """
+        hitos: índices (y * ancho + x) de las celdas elegidas como hitos.
+        distancias: matriz numpy (hitos x celdas) sin signo con d(celda, hito); el
+            máximo del tipo marca las celdas que no llegan al hito.
+        """
+        self.costos = costos
+        self.ancho = ancho
+        self.hitos = list(hitos)
+        self.distancias = distancias
+        self.sin_camino = int(np.iinfo(distancias.dtype).max)
+
+    def estimador(self, punto_fin):
+        """
+        Estimador para `astar` hacia punto_fin. Las cotas de todas las celdas se
+        calculan de una vez con numpy, así que cada consulta de A* es una lectura.
+        """
+        fin = punto_fin[1] * self.ancho + punto_fin[0]
+        total = len(self.costos)
+        costos = np.frombuffer(self.costos, dtype=np.uint16).astype(np.int64)
+        ys, xs = np.divmod(np.arange(total, dtype=np.int64), self.ancho)
+        estimados = (np.abs(xs - punto_fin[0]) + np.abs(ys - punto_fin[1])) * costo_minimo_transitable(self.costos)
+        transitables = costos != INTRANSITABLE
+
+        for fila in self.distancias:
+            hasta_fin = int(fila[fin])
+            if hasta_fin == self.sin_camino:
+                continue
+            hasta_hito = fila.astype(np.int64)
+            # d(v, fin) >= d(v, L) - d(fin, L)
+            cota = hasta_hito - hasta_fin
+            # d(v, fin) >= d(L, fin) - d(L, v), con d(L, v) = d(v, L) - costo(L) + costo(v)
+            # (solo para v transitable: a una celda intransitable no se entra)
+            desde_hito = hasta_fin + int(costos[fin]) - hasta_hito - costos
+            cota = np.where(transitables, np.maximum(cota, desde_hito), cota)
+            np.maximum(estimados, np.where(fila != self.sin_camino, cota, 0), out=estimados)
+
+        tabla = array('q')
+        tabla.frombytes(estimados.tobytes())
+        return tabla.__getitem__
+
+
+def calcular_hitos(costos, ancho, cantidad=CANTIDAD_HITOS):
+    """
+    Elige los hitos por el punto más lejano: el primero es la celda más lejana a la
+    primera celda transitable y cada siguiente la más lejana a todos los anteriores.
+    Las celdas que no llegan a la región de esos hitos solo usan Manhattan escalada.
+    """
+    total = len(costos)
+    transitables = np.flatnonzero(np.frombuffer(costos, dtype=np.uint16) != INTRANSITABLE)
+    hitos, filas = [], []
+    if transitables.size:
+        primera = int(transitables[0])
+        lejania = CampoDistancias(costos, ancho, (primera % ancho, primera // ancho)).como_matriz().ravel()
+        elegibles = np.zeros(total, dtype=bool)
+        elegibles[transitables] = True
+        for _ in range(cantidad):
+            candidatas = np.where(elegibles & (lejania != INFINITO), lejania, -1)
+            hito = int(np.argmax(candidatas))
+            if candidatas[hito] <= 0:
+                break
+            campo = CampoDistancias(costos, ancho, (hito % ancho, hito // ancho))
+            fila = campo.como_matriz().ravel().copy()
+            hitos.append(hito)
+            filas.append(fila)
+            lejania = fila if len(filas) == 1 else np.minimum(lejania, fila)
+
+    distancias = np.array(filas, dtype=np.int64).reshape(len(filas), total)
+    alcanzadas = distancias[distancias != INFINITO]
+    maximo = int(alcanzadas.max()) if alcanzadas.size else 0
+    for bytes_por_distancia, tipo in TIPOS_DISTANCIA.items():
+        if maximo < np.iinfo(tipo).max:
+            break
+    compactas = np.where(distancias != INFINITO, distancias, np.iinfo(tipo).max).astype(tipo)
+    return TablaHitos(costos, ancho, hitos, compactas)
+
+
+def archivo_hitos(archivo_mapa, tipo_agente):
+    """
+    Nombre del archivo de hitos de un agente junto al mapa.
+    """
+    return f"{archivo_mapa}.{tipo_agente}{EXTENSION_HITOS}"
+
+
+def guardar_hitos(tabla, nombre_archivo):
+    """
+    Escribe la tabla en formato binario, pasando por un archivo temporal como guardar_mapa_binario.
+    """
+    cantidad = len(tabla.hitos)
+    cabecera = struct.pack(FORMATO_CABECERA_HITOS, FIRMA_HITOS, VERSION_HITOS, tabla.distancias.dtype.itemsize,
+                           tabla.ancho, len(tabla.costos) // tabla.ancho, cantidad, zlib.crc32(tabla.costos))
+    temporal = nombre_archivo + '.tmp'
+    with open(temporal, 'wb') as archivo:
+        archivo.write(cabecera.ljust(TAMANO_CABECERA_HITOS, b'\0'))
+        archivo.write(np.array(tabla.hitos, dtype=np.uint32).tobytes())
+        archivo.write(np.ascontiguousarray(tabla.distancias).tobytes())
+    os.replace(temporal, nombre_archivo)
+
+
+def abrir_hitos(nombre_archivo, costos, ancho):
+    """
+    Abre una tabla guardada con memoria mapeada. Lanza ValueError si el archivo no
+    es una tabla de hitos o si se calculó para otra malla de costos.
+    """
+    with open(nombre_archivo, 'rb') as archivo:
+        cabecera = archivo.read(TAMANO_CABECERA_HITOS)
+    if len(cabecera) < TAMANO_CABECERA_HITOS:
+        raise ValueError("cabecera de tabla de hitos incompleta")
+    firma, version, bytes_por_distancia, ancho_tabla, alto, cantidad, suma = \
+        struct.unpack_from(FORMATO_CABECERA_HITOS, cabecera)
+    if firma != FIRMA_HITOS:
+        raise ValueError("el archivo no es una tabla de hitos")
+    if version != VERSION_HITOS:
+        raise ValueError(f"versión de tabla de hitos no soportada: {version}")
+    if bytes_por_distancia not in TIPOS_DISTANCIA:
+        raise ValueError(f"tamaño de distancia no soportado: {bytes_por_distancia}")
+    if (ancho_tabla, alto) != (ancho, len(costos) // ancho) or suma != zlib.crc32(costos):
+        raise ValueError("la tabla de hitos corresponde a otro mapa")
+    total = ancho * alto
+    inicio_distancias = TAMANO_CABECERA_HITOS + 4 * cantidad
+    if os.path.getsize(nombre_archivo) < inicio_distancias + cantidad * total * bytes_por_distancia:
+        raise ValueError("la tabla de hitos está truncada")
+    hitos = np.fromfile(nombre_archivo, dtype=np.uint32, count=cantidad, offset=TAMANO_CABECERA_HITOS)
+    if cantidad == 0:
+        return TablaHitos(costos, ancho, [], np.zeros((0, total), dtype=TIPOS_DISTANCIA[bytes_por_distancia]))
+    distancias = np.memmap(nombre_archivo, dtype=TIPOS_DISTANCIA[bytes_por_distancia], mode='r',
+                           offset=inicio_distancias, shape=(cantidad, total))
+    return TablaHitos(costos, ancho, hitos.tolist(), distancias)
+
+
+def hitos_para_mapa(archivo_mapa, tipo_agente, costos, ancho):
+    """
+    Abre la tabla de hitos guardada junto al mapa o, si falta o no corresponde a la
+    malla actual, la calcula y la guarda.
+    """
+    nombre = archivo_hitos(archivo_mapa, tipo_agente)
+    try:
+        return abrir_hitos(nombre, costos, ancho)
+    except (OSError, ValueError):
+        pass
+    tabla = calcular_hitos(costos, ancho)
+    try:
+        guardar_hitos(tabla, nombre)
+    except OSError as e:
+        print(f"No se pudo guardar la tabla de hitos: {e}")
+    return tabla
@@ -0,0 +1,478 @@
+# jerarquico.py
+"""
+Búsqueda jerárquica (HPA*) para mapas grandes.
+
+El mapa se divide en clusters cuadrados. En cada borde entre dos clusters vecinos
+se eligen transiciones (pares de celdas transitables enfrentadas) y, dentro de
+cada cluster, se calcula el costo entre todas sus celdas de transición (la
+primera vez que una consulta pasa por él, y se conserva para las siguientes).
+Una consulta conecta el inicio y el fin con las transiciones de su cluster,
+busca con A* en ese grafo abstracto (mucho más pequeño que el mapa) y arma el
+camino reconstruyendo el tramo de cada arista. El resultado puede ser algo más
+caro que el óptimo; cada consulta informa una cota de cuánto.
+
+Como busqueda.py, no depende de pygame y trabaja sobre la malla de costos
+compilada del agente. Al modificar una celda solo se descarta lo calculado para su
+cluster (y los vecinos cuyo borde cambió), que se rehace en la siguiente consulta
+que lo necesite.
+"""
+import heapq
+
+import numpy as np
+
+from busqueda import ResultadoBusqueda, MOVIMIENTOS, heuristica, costo_minimo_transitable, _posicion
+from campos import SIN_DIRECCION
+from constantes import INTRANSITABLE
+
+TAMANO_CLUSTER = 32
+# Los tramos de borde transitables de este largo o más tienen una transición en cada extremo
+LARGO_ENTRADA_DOBLE = 6
+
+# Tipos de arista del grafo abstracto, para reconstruir el camino
+_DESDE_INICIO, _HACIA_FIN, _INTERNA, _ENTRE_CLUSTERS = range(4)
+
+# Costo "sin camino" en los cálculos con numpy; lejos de INFINITO para que las sumas no desborden int64
+_SIN_CAMINO = 2 ** 40
+
+
+def _recorte(delta):
+    """
+    Recorte de un eje para las celdas cuya vecina a distancia delta sigue dentro del rectángulo.
+    """
+    if delta < 0:
+        return slice(-delta, None)
+    return slice(0, -delta if delta else None)
+
+
+class ResultadoJerarquico(ResultadoBusqueda):
+    def __init__(self, camino, costo, cota_inferior, nodos_expandidos):
+        """
+        Resultado de una consulta jerárquica.
+
+        cota_inferior: costo que ningún camino puede bajar (distancia de Manhattan por
+            el menor costo transitable del mapa).
+        suboptimalidad_maxima: costo / cota_inferior; el camino cuesta como mucho esa
+            proporción más que el óptimo.
+        nodos_expandidos: nodos del grafo abstracto expandidos por la consulta.
+        """
+        super().__init__(camino, costo, None)
+        self.cota_inferior = cota_inferior
+        self.nodos_expandidos = nodos_expandidos
+        if costo is None:
+            self.suboptimalidad_maxima = None
+        else:
+            self.suboptimalidad_maxima = costo / cota_inferior if cota_inferior else 1.0
+
+
+class PlanificadorJerarquico:
+    def __init__(self, costos, ancho, tamano_cluster=TAMANO_CLUSTER):
+        """
+        Calcula las transiciones de todos los bordes entre clusters.
+
+        costos: malla de costos compilada del agente, indexada por y * ancho + x. Se
+        guarda la referencia, así que las modificaciones hechas sobre el mismo arreglo
+        (Mapa.costos_agente) se toman en cuenta tras llamar a actualizar_celda.
+        """
+        self.costos = costos
+        self.ancho = ancho
+        self.alto = len(costos) // ancho
+        self.tamano_cluster = tamano_cluster
+        self.columnas = -(-ancho // tamano_cluster)
+        self.filas = -(-self.alto // tamano_cluster)
+
+        self.entradas = {}  # Borde -> lista de transiciones (celda de un lado, celda del otro)
+        self.entre_clusters = {}  # Celda -> celdas vecinas en otro cluster a las que se puede pasar
+        self.internas = {}  # Cluster -> {nodo: {nodo destino: costo}}, se llena al usarlo
+        self._direcciones = {}  # Cluster -> {nodo: direcciones hacia atrás desde el nodo, por celda}
+        self._pendientes = set()  # Clusters con celdas modificadas
+
+        for cy in range(self.filas):
+            for cx in range(self.columnas):
+                for borde in (('h', cx, cy), ('v', cx, cy)):
+                    self._actualizar_borde(borde)
+
+    # --- Estructura de clusters ---
+
+    def cluster_de(self, celda):
+        y, x = divmod(celda, self.ancho)
+        return (x // self.tamano_cluster, y // self.tamano_cluster)
+
+    def _rectangulo(self, cluster):
+        cx, cy = cluster
+        x0, y0 = cx * self.tamano_cluster, cy * self.tamano_cluster
+        return x0, y0, min(self.ancho, x0 + self.tamano_cluster), min(self.alto, y0 + self.tamano_cluster)
+
+    def _bordes(self, cluster):
+        """
+        Los cuatro bordes del cluster: ('h', cx, cy) separa (cx, cy) de (cx + 1, cy) y
+        ('v', cx, cy) separa (cx, cy) de (cx, cy + 1).
+        """
+        cx, cy = cluster
+        return [('h', cx, cy), ('h', cx - 1, cy), ('v', cx, cy), ('v', cx, cy - 1)]
+
+    def _calcular_borde(self, borde):
+        """
+        Transiciones de un borde: por cada tramo donde ambos lados son transitables,
+        una en el medio o, si el tramo es largo, una en cada extremo.
+        """
+        orientacion, cx, cy = borde
+        if cx < 0 or cy < 0:
+            return []
+        x0, y0, x1, y1 = self._rectangulo((cx, cy))
+        if orientacion == 'h':
+            if x1 >= self.ancho:
+                return []
+            pares = [(y * self.ancho + x1 - 1, y * self.ancho + x1) for y in range(y0, y1)]
+        else:
+            if y1 >= self.alto:
+                return []
+            pares = [((y1 - 1) * self.ancho + x, y1 * self.ancho + x) for x in range(x0, x1)]
+
+        transiciones = []
+        tramo = []
+        for par in pares + [None]:
+            if par is not None and self.costos[par[0]] != INTRANSITABLE and self.costos[par[1]] != INTRANSITABLE:
+                tramo.append(par)
+                continue
+            if tramo:
+                if len(tramo) >= LARGO_ENTRADA_DOBLE:
+                    transiciones.extend([tramo[0], tramo[-1]])
+                else:
+                    transiciones.append(tramo[len(tramo) // 2])
+                tramo = []
+        return transiciones
+
+    def _actualizar_borde(self, borde):
+        """
+        Recalcula las transiciones de un borde. Devuelve True si cambiaron.
+        """
+        nuevas = self._calcular_borde(borde)
+        anteriores = self.entradas.get(borde, [])
+        if nuevas == anteriores:
+            return False
+        for a, b in anteriores:
+            for origen, destino in ((a, b), (b, a)):
+                destinos = self.entre_clusters.get(origen)
+                if destinos is not None:
+                    destinos.discard(destino)
+                    if not destinos:
+                        del self.entre_clusters[origen]
+        for a, b in nuevas:
+            self.entre_clusters.setdefault(a, set()).add(b)
+            self.entre_clusters.setdefault(b, set()).add(a)
+        if nuevas:
+            self.entradas[borde] = nuevas
+        else:
+            self.entradas.pop(borde, None)
+        return True
+
+    def nodos(self, cluster):
+        """
+        Celdas de transición que pertenecen al cluster.
+        """
+        resultado = set()
+        for borde in self._bordes(cluster):
+            for par in self.entradas.get(borde, ()):
+                for celda in par:
+                    if self.cluster_de(celda) == cluster:
+                        resultado.add(celda)
+        return resultado
+
+    # --- Búsquedas locales dentro de un cluster ---
+
+    def _vecinos_locales(self, celda, rectangulo):
+        x0, y0, x1, y1 = rectangulo
+        y, x = divmod(celda, self.ancho)
+        if x > x0:
+            yield celda - 1
+        if x < x1 - 1:
+            yield celda + 1
+        if y > y0:
+            yield celda - self.ancho
+        if y < y1 - 1:
+            yield celda + self.ancho
+
+    def _dijkstra_local(self, origen, rectangulo, objetivos, inverso=False):
+        """
+        Dijkstra sin salir del rectángulo, que termina al fijar todas las celdas de
+        objetivos. Hacia adelante devuelve el costo desde origen a cada celda y su
+        padre; inverso, el costo de cada celda hasta origen y la celda siguiente en
+        el camino. Solo los costos de los objetivos alcanzados son definitivos.
+        """
+        costos = self.costos
+        distancias = {origen: 0}
+        enlaces = {origen: None}
+        pendientes = set(objetivos)
+        pendientes.discard(origen)
+        heap = [(0, origen)]
+        while heap and pendientes:
+            distancia, celda = heapq.heappop(heap)
+            if distancia > distancias[celda]:
+                continue
+            pendientes.discard(celda)
+            if inverso and costos[celda] == INTRANSITABLE:
+                continue
+            for vecino in self._vecinos_locales(celda, rectangulo):
+                costo = costos[celda] if inverso else costos[vecino]
+                if costo == INTRANSITABLE:
+                    continue
+                nueva = distancia + costo
+                if nueva < distancias.get(vecino, nueva + 1):
+                    distancias[vecino] = nueva
+                    enlaces[vecino] = celda
+                    heapq.heappush(heap, (nueva, vecino))
+        return distancias, enlaces
+
+    @staticmethod
+    def _tramo(enlaces, desde, hasta):
+        """
+        Celdas de desde (exclusive) a hasta (inclusive) siguiendo enlaces a padre.
+        """
+        tramo = []
+        while hasta != desde:
+            tramo.append(hasta)
+            hasta = enlaces[hasta]
+        tramo.reverse()
+        return tramo
+
+    def _internas(self, cluster):
+        """
+        Aristas internas del cluster; se calculan la primera vez que una consulta lo
+        atraviesa, así que construir el planificador solo recorre los bordes.
+        """
+        internas = self.internas.get(cluster)
+        if internas is None:
+            internas, self._direcciones[cluster] = self._calcular_internas(cluster)
+            self.internas[cluster] = internas
+        return internas
+
+    def _distancias_cluster(self, nodos, rectangulo):
+        """
+        Costos desde cada nodo a todas las celdas del rectángulo, calculados a la vez
+        con numpy: cada barrido relaja filas o columnas completas en una dirección
+        (mínimo acumulado sobre costos acumulados), y se repite hasta que nada cambia.
+
+        Retorna:
+            matriz (nodos x alto x ancho) de costos, con _SIN_CAMINO donde no se llega, y
+            la matriz de costo de entrada de cada celda
+        """
+        x0, y0, x1, y1 = rectangulo
+        malla = np.frombuffer(self.costos, dtype=np.uint16).reshape(self.alto, self.ancho)
+        entrada = malla[y0:y1, x0:x1].astype(np.int64)
+        entrada[entrada == INTRANSITABLE] = _SIN_CAMINO
+        distancias = np.full((len(nodos), y1 - y0, x1 - x0), _SIN_CAMINO, dtype=np.int64)
+        for i, nodo in enumerate(nodos):
+            y, x = divmod(nodo, self.ancho)
+            distancias[i, y - y0, x - x0] = 0
+
+        # Acumulados por fila (eje 2) y por columna (eje 1): hasta la celda inclusive y excluyéndola
+        barridos = []
+        for eje in (2, 1):
+            hasta = np.cumsum(entrada, axis=eje - 1)
+            barridos.append((eje, hasta, hasta - entrada))
+        while True:
+            anterior = distancias.copy()
+            for eje, hasta, antes in barridos:
+                # Avanzando: d[i] = min sobre j <= i de d[j] + costo de entrar a j+1..i
+                distancias = np.minimum(distancias, np.minimum.accumulate(distancias - hasta, axis=eje) + hasta)
+                # Retrocediendo: d[i] = min sobre j >= i de d[j] + costo de entrar a i..j-1
+                invertido = np.flip(distancias + antes, axis=eje)
+                distancias = np.minimum(distancias, np.flip(np.minimum.accumulate(invertido, axis=eje), axis=eje) - antes)
+            np.minimum(distancias, _SIN_CAMINO, out=distancias)
+            if np.array_equal(distancias, anterior):
+                return distancias, entrada
+
+    def _direcciones_cluster(self, distancias, entrada):
+        """
+        Para cada nodo y cada celda alcanzada, el índice en MOVIMIENTOS de la vecina
+        desde la que se llega con costo mínimo (SIN_DIRECCION en el nodo y donde no se llega).
+        """
+        direcciones = np.full(distancias.shape, SIN_DIRECCION, dtype=np.uint8)
+        alcanzadas = (distancias > 0) & (distancias < _SIN_CAMINO)
+        for indice, (dx, dy) in enumerate(MOVIMIENTOS):
+            # Celdas a las que se llega con este movimiento y la vecina de la que vienen
+            celdas = (Ellipsis, _recorte(-dy), _recorte(-dx))
+            vecinas = (Ellipsis, _recorte(dy), _recorte(dx))
+            desde_vecina = alcanzadas[celdas] & (direcciones[celdas] == SIN_DIRECCION) & \
+                (distancias[celdas] == distancias[vecinas] + entrada[celdas[1:]])
+            direcciones[celdas][desde_vecina] = indice
+        return direcciones
+
+    def _calcular_internas(self, cluster):
+        """
+        Costos entre todos los pares de nodos del cluster y, por nodo de origen, la
+        dirección hacia atrás de cada celda para reconstruir los tramos al refinar.
+        """
+        rectangulo = self._rectangulo(cluster)
+        x0, y0, x1, y1 = rectangulo
+        nodos = sorted(self.nodos(cluster))
+        internas = {nodo: {} for nodo in nodos}
+        if len(nodos) < 2:
+            return internas, None
+        distancias, entrada = self._distancias_cluster(nodos, rectangulo)
+        locales = [(nodo // self.ancho - y0, nodo % self.ancho - x0) for nodo in nodos]
+        for i, nodo in enumerate(nodos):
+            for destino, (y, x) in zip(nodos, locales):
+                costo = int(distancias[i, y, x])
+                if destino != nodo and costo < _SIN_CAMINO:
+                    internas[nodo][destino] = costo
+        direcciones = self._direcciones_cluster(distancias, entrada)
+        return internas, {nodo: direcciones[i].tobytes() for i, nodo in enumerate(nodos)}
+
+    def _tramo_interno(self, cluster, origen, destino):
+        """
+        Celdas de origen (exclusive) a destino (inclusive) dentro del cluster.
+        """
+        x0, y0, x1, _ = self._rectangulo(cluster)
+        direcciones = self._direcciones[cluster][origen]
+        tramo = []
+        celda = destino
+        while celda != origen:
+            tramo.append(celda)
+            y, x = divmod(celda, self.ancho)
+            dx, dy = MOVIMIENTOS[direcciones[(y - y0) * (x1 - x0) + x - x0]]
+            celda -= dy * self.ancho + dx
+        tramo.reverse()
+        return tramo
+
+    # --- Modificaciones ---
+
+    def actualizar_celda(self, x, y):
+        """
+        Registra que cambió el costo de la celda (x, y); su cluster se repara en la siguiente consulta.
+        """
+        self._pendientes.add(self.cluster_de(y * self.ancho + x))
+
+    def _reparar(self):
+        recalcular = set()
+        for cluster in self._pendientes:
+            recalcular.add(cluster)
+            for borde in self._bordes(cluster):
+                if self._actualizar_borde(borde):
+                    orientacion, cx, cy = borde
+                    recalcular.add((cx, cy))
+                    recalcular.add((cx + 1, cy) if orientacion == 'h' else (cx, cy + 1))
+        for cluster in recalcular:
+            self.internas.pop(cluster, None)
+            self._direcciones.pop(cluster, None)
+        self._pendientes.clear()
+
+    # --- Consultas ---
+
+    def planificar(self, punto_inicio, punto_fin, peso=1.0):
+        """
+        Busca un camino entre dos puntos con el grafo abstracto y lo refina.
+
+        peso: factor de la heurística del A* abstracto. Con 1 se obtiene el mejor
+            camino del grafo abstracto; valores mayores expanden muchos menos nodos en
+            terrenos de costo variado a cambio de caminos algo más caros (la cota
+            reportada sigue siendo válida).
+
+        Retorna:
+            ResultadoJerarquico
+        """
+        self._reparar()
+        inicio = punto_inicio[1] * self.ancho + punto_inicio[0]
+        fin = punto_fin[1] * self.ancho + punto_fin[0]
+        costo_minimo = costo_minimo_transitable(self.costos)
+        cota_inferior = heuristica(punto_inicio, punto_fin) * costo_minimo
+        if inicio == fin:
+            return ResultadoJerarquico([punto_inicio], 0, 0, 0)
+        if self.costos[inicio] == INTRANSITABLE:
+            return self._planificar_desde_intransitable(punto_inicio, punto_fin, cota_inferior, peso)
+
+        # Conectar el inicio y el fin con las transiciones de sus clusters
+        cluster_inicio, cluster_fin = self.cluster_de(inicio), self.cluster_de(fin)
+        nodos_inicio, nodos_fin = self.nodos(cluster_inicio), self.nodos(cluster_fin)
+        desde_inicio, padres_inicio = self._dijkstra_local(
+            inicio, self._rectangulo(cluster_inicio), nodos_inicio | {fin} if cluster_inicio == cluster_fin else nodos_inicio)
+        hasta_fin, siguientes_fin = self._dijkstra_local(fin, self._rectangulo(cluster_fin), nodos_fin, inverso=True)
+        salidas_inicio = [(nodo, desde_inicio[nodo], _DESDE_INICIO)
+                          for nodo in nodos_inicio if nodo in desde_inicio and nodo != inicio]
+        if cluster_inicio == cluster_fin and fin in desde_inicio:
+            salidas_inicio.append((fin, desde_inicio[fin], _DESDE_INICIO))
+        llegadas_fin = {nodo: hasta_fin[nodo] for nodo in nodos_fin if nodo in hasta_fin}
+
+        def vecinos(nodo):
+            if nodo == inicio:
+                aristas = list(salidas_inicio)
+            else:
+                aristas = [(destino, costo, _INTERNA) for destino, costo
+                           in self._internas(self.cluster_de(nodo)).get(nodo, {}).items()]
+            # El costo de cruzar el borde es el de la celda de destino, leído de la malla al día
+            aristas.extend((destino, self.costos[destino], _ENTRE_CLUSTERS)
+                           for destino in self.entre_clusters.get(nodo, ()))
+            if nodo in llegadas_fin and nodo != fin:
+                aristas.append((fin, llegadas_fin[nodo], _HACIA_FIN))
+            return aristas
+
+        # A* sobre el grafo abstracto
+        costos_g = {inicio: 0}
+        padres = {inicio: None}
+        cerrados = set()
+        heap = [(0, 0, inicio)]  # (costo estimado, -g para desempatar hacia los más avanzados, nodo)
+        expandidos = 0
+        while heap:
+            _, _, nodo = heapq.heappop(heap)
+            if nodo in cerrados:
+                continue
+            if nodo == fin:
+                break
+            cerrados.add(nodo)
+            expandidos += 1
+            for destino, costo, tipo in vecinos(nodo):
+                nuevo_g = costos_g[nodo] + costo
+                if destino not in cerrados and nuevo_g < costos_g.get(destino, nuevo_g + 1):
+                    costos_g[destino] = nuevo_g
+                    padres[destino] = (nodo, tipo)
+                    estimado = heuristica(_posicion(destino, self.ancho), punto_fin) * costo_minimo * peso
+                    heapq.heappush(heap, (nuevo_g + estimado, -nuevo_g, destino))
+        if fin not in costos_g:
+            return ResultadoJerarquico([], None, cota_inferior, expandidos)
+
+        # Refinar: concatenar los tramos de cada arista abstracta
+        tramos = []
+        nodo = fin
+        while padres[nodo] is not None:
+            anterior, tipo = padres[nodo]
+            if tipo == _DESDE_INICIO:
+                tramos.append(self._tramo(padres_inicio, inicio, nodo))
+            elif tipo == _HACIA_FIN:
+                tramo = []
+                celda = anterior
+                while celda != fin:
+                    celda = siguientes_fin[celda]
+                    tramo.append(celda)
+                tramos.append(tramo)
+            elif tipo == _INTERNA:
+                tramos.append(self._tramo_interno(self.cluster_de(anterior), anterior, nodo))
+            else:
+                tramos.append([nodo])
+            nodo = anterior
+        camino = [punto_inicio]
+        for tramo in reversed(tramos):
+            camino.extend(_posicion(celda, self.ancho) for celda in tramo)
+        return ResultadoJerarquico(camino, costos_g[fin], cota_inferior, expandidos)
+
+    def _planificar_desde_intransitable(self, punto_inicio, punto_fin, cota_inferior, peso):
+        """
+        Un inicio intransitable solo puede salir a una vecina transitable, que puede
+        estar en otro cluster: se planifica desde cada una y se queda con la mejor.
+        """
+        x, y = punto_inicio
+        mejor = ResultadoJerarquico([], None, cota_inferior, 0)
+        expandidos = 0
+        for dx, dy in MOVIMIENTOS:
+            vx, vy = x + dx, y + dy
+            if not (0 <= vx < self.ancho and 0 <= vy < self.alto):
+                continue
+            costo_paso = self.costos[vy * self.ancho + vx]
+            if costo_paso == INTRANSITABLE:
+                continue
+            resultado = self.planificar((vx, vy), punto_fin, peso)
+            expandidos += resultado.nodos_expandidos
+            if resultado.costo is not None and (mejor.costo is None or resultado.costo + costo_paso < mejor.costo):
+                mejor = ResultadoJerarquico([punto_inicio] + resultado.camino, resultado.costo + costo_paso,
+                                            cota_inferior, 0)
+        mejor.nodos_expandidos = expandidos
+        return mejor
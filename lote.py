@@ -0,0 +1,196 @@
+# lote.py
+"""
+Resolución de lotes de consultas (inicio, fin, tipo de agente) en paralelo.
+
+Las mallas de costos compiladas de los agentes del lote se copian una sola vez a
+un bloque de memoria compartida; cada proceso del pool se engancha a ese bloque
+al iniciar, así que las tareas solo llevan las coordenadas de sus consultas. Los
+resultados se entregan a medida que se terminan, sin esperar al lote completo.
+
+Uso:
+    python lote.py mapa.txt consultas.csv --salida resultados.csv
+    python lote.py mapa.mapb --aleatorias 5000 --agentes human octopus --procesos 8
+
+Cada fila de consultas.csv es: x_inicio,y_inicio,x_fin,y_fin,tipo_agente
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from busqueda import ALGORITMOS
+from componentes import ComponentesConexas
+from constantes import COSTOS_MOVIMIENTO, INTRANSITABLE
+from Mapa import Mapa, compilar_costos
+
+# Máximo de consultas por tarea; los lotes chicos se reparten en bloques menores
+TAMANO_BLOQUE = 64
+# Bloques por proceso, para que los procesos que terminan antes tomen más trabajo
+BLOQUES_POR_PROCESO = 4
+
+# Estado de cada proceso del pool, armado una vez por _inicializar_proceso
+_memoria = None
+_mallas = {}
+_ancho = 0
+
+
+def _inicializar_proceso(nombre_memoria, ancho, ubicaciones):
+    """
+    Engancha el proceso a la memoria compartida y arma una vista de la malla de cada agente.
+    """
+    global _memoria, _ancho
+    _memoria = SharedMemory(name=nombre_memoria)
+    _ancho = ancho
+    for tipo_agente, (desplazamiento, total) in ubicaciones.items():
+        _mallas[tipo_agente] = _memoria.buf[desplazamiento:desplazamiento + 2 * total].cast('H')
+
+
+def _resolver_bloque(algoritmo, bloque):
+    buscar = ALGORITMOS[algoritmo]
+    resultados = []
+    for indice, punto_inicio, punto_fin, tipo_agente in bloque:
+        resultado = buscar(_mallas[tipo_agente], _ancho, punto_inicio, punto_fin)
+        resultados.append((indice, resultado.camino, resultado.costo))
+    return resultados
+
+
+def resolver_lote(matriz, consultas, algoritmo='a*', procesos=None, tamano_bloque=None):
+    """
+    Resuelve las consultas (punto_inicio, punto_fin, tipo_agente) sobre la matriz de
+    terrenos con un pool de procesos.
+
+    Retorna:
+        generador de (índice de la consulta, camino, costo) en el orden en que se
+        terminan; camino vacío y costo None si no hay camino.
+    """
+    if algoritmo not in ALGORITMOS:
+        raise ValueError(f"algoritmo desconocido: {algoritmo}")
+    consultas = [(tuple(inicio), tuple(fin), tipo) for inicio, fin, tipo in consultas]
+    tipos = sorted({tipo for _, _, tipo in consultas})
+    for tipo in tipos:
+        if tipo not in COSTOS_MOVIMIENTO:
+            raise ValueError(f"tipo de agente desconocido: {tipo}")
+    if not consultas:
+        return iter(())
+    procesos = procesos or os.cpu_count() or 1
+    if tamano_bloque is None:
+        tamano_bloque = max(1, min(TAMANO_BLOQUE, len(consultas) // (procesos * BLOQUES_POR_PROCESO)))
+    return _resolver_en_pool(matriz, consultas, tipos, algoritmo, procesos, tamano_bloque)
+
+
+def _resolver_en_pool(matriz, consultas, tipos, algoritmo, procesos, tamano_bloque):
+    alto, ancho = matriz.shape
+    total = alto * ancho
+    memoria = SharedMemory(create=True, size=2 * total * len(tipos))
+    try:
+        ubicaciones = {}
+        componentes = {}
+        for i, tipo in enumerate(tipos):
+            ubicaciones[tipo] = (2 * total * i, total)
+            costos = compilar_costos(matriz, tipo)
+            destino = np.ndarray(total, dtype=np.uint16, buffer=memoria.buf, offset=2 * total * i)
+            destino[:] = np.frombuffer(costos, dtype=np.uint16)
+            del destino  # La memoria no se puede cerrar mientras queden vistas abiertas
+            componentes[tipo] = ComponentesConexas(costos, ancho)
+
+        # Las consultas con el fin en otra componente se contestan sin pasar por el pool
+        pendientes = []
+        for indice, (inicio, fin, tipo) in enumerate(consultas):
+            if componentes[tipo].conectados(inicio, fin):
+                pendientes.append((indice, inicio, fin, tipo))
+            else:
+                yield indice, [], None
+        if not pendientes:
+            return
+
+        bloques = [pendientes[desde:desde + tamano_bloque] for desde in range(0, len(pendientes), tamano_bloque)]
+        with Pool(procesos, _inicializar_proceso, (memoria.name, ancho, ubicaciones)) as pool:
+            for resultados in pool.imap_unordered(partial(_resolver_bloque, algoritmo), bloques):
+                yield from resultados
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def consultas_aleatorias(matriz, cantidad, agentes, semilla=0):
+    """
+    Genera consultas entre celdas transitables elegidas al azar para cada agente.
+    """
+    generador = random.Random(semilla)
+    ancho = matriz.shape[1]
+    transitables = {}
+    for tipo in agentes:
+        celdas = np.flatnonzero(np.frombuffer(compilar_costos(matriz, tipo), dtype=np.uint16) != INTRANSITABLE)
+        if celdas.size:
+            transitables[tipo] = celdas
+    if not transitables:
+        return []
+    consultas = []
+    for _ in range(cantidad):
+        tipo = generador.choice(list(transitables))
+        inicio, fin = (int(transitables[tipo][generador.randrange(transitables[tipo].size)]) for _ in range(2))
+        consultas.append(((inicio % ancho, inicio // ancho), (fin % ancho, fin // ancho), tipo))
+    return consultas
+
+
+def leer_consultas(nombre_archivo):
+    with open(nombre_archivo, newline='') as archivo:
+        return [((int(fila[0]), int(fila[1])), (int(fila[2]), int(fila[3])), fila[4].strip())
+                for fila in csv.reader(archivo) if fila and not fila[0].startswith('#')]
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Resuelve un lote de consultas en paralelo")
+    parser.add_argument('mapa', help="Mapa .txt, .csv o .mapb")
+    parser.add_argument('consultas', nargs='?', help="CSV con x_inicio,y_inicio,x_fin,y_fin,tipo_agente")
+    parser.add_argument('--aleatorias', type=int, help="Generar esta cantidad de consultas al azar")
+    parser.add_argument('--agentes', nargs='*', default=list(COSTOS_MOVIMIENTO), choices=list(COSTOS_MOVIMIENTO),
+                        help="Agentes de las consultas aleatorias")
+    parser.add_argument('--algoritmo', default='a*', choices=list(ALGORITMOS))
+    parser.add_argument('--procesos', type=int, help="Procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument('--salida', help="CSV donde escribir los resultados a medida que llegan")
+    args = parser.parse_args(argumentos)
+
+    mapa = Mapa(1)
+    if not mapa.cargar_mapa(args.mapa):
+        return 1
+    if args.aleatorias:
+        consultas = consultas_aleatorias(mapa.matriz, args.aleatorias, args.agentes)
+    elif args.consultas:
+        consultas = leer_consultas(args.consultas)
+    else:
+        parser.error("indique un archivo de consultas o --aleatorias")
+
+    salida = open(args.salida, 'w', newline='') if args.salida else None
+    try:
+        escritor = csv.writer(salida) if salida else None
+        if escritor:
+            escritor.writerow(['indice', 'x_inicio', 'y_inicio', 'x_fin', 'y_fin', 'tipo_agente', 'costo', 'pasos'])
+        t0 = time.perf_counter()
+        sin_camino = 0
+        for indice, camino, costo in resolver_lote(mapa.matriz, consultas, args.algoritmo, args.procesos):
+            if costo is None:
+                sin_camino += 1
+            if escritor:
+                (xi, yi), (xf, yf), tipo = consultas[indice]
+                escritor.writerow([indice, xi, yi, xf, yf, tipo, '' if costo is None else costo, len(camino)])
+        transcurrido = time.perf_counter() - t0
+    finally:
+        if salida:
+            salida.close()
+    print(f"{len(consultas)} consultas ({sin_camino} sin camino) en {transcurrido:.2f} s: "
+          f"{len(consultas) / transcurrido if transcurrido else 0:.1f} consultas/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+# pasillos.py
+"""
+Grafo de pasillos: los laberintos se reducen a sus bifurcaciones.
+
+Una celda transitable con exactamente dos vecinas transitables es parte de un
+pasillo: quien entra por un lado solo puede seguir o volver. El resto de las
+celdas transitables (bifurcaciones y callejones sin salida) son los nodos del
+grafo, y cada pasillo es una arista entre los nodos de sus extremos que guarda
+sus celdas interiores y sus costos acumulados. Como se paga la celda de destino,
+recorrer el pasillo de A a B cuesta sus celdas interiores más la celda B.
+
+Las búsquedas sobre el grafo expanden solo nodos, así que en el modo decisión por
+decisión cada paso es una bifurcación sin volver a revisar las celdas de los
+pasillos. Si el inicio o el fin caen dentro de un pasillo se agregan, solo para
+esa consulta, como nodos unidos a los extremos de su pasillo. Al terminar, el
+camino se expande de nuevo a celdas. BFS encuentra un camino con la menor
+cantidad de pasos y A* uno de menor costo, como sus versiones sobre la malla.
+"""
+import heapq
+from array import array
+
+import numpy as np
+
+from arbol import ArbolBusqueda
+from busqueda import (EVENTO_EXPANDIR, EVENTO_DECISION, EVENTO_AGREGAR, EVENTO_OBJETIVO, ALGORITMOS,
+                      ResultadoBusqueda, heuristica, eventos_busqueda, _vecinos, _posicion, _conducir,
+                      _contar_frontera, _terminar_busqueda, _preparar)
+from constantes import INTRANSITABLE
+
+# Pasillo de las celdas que no son parte de ninguno (nodos, intransitables y
+# anillos sin bifurcaciones)
+SIN_PASILLO = -1
+
+# Algoritmos que pueden buscar sobre el grafo de pasillos
+ALGORITMOS_PASILLOS = ('bfs', 'dfs', 'a*')
+
+
+class GrafoPasillos:
+    def __init__(self, costos, ancho):
+        """
+        costos: malla de costos compilada del agente, indexada por y * ancho + x. Se
+        guarda la referencia: si la malla cambia hay que volver a construir el grafo
+        (ver Mapa.grafo_pasillos).
+
+        adyacencia: diccionario nodo -> lista de aristas (vecino, pasillo, desde,
+            hasta, invertido). Las celdas interiores de la arista son
+            pasillos[pasillo][desde:hasta], en orden inverso si `invertido`.
+        """
+        self.costos = costos
+        self.ancho = ancho
+        total = len(costos)
+        transitables = np.frombuffer(costos, dtype=np.uint16).reshape(-1, ancho) != INTRANSITABLE
+        grados = np.zeros(transitables.shape, dtype=np.int8)
+        grados[:, 1:] += transitables[:, :-1]
+        grados[:, :-1] += transitables[:, 1:]
+        grados[1:] += transitables[:-1]
+        grados[:-1] += transitables[1:]
+        nodos = (transitables & (grados != 2)).ravel()
+
+        self.es_nodo = bytearray(nodos.tobytes())
+        self.pasillo_de = array('i', [SIN_PASILLO]) * total
+        self.posicion_en = array('i', bytes(4 * total))  # Posición de la celda dentro de su pasillo
+        self.pasillos = []  # Celdas interiores de cada pasillo, desde su primer extremo
+        self.extremos = []  # (nodo, nodo) de cada pasillo
+        self.prefijos = []  # Costos acumulados de las celdas interiores de cada pasillo
+        self.adyacencia = {nodo: [] for nodo in np.flatnonzero(nodos).tolist()}
+
+        es_nodo = self.es_nodo
+        pasillo_de = self.pasillo_de
+        for nodo in self.adyacencia:
+            for vecino, _ in _vecinos(costos, nodo, ancho):
+                if es_nodo[vecino]:
+                    # Nodos vecinos: pasillo sin celdas interiores, agregado una sola vez
+                    if nodo < vecino:
+                        self._agregar_pasillo(nodo, vecino, [])
+                    continue
+                if pasillo_de[vecino] != SIN_PASILLO:
+                    continue  # Ya recorrido desde su otro extremo
+                celdas = []
+                anterior, actual = nodo, vecino
+                while not es_nodo[actual]:
+                    celdas.append(actual)
+                    (a, _), (b, _) = _vecinos(costos, actual, ancho)
+                    anterior, actual = actual, (b if a == anterior else a)
+                self._agregar_pasillo(nodo, actual, celdas)
+
+    def _agregar_pasillo(self, a, b, celdas):
+        pasillo = len(self.pasillos)
+        prefijos = array('q', [0])
+        for posicion, celda in enumerate(celdas):
+            self.pasillo_de[celda] = pasillo
+            self.posicion_en[celda] = posicion
+            prefijos.append(prefijos[-1] + self.costos[celda])
+        self.pasillos.append(array('i', celdas))
+        self.extremos.append((a, b))
+        self.prefijos.append(prefijos)
+        # Un pasillo que vuelve a su nodo no acorta ningún camino: solo se registran
+        # sus celdas, por si la consulta empieza o termina en él
+        if a != b:
+            self.adyacencia[a].append((b, pasillo, 0, len(celdas), False))
+            self.adyacencia[b].append((a, pasillo, 0, len(celdas), True))
+
+    def __len__(self):
+        return len(self.adyacencia)
+
+    def cantidad_celdas_pasillo(self):
+        return sum(len(celdas) for celdas in self.pasillos)
+
+    def admite(self, punto_inicio, punto_fin):
+        """
+        Indica si la consulta se puede resolver sobre el grafo: el inicio y el fin
+        deben ser nodos o celdas de un pasillo. Un inicio intransitable o una celda
+        de un anillo sin bifurcaciones se buscan sobre la malla.
+        """
+        for x, y in (punto_inicio, punto_fin):
+            celda = y * self.ancho + x
+            if not self.es_nodo[celda] and self.pasillo_de[celda] == SIN_PASILLO:
+                return False
+        return True
+
+    def costo_arista(self, arista):
+        vecino, pasillo, desde, hasta, _ = arista
+        prefijos = self.prefijos[pasillo]
+        return prefijos[hasta] - prefijos[desde] + self.costos[vecino]
+
+    def celdas_arista(self, arista):
+        """
+        Celdas que recorre la arista, sin la de partida y terminando en el vecino.
+        """
+        vecino, pasillo, desde, hasta, invertido = arista
+        celdas = self.pasillos[pasillo][desde:hasta].tolist()
+        if invertido:
+            celdas.reverse()
+        celdas.append(vecino)
+        return celdas
+
+    def aristas_consulta(self, inicio, fin):
+        """
+        Aristas extra de una consulta cuyos extremos (índices de celda) caen dentro de
+        pasillos: del inicio a los extremos de su pasillo, de los extremos del pasillo
+        del fin al fin y, si comparten pasillo, del inicio al fin directamente.
+        """
+        extra = {}
+        if inicio == fin:
+            return extra
+        if not self.es_nodo[inicio]:
+            pasillo, i = self.pasillo_de[inicio], self.posicion_en[inicio]
+            a, b = self.extremos[pasillo]
+            extra[inicio] = [(a, pasillo, 0, i, True), (b, pasillo, i + 1, len(self.pasillos[pasillo]), False)]
+        if not self.es_nodo[fin]:
+            pasillo, j = self.pasillo_de[fin], self.posicion_en[fin]
+            a, b = self.extremos[pasillo]
+            extra.setdefault(a, []).append((fin, pasillo, 0, j, False))
+            extra.setdefault(b, []).append((fin, pasillo, j + 1, len(self.pasillos[pasillo]), True))
+            if self.pasillo_de[inicio] == pasillo:
+                i = self.posicion_en[inicio]
+                arista = (fin, pasillo, i + 1, j, False) if i < j else (fin, pasillo, j + 1, i, True)
+                extra[inicio].append(arista)
+        return extra
+
+    def expandir_camino(self, padres, inicio, fin):
+        """
+        Convierte el camino de nodos (padres: nodo -> (padre, arista)) en la lista de
+        posiciones (x, y) de todas sus celdas.
+        """
+        tramos = []
+        actual = fin
+        while actual != inicio:
+            padre, arista = padres[actual]
+            tramos.append(self.celdas_arista(arista))
+            actual = padre
+        camino = [_posicion(inicio, self.ancho)]
+        for tramo in reversed(tramos):
+            camino.extend(_posicion(celda, self.ancho) for celda in tramo)
+        return camino
+
+
+def _eventos_pasillos(grafo, punto_inicio, punto_fin, algoritmo, emitir=True, estimador=None, estadisticas=None):
+    """
+    Búsqueda sobre el grafo de pasillos como generador de eventos que devuelve el
+    ResultadoBusqueda con el camino expandido a celdas. 'dfs' usa una pila; 'bfs'
+    ordena por pasos y 'a*' por costo más el estimado (por defecto, Manhattan).
+    El árbol de decisiones contiene solo los nodos del grafo.
+    """
+    medir = estadisticas is not None
+    ancho = grafo.ancho
+    if medir:
+        estadisticas.iniciar(len(grafo.costos), ancho)
+    inicio = punto_inicio[1] * ancho + punto_inicio[0]
+    fin = punto_fin[1] * ancho + punto_fin[0]
+    adyacencia = grafo.adyacencia
+    extra = grafo.aristas_consulta(inicio, fin)
+    profundidad = algoritmo == 'dfs'
+    por_pasos = algoritmo == 'bfs'
+
+    padres = {}  # nodo -> (padre, arista por la que se llegó)
+    costos_acumulados = {inicio: 0}
+    prioridades = {inicio: 0}  # Pasos para 'bfs', costo para 'a*'
+    cerrados = {inicio} if profundidad else set()
+    frontera = [(0, inicio)]  # Pila de (0, nodo) o heap de (prioridad estimada, nodo)
+    arbol = ArbolBusqueda(ancho, len(grafo.costos), inicio)
+    if medir:
+        estadisticas.marcar_fase('preparacion')
+
+    while frontera:
+        _, actual = frontera.pop() if profundidad else heapq.heappop(frontera)
+        # Las entradas de nodos ya cerrados se descartan sin contarlas como expansión
+        if not profundidad and actual in cerrados:
+            if medir:
+                estadisticas.descartados += 1
+            continue
+        costo_g = costos_acumulados[actual]
+        if emitir:
+            yield EVENTO_EXPANDIR, _posicion(actual, ancho), costo_g
+
+        if actual == fin:
+            if medir:
+                estadisticas.expandidos += 1
+                estadisticas.expansiones[actual] += 1
+                _terminar_busqueda(estadisticas, estadisticas.agregados + 1 if profundidad else estadisticas.expandidos)
+            if emitir:
+                yield EVENTO_OBJETIVO, punto_fin, costo_g
+            camino = grafo.expandir_camino(padres, inicio, fin)
+            if medir:
+                estadisticas.marcar_fase('camino')
+            return ResultadoBusqueda(camino, costo_g, arbol)
+
+        if not profundidad:
+            cerrados.add(actual)
+        if medir:
+            estadisticas.expandidos += 1
+            estadisticas.expansiones[actual] += 1
+            agregados = 0
+
+        opciones = [arista for arista in adyacencia.get(actual, []) + extra.get(actual, [])
+                    if arista[0] not in cerrados]
+        if emitir and (len(opciones) > 1 or actual == inicio):
+            yield EVENTO_DECISION, _posicion(actual, ancho), costo_g
+
+        for arista in opciones:
+            vecino = arista[0]
+            nuevo_g = costo_g + grafo.costo_arista(arista)
+            if profundidad:
+                if vecino in cerrados:
+                    continue  # Otra arista de esta misma bifurcación ya llegó al vecino
+                cerrados.add(vecino)
+                frontera.append((0, vecino))
+            else:
+                if por_pasos:
+                    prioridad = prioridades[actual] + arista[3] - arista[2] + 1
+                    estimado = 0
+                else:
+                    prioridad = nuevo_g
+                    estimado = heuristica(_posicion(vecino, ancho), punto_fin) if estimador is None else estimador(vecino)
+                if prioridad >= prioridades.get(vecino, prioridad + 1):
+                    continue
+                prioridades[vecino] = prioridad
+                heapq.heappush(frontera, (prioridad + estimado, vecino))
+            costos_acumulados[vecino] = nuevo_g
+            padres[vecino] = (actual, arista)
+            arbol.agregar(vecino, actual)
+            if medir:
+                agregados += 1
+            if emitir:
+                yield EVENTO_AGREGAR, _posicion(vecino, ancho), nuevo_g
+        if medir:
+            _contar_frontera(estadisticas, agregados, len(frontera))
+
+    if medir:
+        _terminar_busqueda(estadisticas, estadisticas.agregados + 1 if profundidad else estadisticas.expandidos)
+    return ResultadoBusqueda([], None, arbol)
+
+
+def buscar_en_pasillos(grafo, algoritmo, punto_inicio, punto_fin, observador=None, estimador=None, estadisticas=None):
+    """
+    Busca con `algoritmo` (uno de ALGORITMOS_PASILLOS) sobre el grafo de pasillos.
+    Mismos parámetros que las funciones de busqueda.py (estimador solo para 'a*').
+    Si el grafo no admite la consulta se busca sobre la malla del grafo.
+
+    Retorna:
+        ResultadoBusqueda
+    """
+    if algoritmo not in ALGORITMOS_PASILLOS:
+        raise ValueError(f"algoritmo no soportado sobre el grafo de pasillos: {algoritmo}")
+    opciones = {'estimador': estimador} if algoritmo == 'a*' else {}
+    if not grafo.admite(punto_inicio, punto_fin):
+        return ALGORITMOS[algoritmo](grafo.costos, grafo.ancho, punto_inicio, punto_fin, observador,
+                                     estadisticas=estadisticas, **opciones)
+    emitir = observador is not None
+    eventos = _eventos_pasillos(grafo, punto_inicio, punto_fin, algoritmo, emitir, estimador, estadisticas)
+    return _conducir(_preparar(eventos, emitir, estadisticas), observador)
+
+
+def eventos_pasillos(grafo, algoritmo, punto_inicio, punto_fin, estimador=None, estadisticas=None):
+    """
+    Versión generadora de `buscar_en_pasillos`, como busqueda.eventos_busqueda:
+    produce los eventos (evento, pos, costo) y devuelve el ResultadoBusqueda.
+    """
+    if algoritmo not in ALGORITMOS_PASILLOS:
+        raise ValueError(f"algoritmo no soportado sobre el grafo de pasillos: {algoritmo}")
+    opciones = {'estimador': estimador} if algoritmo == 'a*' else {}
+    if not grafo.admite(punto_inicio, punto_fin):
+        return eventos_busqueda(algoritmo, grafo.costos, grafo.ancho, punto_inicio, punto_fin,
+                                estadisticas=estadisticas, **opciones)
+    eventos = _eventos_pasillos(grafo, punto_inicio, punto_fin, algoritmo, True, estimador, estadisticas)
+    return _preparar(eventos, True, estadisticas)
@@ -0,0 +1,217 @@
+# registro.py
+"""
+Registro binario de los eventos de una búsqueda.
+
+Un GrabadorEventos es un observador de busqueda.py (o un envoltorio de
+`eventos_busqueda`) que escribe cada evento como un registro de ancho fijo: tipo
+de evento (uint8), índice de la celda y * ancho + x (uint32) y costo (int64). La
+cabecera guarda la versión del mapa y una suma de verificación de la malla de
+costos del agente, para no reproducir un registro sobre un mapa distinto.
+
+El registro se puede leer sin pygame (ver `abrir_registro` y `python registro.py
+archivo.eventos`) o reproducir en GameManager como si fuera la búsqueda original.
+
+Uso:
+    python registro.py busqueda.eventos
+"""
+import argparse
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+from busqueda import EVENTO_EXPANDIR, EVENTO_DECISION, EVENTO_AGREGAR, EVENTO_OBJETIVO
+
+# Formato de los registros (.eventos). Cabecera: firma, versión, tamaño de cada
+# registro, ancho, alto, versión del mapa, CRC-32 de la malla de costos, índices de
+# inicio y fin, algoritmo y tipo de agente, rellenada hasta TAMANO_CABECERA_REGISTRO.
+EXTENSION_REGISTRO = '.eventos'
+FIRMA_REGISTRO = b'SKIBIEVT'
+VERSION_REGISTRO = 1
+FORMATO_CABECERA_REGISTRO = '<8sHHIIQIII8s12s'
+TAMANO_CABECERA_REGISTRO = 64
+FORMATO_EVENTO = '<BIq'
+TIPO_EVENTO = np.dtype([('evento', 'u1'), ('indice', '<u4'), ('costo', '<i8')])
+
+# Código de cada evento en el archivo (la posición en la lista)
+EVENTOS = [EVENTO_EXPANDIR, EVENTO_DECISION, EVENTO_AGREGAR, EVENTO_OBJETIVO]
+CODIGOS_EVENTO = {evento: codigo for codigo, evento in enumerate(EVENTOS)}
+
+# Bytes acumulados en memoria antes de escribirlos al archivo
+TAMANO_BUFFER = 1 << 20
+
+
+class GrabadorEventos:
+    def __init__(self, nombre_archivo, costos, ancho, punto_inicio, punto_fin,
+                 version_mapa=0, algoritmo='', tipo_agente=''):
+        """
+        Abre nombre_archivo para grabar una búsqueda sobre la malla `costos`. El
+        grabador se usa como observador: grabador(evento, pos, costo).
+        """
+        alto = len(costos) // ancho
+        cabecera = struct.pack(FORMATO_CABECERA_REGISTRO, FIRMA_REGISTRO, VERSION_REGISTRO,
+                               struct.calcsize(FORMATO_EVENTO), ancho, alto, version_mapa, zlib.crc32(costos),
+                               punto_inicio[1] * ancho + punto_inicio[0], punto_fin[1] * ancho + punto_fin[0],
+                               algoritmo.encode(), tipo_agente.encode())
+        self.nombre_archivo = nombre_archivo
+        self.ancho = ancho
+        self.cantidad = 0
+        self._archivo = open(nombre_archivo, 'wb')
+        self._archivo.write(cabecera.ljust(TAMANO_CABECERA_REGISTRO, b'\0'))
+        self._buffer = bytearray()
+        self._empacar = struct.Struct(FORMATO_EVENTO).pack
+
+    def __call__(self, evento, pos, costo):
+        self._buffer += self._empacar(CODIGOS_EVENTO[evento], pos[1] * self.ancho + pos[0], costo)
+        if len(self._buffer) >= TAMANO_BUFFER:
+            self._volcar()
+
+    def _volcar(self):
+        self.cantidad += len(self._buffer) // TIPO_EVENTO.itemsize
+        self._archivo.write(self._buffer)
+        self._buffer.clear()
+
+    def cerrar(self):
+        if not self._archivo.closed:
+            self._volcar()
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def grabar_eventos(eventos, grabador):
+    """
+    Envuelve una búsqueda generadora (ver `eventos_busqueda`): produce sus mismos
+    eventos grabándolos y devuelve su resultado. El grabador se cierra al terminar
+    o al descartar la búsqueda.
+    """
+    try:
+        while True:
+            try:
+                evento = next(eventos)
+            except StopIteration as fin:
+                return fin.value
+            grabador(*evento)
+            yield evento
+    finally:
+        grabador.cerrar()
+
+
+class RegistroEventos:
+    def __init__(self, nombre_archivo, cabecera, registros):
+        """
+        registros: arreglo numpy (memoria mapeada) con campos evento, indice y costo.
+        """
+        (_, _, _, self.ancho, self.alto, self.version_mapa, self.suma_costos,
+         inicio, fin, algoritmo, tipo_agente) = cabecera
+        self.nombre_archivo = nombre_archivo
+        self.punto_inicio = (inicio % self.ancho, inicio // self.ancho)
+        self.punto_fin = (fin % self.ancho, fin // self.ancho)
+        self.algoritmo = algoritmo.rstrip(b'\0').decode()
+        self.tipo_agente = tipo_agente.rstrip(b'\0').decode()
+        self.registros = registros
+
+    def __len__(self):
+        return len(self.registros)
+
+    def corresponde(self, costos, ancho):
+        """
+        Indica si el registro se grabó sobre esta malla de costos.
+        """
+        return (self.ancho, self.alto) == (ancho, len(costos) // ancho) and self.suma_costos == zlib.crc32(costos)
+
+    def eventos(self):
+        """
+        Reproduce el registro como una búsqueda generadora: produce cada evento como
+        (evento, pos, costo), igual que `eventos_busqueda`, y devuelve None.
+        """
+        ancho = self.ancho
+        # Se lee por bloques para no convertir a tuplas el registro completo de una vez
+        for desde in range(0, len(self.registros), TAMANO_BUFFER // TIPO_EVENTO.itemsize):
+            bloque = self.registros[desde:desde + TAMANO_BUFFER // TIPO_EVENTO.itemsize]
+            for codigo, indice, costo in zip(bloque['evento'].tolist(), bloque['indice'].tolist(),
+                                             bloque['costo'].tolist()):
+                yield EVENTOS[codigo], (indice % ancho, indice // ancho), costo
+
+    def conteos(self):
+        """
+        Cantidad de eventos de cada tipo.
+        """
+        cuentas = np.bincount(self.registros['evento'], minlength=len(EVENTOS))
+        return {evento: int(cuentas[codigo]) for codigo, evento in enumerate(EVENTOS)}
+
+    def expansiones_por_celda(self):
+        """
+        Matriz (alto x ancho) con las veces que se expandió cada celda.
+        """
+        expandidas = self.registros['indice'][self.registros['evento'] == CODIGOS_EVENTO[EVENTO_EXPANDIR]]
+        return np.bincount(expandidas, minlength=self.ancho * self.alto).reshape(self.alto, self.ancho)
+
+    def costo_objetivo(self):
+        """
+        Costo con que se alcanzó el punto final, o None si la búsqueda no llegó.
+        """
+        objetivos = self.registros['costo'][self.registros['evento'] == CODIGOS_EVENTO[EVENTO_OBJETIVO]]
+        return int(objetivos[-1]) if objetivos.size else None
+
+
+def abrir_registro(nombre_archivo):
+    """
+    Abre un registro de eventos con memoria mapeada. Lanza ValueError si el archivo
+    no es un registro de eventos o está dañado.
+    """
+    with open(nombre_archivo, 'rb') as archivo:
+        datos = archivo.read(TAMANO_CABECERA_REGISTRO)
+    if len(datos) < TAMANO_CABECERA_REGISTRO:
+        raise ValueError("cabecera de registro de eventos incompleta")
+    cabecera = struct.unpack_from(FORMATO_CABECERA_REGISTRO, datos)
+    firma, version, tamano_evento = cabecera[:3]
+    if firma != FIRMA_REGISTRO:
+        raise ValueError("el archivo no es un registro de eventos")
+    if version != VERSION_REGISTRO:
+        raise ValueError(f"versión de registro de eventos no soportada: {version}")
+    if tamano_evento != TIPO_EVENTO.itemsize:
+        raise ValueError(f"tamaño de evento no soportado: {tamano_evento}")
+    cantidad = (os.path.getsize(nombre_archivo) - TAMANO_CABECERA_REGISTRO) // TIPO_EVENTO.itemsize
+    if cantidad == 0:
+        registros = np.zeros(0, dtype=TIPO_EVENTO)
+    else:
+        registros = np.memmap(nombre_archivo, dtype=TIPO_EVENTO, mode='r',
+                              offset=TAMANO_CABECERA_REGISTRO, shape=(cantidad,))
+    if registros['evento'].size and int(registros['evento'].max()) >= len(EVENTOS):
+        raise ValueError("el registro de eventos contiene eventos desconocidos")
+    return RegistroEventos(nombre_archivo, cabecera, registros)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Resume un registro de eventos de búsqueda")
+    parser.add_argument('registro', help=f"Archivo {EXTENSION_REGISTRO}")
+    parser.add_argument('--mas-expandidas', type=int, default=5, help="Cantidad de celdas más expandidas a mostrar")
+    args = parser.parse_args(argumentos)
+
+    try:
+        registro = abrir_registro(args.registro)
+    except (OSError, ValueError) as e:
+        print(f"No se pudo abrir el registro: {e}")
+        return 1
+    print(f"{registro.algoritmo} ({registro.tipo_agente}) de {registro.punto_inicio} a {registro.punto_fin}, "
+          f"mapa {registro.ancho}x{registro.alto} versión {registro.version_mapa}")
+    print(f"{len(registro)} eventos:", ", ".join(f"{evento} {cantidad}" for evento, cantidad in registro.conteos().items()))
+    costo = registro.costo_objetivo()
+    print("Sin camino al objetivo" if costo is None else f"Costo al objetivo: {costo}")
+    expansiones = registro.expansiones_por_celda().ravel()
+    for indice in np.argsort(expansiones)[::-1][:args.mas_expandidas]:
+        if expansiones[indice]:
+            print(f"  celda {(int(indice) % registro.ancho, int(indice) // registro.ancho)}: "
+                  f"{expansiones[indice]} expansiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
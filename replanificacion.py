@@ -0,0 +1,182 @@
+# replanificacion.py
+"""
+Replanificación incremental con D* Lite.
+
+El planificador busca hacia atrás desde el punto final y conserva entre consultas
+los costos g/rhs de cada celda, así que cuando cambia el terreno de unas pocas
+celdas (Mapa.modificar_celda) o se mueve el inicio solo se repara la región
+afectada en lugar de repetir la búsqueda completa. Igual que busqueda.py, no
+depende de pygame y trabaja sobre la malla de costos compilada del agente.
+"""
+from array import array
+import heapq
+
+from busqueda import (ResultadoBusqueda, INFINITO, EVENTO_EXPANDIR, EVENTO_OBJETIVO,
+                      _posicion)
+from constantes import INTRANSITABLE
+
+
+class PlanificadorIncremental:
+    def __init__(self, costos, ancho, punto_inicio, punto_fin):
+        """
+        costos: malla de costos compilada del agente, indexada por y * ancho + x. Se
+        guarda la referencia, así que los cambios hechos en el mismo arreglo (como los
+        de Mapa.modificar_celda sobre Mapa.costos_agente) se ven al repararlos con
+        actualizar_celda.
+        """
+        self.costos = costos
+        self.ancho = ancho
+        self.inicio = punto_inicio[1] * ancho + punto_inicio[0]
+        self._x_inicio, self._y_inicio = punto_inicio
+        self.fin = punto_fin[1] * ancho + punto_fin[0]
+        self.km = 0  # Corrección de las claves por los movimientos del inicio
+        self.expandidos = 0  # Nodos expandidos en la última planificación
+
+        total = len(costos)
+        self.g = array('q', [INFINITO]) * total
+        self.rhs = array('q', [INFINITO]) * total
+        self.rhs[self.fin] = 0
+
+        # Cola de prioridad con borrado perezoso: una entrada es válida solo si su
+        # clave coincide con la registrada en self._claves para esa celda
+        self._claves = {}
+        self._cola = []
+        self._encolar(self.fin)
+
+    @property
+    def punto_inicio(self):
+        return _posicion(self.inicio, self.ancho)
+
+    @property
+    def punto_fin(self):
+        return _posicion(self.fin, self.ancho)
+
+    def _heuristica(self, a, b):
+        # Distancia de Manhattan entre dos índices; admisible porque todo paso cuesta al menos 1
+        ya, xa = divmod(a, self.ancho)
+        yb, xb = divmod(b, self.ancho)
+        return abs(xa - xb) + abs(ya - yb)
+
+    def _vecinos(self, indice):
+        ancho = self.ancho
+        x = indice % ancho
+        vecinos = []
+        if x > 0:
+            vecinos.append(indice - 1)
+        if x < ancho - 1:
+            vecinos.append(indice + 1)
+        if indice >= ancho:
+            vecinos.append(indice - ancho)
+        if indice + ancho < len(self.costos):
+            vecinos.append(indice + ancho)
+        return vecinos
+
+    def _clave(self, indice):
+        minimo = min(self.g[indice], self.rhs[indice])
+        y, x = divmod(indice, self.ancho)
+        return (minimo + abs(x - self._x_inicio) + abs(y - self._y_inicio) + self.km, minimo)
+
+    def _encolar(self, indice):
+        clave = self._clave(indice)
+        self._claves[indice] = clave
+        heapq.heappush(self._cola, (clave, indice))
+
+    def _actualizar_vertice(self, indice):
+        """
+        Recalcula rhs de la celda (mejor costo de entrar a un vecino más su g) y la
+        encola si quedó inconsistente.
+        """
+        costos, g, rhs = self.costos, self.g, self.rhs
+        if indice != self.fin:
+            mejor = INFINITO
+            for vecino in self._vecinos(indice):
+                costo = costos[vecino]
+                if costo != INTRANSITABLE and costo + g[vecino] < mejor:
+                    mejor = costo + g[vecino]
+            rhs[indice] = mejor
+        if g[indice] != rhs[indice]:
+            self._encolar(indice)
+        else:
+            self._claves.pop(indice, None)
+
+    def _predecesores(self, indice):
+        """
+        Celdas desde las que se puede entrar a `indice` (todas sus vecinas si es transitable).
+        """
+        if self.costos[indice] == INTRANSITABLE:
+            return ()
+        return self._vecinos(indice)
+
+    def _calcular(self, observador=None):
+        cola, claves = self._cola, self._claves
+        g, rhs = self.g, self.rhs
+        self.expandidos = 0
+        while cola:
+            clave_anterior, actual = cola[0]
+            if claves.get(actual) != clave_anterior:
+                heapq.heappop(cola)  # Entrada obsoleta
+                continue
+            if clave_anterior >= self._clave(self.inicio) and rhs[self.inicio] <= g[self.inicio]:
+                break
+            heapq.heappop(cola)
+            self.expandidos += 1
+            if observador is not None:
+                observador(EVENTO_EXPANDIR, _posicion(actual, self.ancho), min(g[actual], rhs[actual]))
+
+            clave_nueva = self._clave(actual)
+            if clave_anterior < clave_nueva:
+                self._encolar(actual)
+            elif g[actual] > rhs[actual]:
+                g[actual] = rhs[actual]
+                del claves[actual]
+                for predecesor in self._predecesores(actual):
+                    self._actualizar_vertice(predecesor)
+            else:
+                g[actual] = INFINITO
+                self._actualizar_vertice(actual)
+                for predecesor in self._predecesores(actual):
+                    self._actualizar_vertice(predecesor)
+
+    def mover_inicio(self, punto_inicio):
+        """
+        Cambia el punto de inicio (por ejemplo, cuando el agente avanza) sin perder el trabajo hecho.
+        """
+        nuevo = punto_inicio[1] * self.ancho + punto_inicio[0]
+        self.km += self._heuristica(self.inicio, nuevo)
+        self.inicio = nuevo
+        self._x_inicio, self._y_inicio = punto_inicio
+
+    def actualizar_celda(self, x, y):
+        """
+        Registra que cambió el costo de entrar a la celda (x, y). La reparación se hace
+        en la siguiente llamada a planificar.
+        """
+        for vecino in self._vecinos(y * self.ancho + x):
+            self._actualizar_vertice(vecino)
+
+    def planificar(self, observador=None):
+        """
+        Repara lo necesario y devuelve el camino actual como ResultadoBusqueda (sin
+        árbol de decisiones). El observador opcional recibe las expansiones.
+        """
+        self._calcular(observador)
+        costo = self.rhs[self.inicio]
+        if costo == INFINITO:
+            return ResultadoBusqueda([], None, None)
+        if observador is not None:
+            observador(EVENTO_OBJETIVO, self.punto_fin, costo)
+
+        # Seguir desde el inicio al vecino con menor costo de entrada más g
+        camino = [_posicion(self.inicio, self.ancho)]
+        actual = self.inicio
+        while actual != self.fin and len(camino) <= len(self.costos):
+            mejor, siguiente = INFINITO, None
+            for vecino in self._vecinos(actual):
+                costo_vecino = self.costos[vecino]
+                if costo_vecino != INTRANSITABLE and costo_vecino + self.g[vecino] < mejor:
+                    mejor, siguiente = costo_vecino + self.g[vecino], vecino
+            if siguiente is None:
+                return ResultadoBusqueda([], None, None)
+            actual = siguiente
+            camino.append(_posicion(actual, self.ancho))
+        return ResultadoBusqueda(camino, costo, None)
@@ -0,0 +1,10 @@
+# conftest.py
+"""
+Los módulos del juego están en la raíz del repositorio (sin paquete): se agregan
+al path para importarlos desde las pruebas.
+"""
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
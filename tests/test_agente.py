@@ -0,0 +1,72 @@
+# test_agente.py
+"""
+Conocimiento del agente en banderas por celda: la vista conocimiento[y][x], las
+marcas, y el cambio de mapa (que conserva lo conocido al crecer y no se sale de la
+malla de costos al achicarse).
+"""
+import numpy as np
+
+from Agente import Agente, VISIBLE, VISITADO, INICIO, DECISION
+
+
+def matriz(filas):
+    return np.array(filas, dtype=np.uint8)
+
+
+def test_vista_de_conocimiento():
+    agente = Agente(0, 0, 10, matriz([[1, 1, 2], [1, 0, 3]]), 'human')
+    assert len(agente.conocimiento) == 2 and len(agente.conocimiento[0]) == 3
+    assert agente.conocimiento[0][0] == {"visibilidad": 0, "recorrido": {"Inicio"}}
+
+    agente.mover(1, 0)
+    assert (agente.pos_x, agente.pos_y, agente.costo_acumulado) == (1, 0, 1)
+    assert agente.conocimiento[0][1] == {"visibilidad": 1, "recorrido": {"Visitado", "earth"}}
+    agente.mover(1, 0)
+    assert agente.conocimiento[0][-1]["recorrido"] == {"Visitado", "water"}
+    assert agente.costo_acumulado == 3
+
+    # La montaña es intransitable para el humano: no se mueve ni se marca
+    agente.mover(-1, 1)
+    agente.mover(0, 1)
+    agente.mover(-1, 0)
+    assert (agente.pos_x, agente.pos_y) == (2, 1) and agente.costo_acumulado == 6
+    assert agente.conocimiento[1][1] == {"visibilidad": 0, "recorrido": set()}
+
+    agente.marcar(0, 1, DECISION)
+    assert agente.tiene(0, 1, DECISION) and not agente.tiene(0, 1, VISITADO)
+    agente.conocimiento[1][0] = {"visibilidad": 1, "recorrido": {"Inicio", "sand"}}
+    assert agente.tiene(0, 1, VISIBLE | INICIO) and not agente.tiene(0, 1, DECISION)
+    assert agente.conocimiento[1][0]["recorrido"] == {"Inicio", "sand"}
+
+
+def test_crecer_el_mapa_conserva_el_conocimiento():
+    agente = Agente(0, 0, 10, matriz([[1, 1], [1, 1]]), 'human')
+    agente.mover(1, 0)
+    agente.mover(0, 1)
+    antes = [[agente.info_celda(x, y) for x in range(2)] for y in range(2)]
+
+    agente.actualizar_mapa(matriz([[1] * 4] * 3))
+    assert (agente.alto, agente.ancho) == (3, 4)
+    assert [[agente.info_celda(x, y) for x in range(2)] for y in range(2)] == antes
+    assert not any(agente.tiene(x, y, VISIBLE) for y in range(3) for x in range(2, 4))
+    agente.mover(1, 0)
+    assert agente.conocimiento[1][2]["recorrido"] == {"Visitado", "earth"}
+
+
+def test_achicar_el_mapa_usa_el_ancho_del_mapa_en_los_costos():
+    agente = Agente(0, 0, 10, matriz([[1] * 6] * 4), 'human')
+    agente.mover(1, 0)
+
+    # El conocimiento queda con el ancho anterior (6), pero los costos con el nuevo (3)
+    agente.actualizar_mapa(matriz([[1, 1, 1], [1, 1, 1], [0, 1, 1]]))
+    assert agente.ancho == 6 and len(agente.costos) == 9
+    agente.teletransportar(0, 1)
+    agente.mover(0, 1)
+    assert (agente.pos_x, agente.pos_y) == (0, 1)
+
+    for dx, dy in ((1, 0), (1, 0), (0, 1), (1, 0), (-1, 0), (-1, 0)):
+        agente.mover(dx, dy)
+    assert (agente.pos_x, agente.pos_y) == (1, 2)
+    assert agente.costo_acumulado == 1 + 4
+    assert agente.conocimiento[2][2]["recorrido"] == {"Visitado", "earth"}
+    assert agente.tiene(1, 0, VISITADO)
@@ -0,0 +1,90 @@
+# test_arbol.py
+"""
+Árbol de decisiones compacto: estructura en arreglos planos, conversión perezosa a
+anytree y exportaciones a DOT y JSON con límite de nodos.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from arbol import SIN_PADRE, ArbolBusqueda
+from busqueda import bfs
+from utilidades import mapa_aleatorio
+
+
+def arbol_de_ejemplo():
+    # Malla de 3 x 3: (0, 0) -> (1, 0) -> (2, 0) y (1, 0) -> (1, 1) -> (1, 2)
+    arbol = ArbolBusqueda(3, 9, 0)
+    arbol.agregar(1, 0)
+    arbol.agregar(2, 1)
+    arbol.agregar(4, 1)
+    arbol.agregar(7, 4)
+    return arbol
+
+
+def test_estructura():
+    arbol = arbol_de_ejemplo()
+    assert len(arbol) == 5
+    assert list(arbol.padres) == [SIN_PADRE, 0, 1, 1, 3]
+    assert list(arbol.profundidades) == [0, 1, 2, 2, 3]
+    assert [arbol.posicion(nodo) for nodo in range(5)] == [(0, 0), (1, 0), (2, 0), (1, 1), (1, 2)]
+
+    # Una celda agregada de nuevo cuelga a sus hijos del último nodo creado
+    assert arbol.agregar(1, 4) == 5
+    assert arbol.agregar(2, 1) == 6 and arbol.padres[6] == 5 and arbol.profundidades[6] == 4
+
+    antes = arbol.nbytes
+    arbol.cerrar()
+    assert arbol.nbytes == antes - 9 * 4 == 3 * 4 * len(arbol)
+
+
+def test_anytree_perezoso():
+    pytest.importorskip("anytree")
+    arbol = arbol_de_ejemplo()
+    raiz = arbol.raiz
+    assert arbol.raiz is raiz
+    assert raiz.name == "Punto: (0, 0)"
+    assert sorted(nodo.name for nodo in raiz.descendants) == [
+        "Punto: (1, 0)", "Punto: (1, 1)", "Punto: (1, 2)", "Punto: (2, 0)"]
+
+    # Truncado: no reemplaza al árbol completo guardado
+    parcial = arbol.a_anytree(max_nodos=2)
+    assert len(parcial.descendants) == 1 and arbol.raiz is raiz
+    # Agregar un nodo invalida el árbol guardado
+    arbol.agregar(8, 2)
+    assert arbol.raiz is not raiz and len(arbol.raiz.descendants) == 5
+
+
+def test_imprimir_truncado(capsys):
+    pytest.importorskip("anytree")
+    arbol_de_ejemplo().imprimir(max_nodos=3)
+    salida = capsys.readouterr().out.splitlines()
+    assert len(salida) == 4 and salida[-1] == "... (2 nodos más)"
+
+
+def test_exportar(tmp_path):
+    arbol = arbol_de_ejemplo()
+    assert arbol.exportar_dot(str(tmp_path / "arbol.dot")) == 5
+    dot = (tmp_path / "arbol.dot").read_text()
+    assert dot.startswith("digraph arbol {") and dot.count("->") == 4 and 'n4 [label="(1, 2)"]' in dot
+
+    assert arbol.exportar_json(str(tmp_path / "arbol.json"), max_nodos=3) == 3
+    datos = json.loads((tmp_path / "arbol.json").read_text())
+    assert datos["total_nodos"] == 5 and datos["truncado"]
+    assert datos["nodos"][2] == {"id": 2, "padre": 1, "x": 2, "y": 0, "profundidad": 2}
+
+
+def test_arbol_de_una_busqueda_contiene_el_camino():
+    mapa = mapa_aleatorio(np.random.default_rng(0), 12, 12, proporcion_muros=0.1)
+    costos = mapa.costos_agente('human')
+    resultado = bfs(costos, 12, (0, 0), (11, 11))
+    assert resultado.costo is not None
+    arbol = resultado.arbol
+    # Subiendo por los padres desde el último nodo del fin se recorre el camino al revés
+    nodo = max(n for n in range(len(arbol)) if arbol.posicion(n) == (11, 11))
+    camino = []
+    while nodo != SIN_PADRE:
+        camino.append(arbol.posicion(nodo))
+        nodo = arbol.padres[nodo]
+    assert camino[::-1] == resultado.camino
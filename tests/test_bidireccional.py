@@ -0,0 +1,35 @@
+# test_bidireccional.py
+"""
+Búsquedas bidireccionales contra sus versiones de un solo sentido: el criterio de
+parada debe dar un camino con tantos pasos como `bfs` y tan barato como `astar`.
+"""
+import numpy as np
+import pytest
+
+from busqueda import bfs, astar, bfs_bidireccional, astar_bidireccional
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio, costo_camino
+
+
+@pytest.mark.parametrize('semilla', range(30))
+def test_bidireccionales_coinciden_con_un_sentido(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(1, 25)), int(rng.integers(1, 25)))
+    ancho = mapa.matriz.shape[1]
+    for tipo in AGENTES:
+        costos = mapa.costos_agente(tipo)
+        for _ in range(10):
+            inicio, fin = punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+            anchura, mejor = bfs(costos, ancho, inicio, fin), astar(costos, ancho, inicio, fin)
+
+            resultado = bfs_bidireccional(costos, ancho, inicio, fin)
+            assert (resultado.costo is None) == (anchura.costo is None)
+            if resultado.costo is not None:
+                assert len(resultado.camino) == len(anchura.camino)
+                assert costo_camino(costos, ancho, resultado.camino, inicio, fin) == resultado.costo
+
+            resultado = astar_bidireccional(costos, ancho, inicio, fin)
+            assert resultado.costo == mejor.costo
+            if resultado.costo is not None:
+                assert costo_camino(costos, ancho, resultado.camino, inicio, fin) == resultado.costo
+                # El árbol de decisiones contiene el camino completo
+                assert len(resultado.arbol) >= len(resultado.camino)
@@ -0,0 +1,99 @@
+# test_busqueda.py
+"""
+Búsquedas sobre arreglos planos contra referencias simples: A* da el costo de
+Dijkstra, BFS la menor cantidad de pasos y DFS un camino válido, y todas coinciden
+en cuándo no hay camino.
+"""
+import heapq
+from collections import deque
+
+import numpy as np
+import pytest
+
+from busqueda import INFINITO, astar, bfs, dfs, heuristica_escalada
+from constantes import INTRANSITABLE
+from utilidades import AGENTES, costo_camino, mapa_aleatorio, punto_aleatorio
+
+
+def vecinas(costos, ancho, indice):
+    x = indice % ancho
+    for vecino, valido in ((indice - 1, x > 0), (indice + 1, x < ancho - 1),
+                           (indice - ancho, indice >= ancho), (indice + ancho, indice + ancho < len(costos))):
+        if valido and costos[vecino] != INTRANSITABLE:
+            yield vecino
+
+
+def dijkstra_referencia(costos, ancho, inicio):
+    distancias = [INFINITO] * len(costos)
+    distancias[inicio] = 0
+    heap = [(0, inicio)]
+    while heap:
+        distancia, actual = heapq.heappop(heap)
+        if distancia > distancias[actual]:
+            continue
+        for vecino in vecinas(costos, ancho, actual):
+            if distancia + costos[vecino] < distancias[vecino]:
+                distancias[vecino] = distancia + costos[vecino]
+                heapq.heappush(heap, (distancias[vecino], vecino))
+    return distancias
+
+
+def pasos_referencia(costos, ancho, inicio):
+    pasos = [None] * len(costos)
+    pasos[inicio] = 0
+    cola = deque([inicio])
+    while cola:
+        actual = cola.popleft()
+        for vecino in vecinas(costos, ancho, actual):
+            if pasos[vecino] is None:
+                pasos[vecino] = pasos[actual] + 1
+                cola.append(vecino)
+    return pasos
+
+
+@pytest.mark.parametrize("semilla", range(30))
+def test_busquedas_contra_referencias(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(1, 25)), int(rng.integers(1, 25)))
+    ancho = mapa.matriz.shape[1]
+    for tipo in AGENTES:
+        costos = mapa.costos_agente(tipo)
+        for _ in range(5):
+            inicio, fin = punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+            indice_inicio, indice_fin = inicio[1] * ancho + inicio[0], fin[1] * ancho + fin[0]
+            distancia = dijkstra_referencia(costos, ancho, indice_inicio)[indice_fin]
+            pasos = pasos_referencia(costos, ancho, indice_inicio)[indice_fin]
+            alcanzable = distancia != INFINITO
+
+            for resultado in (astar(costos, ancho, inicio, fin),
+                              astar(costos, ancho, inicio, fin, estimador=heuristica_escalada(costos, ancho, fin))):
+                assert resultado.costo == (distancia if alcanzable else None)
+            anchura = bfs(costos, ancho, inicio, fin)
+            profundidad = dfs(costos, ancho, inicio, fin)
+            for resultado in (anchura, profundidad):
+                assert (resultado.costo is not None) == alcanzable
+                if not alcanzable:
+                    assert resultado.camino == []
+                    continue
+                assert costo_camino(costos, ancho, resultado.camino, inicio, fin) == resultado.costo
+                assert resultado.costo >= distancia
+            if alcanzable:
+                assert len(anchura.camino) == pasos + 1
+
+
+def test_inicio_igual_al_fin():
+    mapa = mapa_aleatorio(np.random.default_rng(0), 4, 4, proporcion_muros=0)
+    costos = mapa.costos_agente('human')
+    for algoritmo in (bfs, dfs, astar):
+        resultado = algoritmo(costos, 4, (2, 1), (2, 1))
+        assert resultado.camino == [(2, 1)] and resultado.costo == 0
+
+
+def test_fin_encerrado():
+    mapa = mapa_aleatorio(np.random.default_rng(0), 5, 5, proporcion_muros=0)
+    for x, y in ((1, 2), (3, 2), (2, 1), (2, 3)):
+        mapa.modificar_celda(x, y, 0)
+    costos = mapa.costos_agente('human')
+    for algoritmo in (bfs, dfs, astar):
+        resultado = algoritmo(costos, 5, (0, 0), (2, 2))
+        assert resultado.camino == [] and resultado.costo is None
@@ -0,0 +1,81 @@
+# test_cache_rutas.py
+"""
+Caché de rutas: desalojo LRU por cantidad de entradas y por bytes, claves por
+versión del mapa y el tamaño de los resultados guardados.
+"""
+import numpy as np
+import pytest
+
+from busqueda import astar
+from cache_rutas import CacheRutas, tamano_ruta, BYTES_POR_PASO
+from utilidades import mapa_aleatorio
+
+
+def test_desalojo_por_cantidad():
+    cache = CacheRutas(capacidad=3)
+    for clave in "abc":
+        cache.guardar(clave, clave.upper())
+    assert cache.obtener("a") == "A"  # 'b' pasa a ser la menos usada
+    cache.guardar("d", "D")
+    assert len(cache) == 3
+    assert cache.obtener("b") is None
+    assert [cache.obtener(clave) for clave in "acd"] == ["A", "C", "D"]
+    assert (cache.aciertos, cache.fallos) == (4, 1)
+
+    cache.guardar("c", "C2")  # Reemplazar no desaloja
+    assert len(cache) == 3 and cache.obtener("c") == "C2"
+
+
+def test_desalojo_por_bytes():
+    cache = CacheRutas(capacidad=100, bytes_maximos=10, tamano=len)
+    cache.guardar("a", "xxxx")
+    cache.guardar("b", "xxxx")
+    assert cache.bytes_usados == 8
+    cache.obtener("a")
+    cache.guardar("c", "xxx")  # 11 bytes: sale 'b', la menos usada
+    assert cache.bytes_usados == 7
+    assert cache.obtener("b") is None and cache.obtener("a") == "xxxx"
+
+    cache.guardar("a", "x")  # Reemplazar descuenta el tamaño anterior
+    assert cache.bytes_usados == 4
+    cache.guardar("d", "x" * 11)  # Más grande que el máximo: no se guarda
+    assert cache.obtener("d") is None and cache.bytes_usados <= 10
+
+    cache.limpiar()
+    assert len(cache) == 0 and cache.bytes_usados == 0
+    assert cache.estadisticas()['bytes_maximos'] == 10
+
+
+def test_bytes_maximos_requiere_tamano():
+    with pytest.raises(ValueError):
+        CacheRutas(bytes_maximos=100)
+
+
+def test_buscar_por_version_del_mapa():
+    mapa = mapa_aleatorio(np.random.default_rng(0), 8, 8, proporcion_muros=0)
+    cache = CacheRutas()
+    calculos = []
+
+    def calcular():
+        calculos.append(mapa.version)
+        return mapa.version
+
+    for _ in range(2):
+        assert cache.buscar(mapa, 'human', 'a*', (0, 0), [7, 7], calcular) == mapa.version
+    assert len(calculos) == 1
+    mapa.modificar_celda(3, 3, 1)
+    cache.buscar(mapa, 'human', 'a*', (0, 0), (7, 7), calcular)
+    cache.buscar(mapa, 'human', 'bfs', (0, 0), (7, 7), calcular)
+    assert len(calculos) == 3
+
+
+def test_tamano_ruta_con_el_arbol_cerrado():
+    mapa = mapa_aleatorio(np.random.default_rng(1), 30, 30, proporcion_muros=0)
+    costos = mapa.costos_agente('human')
+    resultado = astar(costos, 30, (0, 0), (29, 29))
+    arbol = resultado.arbol
+    # ResultadoBusqueda cierra el árbol: ya no cuenta el índice de 4 bytes por celda
+    assert arbol._nodo_de_celda is None
+    assert arbol.nbytes == 3 * 4 * len(arbol)
+    assert tamano_ruta((resultado.camino, arbol)) == len(resultado.camino) * BYTES_POR_PASO + arbol.nbytes
+    assert tamano_ruta((resultado.camino, None)) == len(resultado.camino) * BYTES_POR_PASO
@@ -0,0 +1,72 @@
+# test_componentes.py
+"""
+Componentes conexas contra un etiquetado de referencia por búsqueda en anchura,
+al construirlas y tras cada edición incremental (uniones, separaciones y la
+comprobación del anillo de ocho celdas).
+"""
+from collections import deque
+
+import numpy as np
+import pytest
+
+import componentes as componentes_modulo
+from busqueda import bfs
+from componentes import SIN_COMPONENTE
+from constantes import INTRANSITABLE
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio, editar_al_azar
+
+
+def etiquetas_referencia(costos, ancho):
+    etiquetas = [SIN_COMPONENTE] * len(costos)
+    cantidad = 0
+    for semilla in range(len(costos)):
+        if costos[semilla] == INTRANSITABLE or etiquetas[semilla] != SIN_COMPONENTE:
+            continue
+        etiquetas[semilla] = cantidad
+        cola = deque([semilla])
+        while cola:
+            actual = cola.popleft()
+            x = actual % ancho
+            for vecino, valido in ((actual - 1, x > 0), (actual + 1, x < ancho - 1),
+                                   (actual - ancho, actual >= ancho), (actual + ancho, actual + ancho < len(costos))):
+                if valido and costos[vecino] != INTRANSITABLE and etiquetas[vecino] == SIN_COMPONENTE:
+                    etiquetas[vecino] = cantidad
+                    cola.append(vecino)
+        cantidad += 1
+    return np.array(etiquetas), cantidad
+
+
+def verificar(componentes, costos, ancho):
+    referencia, cantidad = etiquetas_referencia(costos, ancho)
+    etiquetas = np.asarray(componentes.etiquetas)
+    assert np.array_equal(etiquetas == SIN_COMPONENTE, referencia == SIN_COMPONENTE)
+    # Misma partición: cada etiqueta corresponde a exactamente una de la referencia
+    pares = set(zip(etiquetas[referencia != SIN_COMPONENTE].tolist(), referencia[referencia != SIN_COMPONENTE].tolist()))
+    assert len(pares) == len({a for a, _ in pares}) == len({b for _, b in pares}) == cantidad
+    assert len(componentes) == cantidad
+    tamanos = np.bincount(referencia[referencia != SIN_COMPONENTE], minlength=cantidad)
+    assert sorted(componentes.tamanos.values()) == sorted(tamanos.tolist())
+
+
+@pytest.mark.parametrize('celdas_por_recorrida', [1, 10 ** 9])
+@pytest.mark.parametrize('semilla', range(25))
+def test_componentes_tras_ediciones(semilla, celdas_por_recorrida, monkeypatch):
+    # Las uniones reetiquetan recorriendo la componente menor (1) o con una máscara (10 ** 9)
+    monkeypatch.setattr(componentes_modulo, 'CELDAS_POR_RECORRIDA', celdas_por_recorrida)
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(1, 25)), int(rng.integers(1, 25)), rng.random() * 0.7)
+    ancho = mapa.matriz.shape[1]
+    for tipo in AGENTES:
+        verificar(mapa.componentes_agente(tipo), mapa.costos_agente(tipo), ancho)
+
+    for _ in range(40):
+        revisiones = {tipo: mapa.componentes_agente(tipo).revision for tipo in AGENTES}
+        etiquetas = {tipo: np.array(mapa.componentes_agente(tipo).etiquetas) for tipo in AGENTES}
+        editar_al_azar(rng, mapa)
+        for tipo in AGENTES:
+            componentes, costos = mapa.componentes_agente(tipo), mapa.costos_agente(tipo)
+            verificar(componentes, costos, ancho)
+            if not np.array_equal(etiquetas[tipo], componentes.etiquetas):
+                assert componentes.revision > revisiones[tipo]
+            inicio, fin = punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+            assert componentes.conectados(inicio, fin) == (bfs(costos, ancho, inicio, fin).costo is not None)
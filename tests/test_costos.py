@@ -0,0 +1,48 @@
+# test_costos.py
+"""
+Mallas de costos compiladas: coinciden con COSTOS_MOVIMIENTO celda por celda, se
+compilan una vez por mapa y agente y siguen al día tras editar o cargar el mapa.
+"""
+import numpy as np
+import pytest
+
+from constantes import COSTOS_MOVIMIENTO, INTRANSITABLE, TERRENOS
+from Mapa import Mapa, compilar_costos, serializar_mapa
+from utilidades import editar_al_azar, mapa_aleatorio
+
+
+@pytest.mark.parametrize("tipo", sorted(COSTOS_MOVIMIENTO))
+def test_compilar_costos_segun_la_tabla(tipo):
+    # Todos los códigos, incluidos los que no son terrenos conocidos
+    matriz = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    costos = compilar_costos(matriz, tipo)
+    assert costos.typecode == 'H' and len(costos) == 256
+    for codigo in range(256):
+        esperado = COSTOS_MOVIMIENTO[tipo].get(TERRENOS.get(codigo))
+        assert costos[codigo] == (INTRANSITABLE if esperado is None else esperado)
+
+
+@pytest.mark.parametrize("semilla", range(10))
+def test_costos_agente_al_dia_tras_editar(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(1, 20)), int(rng.integers(1, 20)))
+    compiladas = {tipo: mapa.costos_agente(tipo) for tipo in COSTOS_MOVIMIENTO}
+    for _ in range(20):
+        editar_al_azar(rng, mapa)
+        for tipo, costos in compiladas.items():
+            # Se edita la misma malla, no se vuelve a compilar
+            assert mapa.costos_agente(tipo) is costos
+            assert costos == compilar_costos(mapa.matriz, tipo)
+
+
+def test_cargar_vuelve_a_compilar(tmp_path):
+    rng = np.random.default_rng(0)
+    mapa = mapa_aleatorio(rng, 6, 6)
+    anteriores = mapa.costos_agente('human')
+    otra = rng.integers(0, 10, size=(4, 9)).astype(np.uint8)
+    (tmp_path / "otro.csv").write_bytes(serializar_mapa(otra))
+    version = mapa.version
+    assert mapa.cargar_mapa(str(tmp_path / "otro.csv"))
+    assert mapa.version > version
+    costos = mapa.costos_agente('human')
+    assert costos is not anteriores and costos == compilar_costos(otra, 'human')
@@ -0,0 +1,48 @@
+# test_estadisticas.py
+"""
+Los eventos de expansión y EstadisticasBusqueda cuentan lo mismo: las entradas
+viejas que se sacan de la frontera se descartan sin emitir un evento de expansión.
+"""
+import numpy as np
+import pytest
+
+from busqueda import ALGORITMOS, EVENTO_EXPANDIR, EstadisticasBusqueda
+from pasillos import ALGORITMOS_PASILLOS, GrafoPasillos, buscar_en_pasillos
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio
+
+
+class ContadorExpansiones:
+    def __init__(self):
+        self.expandidos = 0
+
+    def __call__(self, evento, pos, costo):
+        if evento == EVENTO_EXPANDIR:
+            self.expandidos += 1
+
+
+def caso_aleatorio(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(5, 25)), int(rng.integers(5, 25)))
+    costos = mapa.costos_agente(AGENTES[semilla % len(AGENTES)])
+    return costos, mapa.matriz.shape[1], punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+
+
+@pytest.mark.parametrize("semilla", range(30))
+@pytest.mark.parametrize("algoritmo", sorted(ALGORITMOS))
+def test_eventos_de_expansion_coinciden_con_estadisticas(semilla, algoritmo):
+    costos, ancho, inicio, fin = caso_aleatorio(semilla)
+    contador = ContadorExpansiones()
+    estadisticas = EstadisticasBusqueda()
+    ALGORITMOS[algoritmo](costos, ancho, inicio, fin, contador, estadisticas=estadisticas)
+    assert contador.expandidos == estadisticas.expandidos
+
+
+@pytest.mark.parametrize("semilla", range(30))
+@pytest.mark.parametrize("algoritmo", ALGORITMOS_PASILLOS)
+def test_eventos_de_expansion_en_pasillos(semilla, algoritmo):
+    costos, ancho, inicio, fin = caso_aleatorio(semilla)
+    contador = ContadorExpansiones()
+    estadisticas = EstadisticasBusqueda()
+    buscar_en_pasillos(GrafoPasillos(costos, ancho), algoritmo, inicio, fin, contador,
+                       estadisticas=estadisticas)
+    assert contador.expandidos == estadisticas.expandidos
@@ -0,0 +1,63 @@
+# test_generadores.py
+"""
+Búsquedas como generadores de eventos: consumidas de a poco (como por cuadro en
+GameManager) dan los mismos eventos y el mismo resultado que con un observador.
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from busqueda import ALGORITMOS, EVENTO_OBJETIVO, EstadisticasBusqueda, eventos_busqueda
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio
+
+
+def consumir_por_cuadros(eventos, por_cuadro):
+    """
+    Saca `por_cuadro` eventos por vuelta, como los pasos por cuadro de GameManager.avanzar_busqueda.
+    """
+    producidos = []
+    while True:
+        for _ in range(por_cuadro):
+            try:
+                producidos.append(next(eventos))
+            except StopIteration as fin:
+                return producidos, fin.value
+
+
+@pytest.mark.parametrize("semilla", range(15))
+@pytest.mark.parametrize("algoritmo", sorted(ALGORITMOS))
+def test_generador_igual_al_observador(semilla, algoritmo):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(2, 20)), int(rng.integers(2, 20)))
+    ancho = mapa.matriz.shape[1]
+    costos = mapa.costos_agente(AGENTES[semilla % len(AGENTES)])
+    inicio, fin = punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+
+    observados = []
+    estadisticas_observador = EstadisticasBusqueda()
+    esperado = ALGORITMOS[algoritmo](costos, ancho, inicio, fin, lambda *evento: observados.append(evento),
+                                     estadisticas=estadisticas_observador)
+
+    estadisticas = EstadisticasBusqueda()
+    eventos = eventos_busqueda(algoritmo, costos, ancho, inicio, fin, estadisticas=estadisticas)
+    producidos, resultado = consumir_por_cuadros(eventos, int(rng.integers(1, 50)))
+    assert producidos == observados
+    assert (resultado.camino, resultado.costo) == (esperado.camino, esperado.costo)
+    assert (producidos[-1][0] == EVENTO_OBJETIVO) == (resultado.costo is not None)
+    assert estadisticas.expandidos == estadisticas_observador.expandidos
+    assert estadisticas.agregados == estadisticas_observador.agregados
+
+
+def test_descartar_la_busqueda_a_medias():
+    mapa = mapa_aleatorio(np.random.default_rng(0), 30, 30, proporcion_muros=0)
+    costos = mapa.costos_agente('human')
+    eventos = eventos_busqueda('a*', costos, 30, (0, 0), (29, 29))
+    primeros = list(itertools.islice(eventos, 10))
+    assert len(primeros) == 10
+    eventos.close()
+    with pytest.raises(StopIteration):
+        next(eventos)
+    # Una búsqueda nueva empieza desde cero
+    assert list(itertools.islice(eventos_busqueda('a*', costos, 30, (0, 0), (29, 29)), 10)) == primeros
+
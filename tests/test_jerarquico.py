@@ -0,0 +1,37 @@
+# test_jerarquico.py
+"""
+HPA* (PlanificadorJerarquico) contra A*, y reparación tras ediciones contra un
+planificador construido de nuevo sobre la malla editada.
+"""
+import numpy as np
+import pytest
+
+from busqueda import astar
+from jerarquico import PlanificadorJerarquico
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio, editar_al_azar, costo_camino
+
+
+@pytest.mark.parametrize('semilla', range(20))
+def test_planificar_tras_ediciones(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(5, 40)), int(rng.integers(5, 40)), rng.random() * 0.45)
+    ancho = mapa.matriz.shape[1]
+    tipo = AGENTES[semilla % len(AGENTES)]
+    costos = mapa.costos_agente(tipo)
+    tamano_cluster = int(rng.integers(3, 12))
+    planificador = PlanificadorJerarquico(costos, ancho, tamano_cluster)
+    mapa.suscribir(lambda x, y, valor: planificador.actualizar_celda(x, y))
+
+    for consulta in range(30):
+        inicio, fin = punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+        resultado = planificador.planificar(inicio, fin)
+        optimo = astar(costos, ancho, inicio, fin).costo
+        assert (resultado.costo is None) == (optimo is None)
+        if resultado.costo is not None:
+            assert costo_camino(costos, ancho, resultado.camino, inicio, fin) == resultado.costo
+            assert resultado.cota_inferior <= optimo <= resultado.costo
+        # Los clusters reparados deben dar lo mismo que un planificador nuevo
+        nuevo = PlanificadorJerarquico(costos, ancho, tamano_cluster).planificar(inicio, fin)
+        assert nuevo.costo == resultado.costo
+        if consulta % 3 == 0:
+            editar_al_azar(rng, mapa, 3)
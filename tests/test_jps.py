@@ -0,0 +1,28 @@
+# test_jps.py
+"""
+Jump Point Search contra A*: mismo costo óptimo, tanto en mapas con pocos
+terrenos (regiones uniformes grandes, donde JPS salta) como en mapas mezclados.
+"""
+import numpy as np
+import pytest
+
+from busqueda import astar, jps
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio, costo_camino
+
+
+@pytest.mark.parametrize('semilla', range(30))
+def test_jps_coincide_con_astar(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(1, 30)), int(rng.integers(1, 30)))
+    if semilla % 2:
+        # Solo montaña y tierra: una región uniforme con obstáculos
+        mapa.matriz = np.where(mapa.matriz == 0, 0, 1).astype(np.uint8)
+    ancho = mapa.matriz.shape[1]
+    for tipo in AGENTES:
+        costos = mapa.costos_agente(tipo)
+        for _ in range(10):
+            inicio, fin = punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+            resultado = jps(costos, ancho, inicio, fin)
+            assert resultado.costo == astar(costos, ancho, inicio, fin).costo
+            if resultado.costo is not None:
+                assert costo_camino(costos, ancho, resultado.camino, inicio, fin) == resultado.costo
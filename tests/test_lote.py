@@ -0,0 +1,57 @@
+# test_lote.py
+"""
+Lotes en paralelo: cada consulta da el mismo costo que A* en el proceso principal,
+incluidas las que se contestan sin pasar por el pool (fin en otra componente).
+"""
+import numpy as np
+import pytest
+
+from busqueda import astar, bfs
+from lote import consultas_aleatorias, leer_consultas, resolver_lote
+from Mapa import compilar_costos
+from utilidades import AGENTES, costo_camino, mapa_aleatorio
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_lote_igual_a_astar(semilla):
+    rng = np.random.default_rng(semilla)
+    matriz = mapa_aleatorio(rng, 25, 30).matriz
+    consultas = consultas_aleatorias(matriz, 40, AGENTES, semilla)
+    costos = {tipo: compilar_costos(matriz, tipo) for tipo in AGENTES}
+
+    vistos = set()
+    for indice, camino, costo in resolver_lote(matriz, consultas, procesos=2, tamano_bloque=7):
+        assert indice not in vistos
+        vistos.add(indice)
+        inicio, fin, tipo = consultas[indice]
+        esperado = astar(costos[tipo], 30, inicio, fin)
+        assert costo == esperado.costo
+        if costo is None:
+            assert camino == []
+        else:
+            assert costo_camino(costos[tipo], 30, camino, inicio, fin) == costo
+    assert vistos == set(range(len(consultas)))
+
+
+def test_lote_con_otro_algoritmo():
+    matriz = mapa_aleatorio(np.random.default_rng(5), 12, 12).matriz
+    consultas = consultas_aleatorias(matriz, 10, ['human'], 5)
+    costos = compilar_costos(matriz, 'human')
+    resultados = {indice: camino for indice, camino, _ in resolver_lote(matriz, consultas, 'bfs', procesos=2)}
+    for indice, (inicio, fin, _) in enumerate(consultas):
+        assert len(resultados[indice]) == len(bfs(costos, 12, inicio, fin).camino)
+
+
+def test_lote_vacio_y_errores():
+    matriz = np.ones((4, 4), dtype=np.uint8)
+    assert list(resolver_lote(matriz, [])) == []
+    with pytest.raises(ValueError, match="algoritmo"):
+        resolver_lote(matriz, [], algoritmo='dijkstra')
+    with pytest.raises(ValueError, match="agente"):
+        resolver_lote(matriz, [((0, 0), (1, 1), 'dragon')])
+
+
+def test_leer_consultas(tmp_path):
+    archivo = tmp_path / "consultas.csv"
+    archivo.write_text("# x_inicio,y_inicio,x_fin,y_fin,tipo_agente\n0,0,3,3,human\n\n1,2,0,1, octopus\n")
+    assert leer_consultas(str(archivo)) == [((0, 0), (3, 3), 'human'), ((1, 2), (0, 1), 'octopus')]
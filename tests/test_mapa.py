@@ -0,0 +1,61 @@
+# test_mapa.py
+"""
+Lectura y escritura de mapas de texto: parsear_mapa contra serializar_mapa y
+los errores de formato.
+"""
+import numpy as np
+import pytest
+
+from Mapa import Mapa, parsear_mapa, serializar_mapa
+
+
+@pytest.mark.parametrize("semilla", range(10))
+@pytest.mark.parametrize("delimitador", [',', ' '])
+def test_serializar_y_parsear(semilla, delimitador):
+    rng = np.random.default_rng(semilla)
+    alto, ancho = rng.integers(1, 40, size=2)
+    # Mapas de un dígito (camino rápido de serializar_mapa) y de hasta tres
+    maximo = 10 if semilla % 2 else 256
+    matriz = rng.integers(0, maximo, size=(alto, ancho)).astype(np.uint8)
+    datos = serializar_mapa(matriz, delimitador)
+    assert np.array_equal(parsear_mapa(datos), matriz)
+    assert np.array_equal(parsear_mapa(datos, delimitador), matriz)
+
+
+@pytest.mark.parametrize("datos", [
+    b"1 2\n3 4\n",
+    b"1 2\n3 4",
+    b"1,2\n3,4\n",
+    b"1 2\r\n3 4\r\n",
+    b"1 2\r3 4\r",
+    b"\n\n1 2\n\n  \n3\t4\n\n",
+    b"  1 , 2\n3 ,4 \n",
+])
+def test_formatos_aceptados(datos):
+    assert parsear_mapa(datos).tolist() == [[1, 2], [3, 4]]
+
+
+@pytest.mark.parametrize("datos, mensaje", [
+    (b"", "vacío"),
+    (b"\n  \n\r\n", "vacío"),
+    (b"1 2 3\n4 5\n", "la fila 2 no tiene 3 valores"),
+    (b"1 2\n\n3 4\n5 6 7\n", "la fila 3 no tiene 2 valores"),
+    (b"1,2\n3,4,\n5\n", "la fila 3 no tiene 2 valores"),
+    (b"1 x\n2 3\n", "no son números"),
+    (b"1 2\n3 -4\n", "entre 0 y 255"),
+    (b"1 2\n3 256\n", "entre 0 y 255"),
+])
+def test_errores_de_formato(datos, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        parsear_mapa(datos)
+
+
+def test_guardar_y_cargar_texto(tmp_path):
+    matriz = np.random.default_rng(0).integers(0, 10, size=(7, 5)).astype(np.uint8)
+    for nombre in ("mapa.txt", "mapa.csv"):
+        mapa = Mapa(1)
+        mapa.matriz = matriz.copy()
+        mapa.guardar_mapa(str(tmp_path / nombre))
+        cargado = Mapa(1)
+        cargado.cargar_mapa(str(tmp_path / nombre))
+        assert np.array_equal(cargado.matriz, matriz)
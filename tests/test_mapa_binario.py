@@ -0,0 +1,92 @@
+# test_mapa_binario.py
+"""
+Formato binario (.mapb): ida y vuelta con memoria mapeada, conversión desde y hacia
+texto, guardar sobre el archivo que está mapeado y cabeceras inválidas.
+"""
+import os
+import struct
+
+import numpy as np
+import pytest
+
+from Mapa import (Mapa, FORMATO_CABECERA, FIRMA_BINARIA, CODIFICACION_TERRENOS, TAMANO_CABECERA,
+                  abrir_mapa_binario, convertir_mapa, es_mapa_binario, guardar_mapa_binario)
+
+
+def matriz_aleatoria(semilla, alto=13, ancho=21):
+    return np.random.default_rng(semilla).integers(0, 10, size=(alto, ancho)).astype(np.uint8)
+
+
+def test_guardar_y_abrir_mapeado(tmp_path):
+    archivo = str(tmp_path / "mapa.mapb")
+    matriz = matriz_aleatoria(0)
+    guardar_mapa_binario(matriz, archivo)
+    assert es_mapa_binario(archivo)
+    assert os.path.getsize(archivo) == TAMANO_CABECERA + matriz.size
+
+    mapa = Mapa(1)
+    assert mapa.cargar_mapa(archivo)
+    assert isinstance(mapa.matriz, np.memmap)
+    assert np.array_equal(mapa.matriz, matriz)
+
+    # Copia en escritura: editar el mapa no cambia el archivo
+    mapa.modificar_celda(3, 4, (int(matriz[4, 3]) + 1) % 10)
+    assert np.array_equal(abrir_mapa_binario(archivo), matriz)
+
+
+def test_convertir_entre_texto_y_binario(tmp_path):
+    matriz = matriz_aleatoria(1)
+    mapa = Mapa(1)
+    mapa.matriz = matriz
+    texto, binario, csv = (str(tmp_path / nombre) for nombre in ("mapa.txt", "mapa.mapb", "mapa.csv"))
+    assert mapa.guardar_mapa(texto, ' ')
+    assert convertir_mapa(texto, binario)
+    assert es_mapa_binario(binario) and not es_mapa_binario(texto)
+    assert convertir_mapa(binario, csv)
+    cargado = Mapa(1)
+    assert cargado.cargar_mapa(csv)
+    assert np.array_equal(cargado.matriz, matriz)
+
+
+def test_guardar_sobre_el_archivo_mapeado(tmp_path):
+    archivo = str(tmp_path / "mapa.mapb")
+    matriz = matriz_aleatoria(2)
+    guardar_mapa_binario(matriz, archivo)
+    mapa = Mapa(1)
+    mapa.cargar_mapa(archivo)
+    mapa.modificar_celda(0, 0, 9 - int(matriz[0, 0]))
+    esperada = np.array(mapa.matriz)
+
+    # Otro archivo no suelta el mapeo; el mismo sí, y la matriz pasa a memoria
+    assert not mapa.soltar_mapeo(str(tmp_path / "otro.mapb"))
+    assert mapa.guardar_mapa(archivo)
+    assert not isinstance(mapa.matriz, np.memmap)
+    assert np.array_equal(mapa.matriz, esperada)
+    assert os.listdir(tmp_path) == ["mapa.mapb"]
+
+    recargado = Mapa(1)
+    recargado.cargar_mapa(archivo)
+    assert np.array_equal(recargado.matriz, esperada)
+    # Ya no está mapeado: guardar de nuevo no tiene nada que soltar
+    assert not mapa.soltar_mapeo(archivo)
+    assert mapa.guardar_mapa(archivo)
+
+
+@pytest.mark.parametrize("cabecera, mensaje", [
+    (struct.pack(FORMATO_CABECERA, FIRMA_BINARIA, 2, CODIFICACION_TERRENOS, 4, 4), "versión"),
+    (struct.pack(FORMATO_CABECERA, FIRMA_BINARIA, 1, 7, 4, 4), "codificación"),
+    (struct.pack(FORMATO_CABECERA, FIRMA_BINARIA, 1, CODIFICACION_TERRENOS, 4, 5), "truncado"),
+    (struct.pack(FORMATO_CABECERA, b"NOESMAPA", 1, CODIFICACION_TERRENOS, 4, 4), "no es un mapa binario"),
+])
+def test_cabeceras_invalidas(tmp_path, cabecera, mensaje):
+    archivo = tmp_path / "mapa.mapb"
+    archivo.write_bytes(cabecera.ljust(TAMANO_CABECERA, b'\0') + bytes(16))
+    with pytest.raises(ValueError, match=mensaje):
+        abrir_mapa_binario(str(archivo))
+
+
+def test_cabecera_incompleta(tmp_path):
+    archivo = tmp_path / "mapa.mapb"
+    archivo.write_bytes(FIRMA_BINARIA + bytes(4))
+    with pytest.raises(ValueError, match="incompleta"):
+        abrir_mapa_binario(str(archivo))
@@ -0,0 +1,80 @@
+# test_pasillos.py
+"""
+Búsquedas sobre el grafo de pasillos contra las de la malla: A* con el mismo costo
+que `astar` y BFS con tantos pasos como `bfs`, con el inicio y el fin en nodos,
+dentro de pasillos o fuera del grafo (se busca sobre la malla).
+"""
+import numpy as np
+import pytest
+
+from benchmark import generar_mapa
+from busqueda import astar, bfs
+from Mapa import Mapa
+from pasillos import GrafoPasillos, buscar_en_pasillos, eventos_pasillos
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio, costo_camino
+
+
+def mapa_de_prueba(semilla):
+    rng = np.random.default_rng(semilla)
+    if semilla % 2:
+        # Laberinto con algunos muros abiertos (ciclos) y terrenos de costos variados
+        mapa = Mapa(1)
+        tamano = int(rng.integers(5, 40))
+        mapa.matriz = generar_mapa(tamano, 'laberinto', semilla)
+        abiertos = rng.random(mapa.matriz.shape) < 0.05
+        mapa.matriz[abiertos] = 1
+        caros = (mapa.matriz != 0) & (rng.random(mapa.matriz.shape) < 0.2)
+        mapa.matriz[caros] = rng.choice([2, 3, 6], size=int(caros.sum()))
+        return rng, mapa
+    return rng, mapa_aleatorio(rng, int(rng.integers(1, 30)), int(rng.integers(1, 30)))
+
+
+@pytest.mark.parametrize('semilla', range(30))
+def test_pasillos_coinciden_con_la_malla(semilla):
+    rng, mapa = mapa_de_prueba(semilla)
+    ancho = mapa.matriz.shape[1]
+    for tipo in AGENTES:
+        costos = mapa.costos_agente(tipo)
+        grafo = GrafoPasillos(costos, ancho)
+        for _ in range(10):
+            inicio, fin = punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+            mejor, anchura = astar(costos, ancho, inicio, fin), bfs(costos, ancho, inicio, fin)
+            for algoritmo in ('a*', 'bfs', 'dfs'):
+                resultado = buscar_en_pasillos(grafo, algoritmo, inicio, fin)
+                assert (resultado.costo is None) == (mejor.costo is None)
+                if resultado.costo is None:
+                    continue
+                assert costo_camino(costos, ancho, resultado.camino, inicio, fin) == resultado.costo
+                if algoritmo == 'a*':
+                    assert resultado.costo == mejor.costo
+                elif algoritmo == 'bfs':
+                    assert len(resultado.camino) == len(anchura.camino)
+
+            # La versión generadora devuelve el mismo resultado
+            eventos = eventos_pasillos(grafo, 'a*', inicio, fin)
+            while True:
+                try:
+                    next(eventos)
+                except StopIteration as final:
+                    assert final.value.costo == mejor.costo
+                    break
+
+
+def test_grafo_comprime_pasillos():
+    mapa = Mapa(1)
+    mapa.matriz = generar_mapa(41, 'laberinto')
+    grafo = GrafoPasillos(mapa.costos_agente('human'), 41)
+    transitables = int(np.count_nonzero(mapa.matriz))
+    assert len(grafo) + grafo.cantidad_celdas_pasillo() <= transitables
+    assert len(grafo) < transitables // 2
+
+
+def test_grafo_del_mapa_se_reconstruye_al_editar(capsys):
+    mapa = mapa_aleatorio(np.random.default_rng(0), 10, 10)
+    grafo = mapa.grafo_pasillos('human')
+    assert mapa.grafo_pasillos('human') is grafo
+    mapa.modificar_celda(4, 4, 1)
+    otro = mapa.grafo_pasillos('human')
+    assert otro is not grafo and otro.costos is mapa.costos_agente('human')
+    # El modelo no escribe en consola; el resumen lo muestra GameManager
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,97 @@
+# test_registro.py
+"""
+Registro de eventos: grabar una búsqueda (como observador o envolviendo el
+generador) y reproducirla da los mismos eventos, conteos y costo al objetivo.
+"""
+from array import array
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import registro
+from busqueda import ALGORITMOS, EVENTO_EXPANDIR, eventos_busqueda
+from registro import GrabadorEventos, abrir_registro, grabar_eventos
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio
+
+
+def caso_aleatorio(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(3, 30)), int(rng.integers(3, 30)))
+    costos = mapa.costos_agente(AGENTES[semilla % len(AGENTES)])
+    return mapa, costos, punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa)
+
+
+@pytest.mark.parametrize("semilla", range(10))
+@pytest.mark.parametrize("algoritmo", sorted(ALGORITMOS))
+def test_grabar_y_reproducir(tmp_path, semilla, algoritmo):
+    mapa, costos, inicio, fin = caso_aleatorio(semilla)
+    ancho = mapa.matriz.shape[1]
+    archivo = str(tmp_path / "busqueda.eventos")
+
+    originales = []
+    grabador = GrabadorEventos(archivo, costos, ancho, inicio, fin, mapa.version, algoritmo, 'human')
+    eventos = grabar_eventos(eventos_busqueda(algoritmo, costos, ancho, inicio, fin), grabador)
+    while True:
+        try:
+            originales.append(next(eventos))
+        except StopIteration as terminado:
+            resultado = terminado.value
+            break
+    assert grabador.cantidad == len(originales)
+
+    leido = abrir_registro(archivo)
+    assert list(leido.eventos()) == originales
+    assert (leido.punto_inicio, leido.punto_fin) == (inicio, fin)
+    assert (leido.algoritmo, leido.tipo_agente, leido.version_mapa) == (algoritmo, 'human', mapa.version)
+    assert leido.costo_objetivo() == resultado.costo
+    conteos = Counter(evento for evento, _, _ in originales)
+    assert leido.conteos() == {evento: conteos[evento] for evento in registro.EVENTOS}
+    expansiones = np.zeros((leido.alto, ancho), dtype=np.int64)
+    for evento, (x, y), _ in originales:
+        expansiones[y, x] += evento == EVENTO_EXPANDIR
+    assert np.array_equal(leido.expansiones_por_celda(), expansiones)
+
+    assert leido.corresponde(costos, ancho)
+    cambiados = array('H', costos)
+    cambiados[0] += 1
+    assert not leido.corresponde(cambiados, ancho)
+
+
+def test_grabar_como_observador_en_varios_bloques(tmp_path, monkeypatch):
+    # Un buffer chico obliga a volcar y a reproducir en varios bloques
+    monkeypatch.setattr(registro, 'TAMANO_BUFFER', 5 * registro.TIPO_EVENTO.itemsize)
+    mapa, costos, inicio, fin = caso_aleatorio(3)
+    ancho = mapa.matriz.shape[1]
+    archivo = str(tmp_path / "busqueda.eventos")
+    originales = []
+
+    def observador(*evento):
+        originales.append(evento)
+        grabador(*evento)
+
+    with GrabadorEventos(archivo, costos, ancho, inicio, fin) as grabador:
+        ALGORITMOS['bfs'](costos, ancho, inicio, fin, observador)
+    assert len(originales) > 10
+    assert list(abrir_registro(archivo).eventos()) == originales
+
+
+@pytest.mark.parametrize("contenido, mensaje", [
+    (b"SKIBI", "incompleta"),
+    (b"NOESEVTS".ljust(registro.TAMANO_CABECERA_REGISTRO, b'\0'), "no es un registro"),
+])
+def test_archivos_invalidos(tmp_path, contenido, mensaje):
+    archivo = tmp_path / "malo.eventos"
+    archivo.write_bytes(contenido)
+    with pytest.raises(ValueError, match=mensaje):
+        abrir_registro(str(archivo))
+
+
+def test_evento_desconocido(tmp_path):
+    archivo = str(tmp_path / "busqueda.eventos")
+    with GrabadorEventos(archivo, array('H', [1] * 4), 2, (0, 0), (1, 1)):
+        pass
+    with open(archivo, 'ab') as salida:
+        salida.write(np.array([(9, 0, 0)], dtype=registro.TIPO_EVENTO).tobytes())
+    with pytest.raises(ValueError, match="desconocidos"):
+        abrir_registro(archivo)
@@ -0,0 +1,33 @@
+# test_replanificacion.py
+"""
+D* Lite (PlanificadorIncremental) contra A* desde cero, con ediciones y
+movimientos del inicio entre planificaciones.
+"""
+import numpy as np
+import pytest
+
+from busqueda import astar
+from replanificacion import PlanificadorIncremental
+from utilidades import AGENTES, mapa_aleatorio, punto_aleatorio, editar_al_azar, costo_camino
+
+
+@pytest.mark.parametrize('semilla', range(12))
+def test_replanificar_tras_ediciones_coincide_con_astar(semilla):
+    rng = np.random.default_rng(semilla)
+    mapa = mapa_aleatorio(rng, int(rng.integers(4, 30)), int(rng.integers(4, 30)))
+    ancho = mapa.matriz.shape[1]
+    tipo = AGENTES[semilla % len(AGENTES)]
+    costos = mapa.costos_agente(tipo)
+    planificador = PlanificadorIncremental(costos, ancho, punto_aleatorio(rng, mapa), punto_aleatorio(rng, mapa))
+    mapa.suscribir(lambda x, y, valor: planificador.actualizar_celda(x, y))
+
+    for _ in range(40):
+        resultado = planificador.planificar()
+        referencia = astar(costos, ancho, planificador.punto_inicio, planificador.punto_fin)
+        assert resultado.costo == referencia.costo
+        if resultado.costo is not None:
+            assert costo_camino(costos, ancho, resultado.camino, planificador.punto_inicio,
+                                planificador.punto_fin) == resultado.costo
+        editar_al_azar(rng, mapa, int(rng.integers(1, 5)))
+        if rng.random() < 0.3:
+            planificador.mover_inicio(punto_aleatorio(rng, mapa))
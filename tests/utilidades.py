@@ -0,0 +1,55 @@
+# utilidades.py
+"""
+Mapas aleatorios y verificación de caminos compartidos por las pruebas.
+"""
+import numpy as np
+
+from constantes import INTRANSITABLE
+from Mapa import Mapa
+
+# Terrenos de los mapas aleatorios: montaña, tierra, agua, arena y nieve (cada
+# agente tiene costos distintos, y para algunos el agua o la nieve son intransitables)
+TERRENOS_ALEATORIOS = [0, 1, 2, 3, 6]
+AGENTES = ['human', 'octopus', 'sasquatch']
+
+
+def mapa_aleatorio(rng, alto, ancho, proporcion_muros=None):
+    """
+    Mapa de alto x ancho con terrenos al azar; la proporción de montañas se elige al
+    azar si no se indica.
+    """
+    if proporcion_muros is None:
+        proporcion_muros = rng.random() * 0.5
+    resto = (1 - proporcion_muros) / (len(TERRENOS_ALEATORIOS) - 1)
+    mapa = Mapa(1)
+    mapa.matriz = rng.choice(TERRENOS_ALEATORIOS, size=(alto, ancho),
+                             p=[proporcion_muros] + [resto] * (len(TERRENOS_ALEATORIOS) - 1)).astype(np.uint8)
+    return mapa
+
+
+def punto_aleatorio(rng, mapa):
+    alto, ancho = mapa.matriz.shape
+    return (int(rng.integers(ancho)), int(rng.integers(alto)))
+
+
+def editar_al_azar(rng, mapa, cantidad=1):
+    """
+    Cambia `cantidad` celdas al azar con Mapa.modificar_celda (notifica a los suscriptores).
+    """
+    for _ in range(cantidad):
+        x, y = punto_aleatorio(rng, mapa)
+        mapa.modificar_celda(x, y, int(rng.choice(TERRENOS_ALEATORIOS)))
+
+
+def costo_camino(costos, ancho, camino, punto_inicio, punto_fin):
+    """
+    Verifica que el camino vaya del inicio al fin por pasos entre vecinas, entrando
+    solo a celdas transitables, y devuelve su costo (la suma de las celdas de destino).
+    """
+    assert camino[0] == punto_inicio and camino[-1] == punto_fin
+    costo = 0
+    for (x0, y0), (x1, y1) in zip(camino, camino[1:]):
+        assert abs(x0 - x1) + abs(y0 - y1) == 1
+        assert costos[y1 * ancho + x1] != INTRANSITABLE
+        costo += costos[y1 * ancho + x1]
+    return costo